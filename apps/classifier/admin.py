@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import SenderRule
+
+
+@admin.register(SenderRule)
+class SenderRuleAdmin(admin.ModelAdmin):
+    list_display = ['key', 'kind', 'user', 'folder', 'support', 'misses', 'hits', 'last_used_at']
+    list_filter = ['kind']
+    search_fields = ['key', 'user__email', 'folder__path']
+    ordering = ['-last_used_at']
+    readonly_fields = ['created_at', 'updated_at']
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-17 06:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('folders', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SenderRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('sender', '발신자'), ('domain', '도메인')], max_length=10)),
+                ('key', models.CharField(max_length=255)),
+                ('support', models.PositiveIntegerField(default=0)),
+                ('misses', models.PositiveIntegerField(default=0)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('last_used_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('folder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sender_rules', to='folders.folder')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sender_rules', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '발신자 규칙',
+                'verbose_name_plural': '발신자 규칙들',
+                'db_table': 'sender_rules',
+                'ordering': ['-last_used_at'],
+                'indexes': [models.Index(fields=['user', 'last_used_at'], name='sender_rule_user_id_94a16a_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='senderrule',
+            constraint=models.UniqueConstraint(fields=('user', 'kind', 'key'), name='unique_user_sender_rule'),
+        ),
+    ]
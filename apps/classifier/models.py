@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import models
+
+
+class SenderRule(models.Model):
+    """발신자/도메인별 분류 규칙 (과거 분류 결과와 수동 이동으로 학습)"""
+
+    KIND_CHOICES = [
+        ('sender', '발신자'),
+        ('domain', '도메인'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='sender_rules'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    key = models.CharField(max_length=255)  # 발신자 이메일 또는 도메인 (소문자)
+    folder = models.ForeignKey(
+        'folders.Folder',
+        on_delete=models.CASCADE,
+        related_name='sender_rules'
+    )
+
+    # 통계
+    support = models.PositiveIntegerField(default=0)  # 규칙과 같은 폴더로 분류/이동된 횟수
+    misses = models.PositiveIntegerField(default=0)  # 규칙과 다른 폴더로 분류/이동된 횟수
+    hits = models.PositiveIntegerField(default=0)  # LLM 없이 규칙으로 분류한 횟수
+    last_used_at = models.DateTimeField()  # 마지막 적용/학습 시각 (오래된 규칙 정리 기준)
+
+    # 타임스탬프
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'sender_rules'
+        verbose_name = '발신자 규칙'
+        verbose_name_plural = '발신자 규칙들'
+        ordering = ['-last_used_at']
+        indexes = [
+            models.Index(fields=['user', 'last_used_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'kind', 'key'],
+                name='unique_user_sender_rule'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.key} → {self.folder_id}"
+
+    @property
+    def confidence(self) -> float:
+        """규칙 신뢰도 (같은 폴더로 분류된 비율)"""
+        total = self.support + self.misses
+        return self.support / total if total else 0.0
@@ -22,6 +22,7 @@ JSON 형식으로 응답하세요:
 """
 
 CLASSIFICATION_PROMPT = """## 기존 폴더 목록
+(한 줄에 폴더 하나, 들여쓰기 2칸은 바로 위 폴더의 하위 폴더입니다. folder_path에는 "상위/하위" 형태의 전체 경로를 쓰세요)
 {folders}
 
 ## 분류할 이메일
@@ -31,12 +32,13 @@ CLASSIFICATION_PROMPT = """## 기존 폴더 목록
 
 이 이메일을 어떤 폴더로 분류해야 할까요? JSON 형식으로 응답하세요."""
 
-BATCH_CLASSIFICATION_PROMPT = """## 기존 폴더 목록
+# 배치 프롬프트는 사용자별로 바뀌지 않는 앞부분(폴더 트리, 출력 형식)과 호출마다 바뀌는 이메일 목록으로 나눠
+# 프로바이더의 프롬프트 캐시(동일 prefix 재사용)가 적용되도록 이메일 목록을 항상 마지막에 둡니다.
+BATCH_CLASSIFICATION_PREFIX = """## 기존 폴더 목록
+(한 줄에 폴더 하나, 들여쓰기 2칸은 바로 위 폴더의 하위 폴더입니다. folder_path에는 "상위/하위" 형태의 전체 경로를 쓰세요)
 {folders}
 
-## 분류할 이메일 목록
-{emails}
-
+## 응답 형식
 각 이메일을 분류하고 JSON 배열로 응답하세요. 각 항목은 mail_id와 함께 반환해야 합니다:
 [
   {{
@@ -49,3 +51,33 @@ BATCH_CLASSIFICATION_PROMPT = """## 기존 폴더 목록
   ...
 ]
 """
+
+BATCH_CLASSIFICATION_EMAILS = """
+## 분류할 이메일 목록
+{emails}"""
+
+# 구조화 출력 모드(JSON schema/tool calling)용 배치 응답 스키마
+BATCH_CLASSIFICATION_SCHEMA = {
+    "title": "batch_classification",
+    "description": "이메일별 폴더 분류 결과",
+    "type": "object",
+    "properties": {
+        "classifications": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "mail_id": {"type": "integer", "description": "이메일 번호"},
+                    "folder_path": {"type": "string", "description": "폴더 경로"},
+                    "is_new_folder": {"type": "boolean", "description": "새 폴더 여부"},
+                    "confidence": {"type": "number", "description": "분류 확신도 (0.0-1.0)"},
+                    "reason": {"type": "string", "description": "분류 이유 (한 문장)"},
+                },
+                "required": ["mail_id", "folder_path", "is_new_folder", "confidence", "reason"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["classifications"],
+    "additionalProperties": False,
+}
@@ -46,12 +46,41 @@ class ClassificationSummarySerializer(serializers.Serializer):
     new_folders_created = serializers.IntegerField()
 
 
+class LLMUsageSerializer(serializers.Serializer):
+    """LLM 토큰 사용량"""
+    calls = serializers.IntegerField()
+    input_tokens = serializers.IntegerField()
+    cached_input_tokens = serializers.IntegerField(help_text='프롬프트 캐시가 적용된 입력 토큰 수')
+    output_tokens = serializers.IntegerField()
+    cache_hit_rate = serializers.FloatField()
+
+
 class ClassificationStatusResponseSerializer(serializers.Serializer):
     """분류 상태 응답"""
     classification_id = serializers.CharField()
     state = serializers.ChoiceField(choices=['pending', 'in_progress', 'completed', 'failed'])
+    usage = LLMUsageSerializer(allow_null=True, required=False)
     results = ClassificationResultItemSerializer(many=True)
     summary = ClassificationSummarySerializer()
     started_at = serializers.DateTimeField(allow_null=True)
     completed_at = serializers.DateTimeField(allow_null=True)
     error = serializers.CharField(allow_null=True, required=False)
+
+
+class ProviderHealthSerializer(serializers.Serializer):
+    """LLM 프로바이더 상태"""
+    provider = serializers.CharField()
+    state = serializers.ChoiceField(choices=['closed', 'open', 'half_open'])
+    failure_rate = serializers.FloatField(help_text='최근 호출 실패율 (지연 호출 포함)')
+    recent_calls = serializers.IntegerField()
+    total_calls = serializers.IntegerField()
+    total_failures = serializers.IntegerField()
+    avg_latency_ms = serializers.IntegerField(allow_null=True)
+    retry_in_seconds = serializers.FloatField(allow_null=True, help_text='open 상태에서 시험 호출까지 남은 시간')
+    last_error = serializers.CharField(allow_null=True)
+    last_failure_at = serializers.DateTimeField(allow_null=True)
+
+
+class ClassifierHealthResponseSerializer(serializers.Serializer):
+    """분류 LLM 헬스 체크 응답"""
+    providers = ProviderHealthSerializer(many=True)
@@ -1,4 +1,24 @@
+from .centroid_classifier import FolderCentroidClassifier
+from .circuit_breaker import CircuitBreaker, get_circuit_breaker, get_provider_health
+from .classification_cache import ClassificationCache, get_classification_cache
 from .classifier_service import ClassificationState, ClassifierService
+from .folder_index import FolderPathIndex
 from .llm_client import LLMClient
+from .llm_registry import LLMModelRegistry, get_llm_registry
+from .sender_rules import SenderRuleService
 
-__all__ = ['ClassifierService', 'ClassificationState', 'LLMClient']
+__all__ = [
+    'CircuitBreaker',
+    'ClassificationCache',
+    'ClassificationState',
+    'ClassifierService',
+    'FolderCentroidClassifier',
+    'FolderPathIndex',
+    'LLMClient',
+    'LLMModelRegistry',
+    'SenderRuleService',
+    'get_circuit_breaker',
+    'get_classification_cache',
+    'get_llm_registry',
+    'get_provider_health',
+]
@@ -0,0 +1,210 @@
+"""
+LLM 프로바이더별 서킷 브레이커
+
+상태는 작업 상태 저장소(JOB_STATE_BACKEND)에 보관되어 웹 프로세스와 모든 작업 워커가 함께 읽고 씁니다.
+"""
+import logging
+import threading
+import time
+
+from django.utils import timezone
+
+from apps.jobs.services import get_state_store
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    프로바이더 하나의 최근 호출 결과/지연 시간을 추적하는 서킷 브레이커
+
+    - closed: 정상. 최근 WINDOW_SIZE번의 호출 중 실패(지연 포함) 비율이 FAILURE_RATE_THRESHOLD 이상이면 open
+    - open: OPEN_SECONDS 동안 호출하지 않고 바로 다른 프로바이더로 전환
+    - half_open: OPEN_SECONDS가 지나면 한 번만 시험 호출을 허용하고, 성공하면 closed, 실패하면 다시 open
+
+    한 워커에서 실패가 쌓여 열린 서킷은 다른 워커에서도 바로 열린 것으로 보입니다.
+    """
+
+    KEY_PREFIX = 'llm_breaker'
+    WINDOW_SIZE = 20  # 실패율 계산에 사용하는 최근 호출 수
+    MIN_CALLS = 4  # 실패율로 판단하기 위한 최소 호출 수
+    FAILURE_RATE_THRESHOLD = 0.5
+    SLOW_CALL_SECONDS = 30.0  # 이보다 오래 걸린 호출은 실패로 계산
+    OPEN_SECONDS = 30.0  # open 상태 유지 시간
+    PROBE_TIMEOUT_SECONDS = 120.0  # 시험 호출 결과가 이 시간 안에 기록되지 않으면(워커 종료 등) 다시 시험 허용
+    LATENCY_SMOOTHING = 0.2  # 지연 시간 지수 이동 평균 가중치
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    DEFAULTS = {
+        'state': CLOSED,
+        'results': [],  # 최근 호출 결과 (True: 성공, False: 실패)
+        'opened_at': 0.0,  # open 전환 시각 (epoch 초, 프로세스 간 공유되므로 monotonic 대신 사용)
+        'probe_started_at': None,  # half_open 시험 호출 시작 시각
+        'total_calls': 0,
+        'total_failures': 0,
+        'avg_latency': None,  # 초
+        'last_error': None,
+        'last_failure_at': None,
+    }
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key = f'{self.KEY_PREFIX}:{name}'
+
+    def _load(self, data) -> dict:
+        return {**self.DEFAULTS, **(data or {})}
+
+    def _mutate(self, func) -> dict:
+        return get_state_store().mutate(self.key, lambda data: func(self._load(data)))
+
+    def _probe_in_flight(self, data: dict, now: float) -> bool:
+        started = data['probe_started_at']
+        return started is not None and now - started < self.PROBE_TIMEOUT_SECONDS
+
+    @property
+    def state(self) -> str:
+        return self._load(get_state_store().get(self.key))['state']
+
+    def is_available(self) -> bool:
+        """호출 가능 여부만 확인 (상태를 바꾸지 않음)"""
+        data = self._load(get_state_store().get(self.key))
+        now = time.time()
+        if data['state'] == self.OPEN:
+            return now - data['opened_at'] >= self.OPEN_SECONDS
+        return not (data['state'] == self.HALF_OPEN and self._probe_in_flight(data, now))
+
+    def allow(self) -> bool:
+        """호출 가능 여부 (half_open이면 모든 워커를 통틀어 시험 호출 1건만 허용)"""
+        # closed 상태는 읽기만 하고, 상태 전환이 필요할 때만 저장소에 씀
+        if self.state == self.CLOSED:
+            return True
+
+        allowed = False
+
+        def apply(data):
+            nonlocal allowed
+            now = time.time()
+            if data['state'] == self.OPEN:
+                if now - data['opened_at'] < self.OPEN_SECONDS:
+                    return data
+                data['state'] = self.HALF_OPEN
+                data['probe_started_at'] = None
+                logger.info(f"Circuit {self.name} half-open, probing")
+
+            if data['state'] == self.HALF_OPEN:
+                if self._probe_in_flight(data, now):
+                    return data
+                data['probe_started_at'] = now
+            allowed = True
+            return data
+
+        self._mutate(apply)
+        return allowed
+
+    def record_success(self, latency: float):
+        if latency >= self.SLOW_CALL_SECONDS:
+            self.record_failure(latency, f'slow call ({latency:.1f}s)')
+            return
+
+        def apply(data):
+            self._track(data, True, latency)
+            if data['state'] == self.HALF_OPEN:
+                data['state'] = self.CLOSED
+                data['results'] = []
+                data['probe_started_at'] = None
+                logger.info(f"Circuit {self.name} closed")
+            return data
+
+        self._mutate(apply)
+
+    def record_failure(self, latency: float, error: str):
+        def apply(data):
+            self._track(data, False, latency)
+            data['total_failures'] += 1
+            data['last_error'] = error[:300]
+            data['last_failure_at'] = timezone.now().isoformat()
+
+            if data['state'] == self.HALF_OPEN or (
+                data['state'] == self.CLOSED and
+                len(data['results']) >= self.MIN_CALLS and
+                self._failure_rate(data) >= self.FAILURE_RATE_THRESHOLD
+            ):
+                data['state'] = self.OPEN
+                data['opened_at'] = time.time()
+                data['probe_started_at'] = None
+                logger.warning(f"Circuit {self.name} opened: {data['last_error']}")
+            return data
+
+        self._mutate(apply)
+
+    def _track(self, data: dict, ok: bool, latency: float):
+        data['results'] = (data['results'] + [ok])[-self.WINDOW_SIZE:]
+        data['total_calls'] += 1
+        if data['avg_latency'] is None:
+            data['avg_latency'] = latency
+        else:
+            data['avg_latency'] += self.LATENCY_SMOOTHING * (latency - data['avg_latency'])
+
+    @staticmethod
+    def _failure_rate(data: dict) -> float:
+        results = data['results']
+        if not results:
+            return 0.0
+        return results.count(False) / len(results)
+
+    def snapshot(self) -> dict:
+        """현재 상태 (헬스 체크 응답용)"""
+        data = self._load(get_state_store().get(self.key))
+        retry_in = None
+        if data['state'] == self.OPEN:
+            retry_in = max(0.0, self.OPEN_SECONDS - (time.time() - data['opened_at']))
+        avg_latency = data['avg_latency']
+        return {
+            'provider': self.name,
+            'state': data['state'],
+            'failure_rate': round(self._failure_rate(data), 3),
+            'recent_calls': len(data['results']),
+            'total_calls': data['total_calls'],
+            'total_failures': data['total_failures'],
+            'avg_latency_ms': round(avg_latency * 1000) if avg_latency is not None else None,
+            'retry_in_seconds': round(retry_in, 1) if retry_in is not None else None,
+            'last_error': data['last_error'],
+            'last_failure_at': data['last_failure_at'],
+        }
+
+
+PROVIDERS_KEY = f'{CircuitBreaker.KEY_PREFIX}:providers'  # 등록된 프로바이더 목록 (모든 프로세스 공유)
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """
+    프로바이더별 서킷 브레이커 (상태는 저장소에 있어 모든 워커가 공유)
+
+    프로세스에서 처음 사용할 때 공유 프로바이더 목록에 등록해 헬스 체크에 보이도록 합니다.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is not None:
+            return breaker
+
+    def register(data):
+        providers = (data or {}).get('providers', [])
+        if provider not in providers:
+            providers = providers + [provider]
+        return {'providers': providers}
+
+    get_state_store().mutate(PROVIDERS_KEY, register)
+    with _breakers_lock:
+        return _breakers.setdefault(provider, CircuitBreaker(provider))
+
+
+def get_provider_health() -> list:
+    """등록된 모든 프로바이더의 서킷 브레이커 상태 (어느 프로세스에서 등록했든 포함)"""
+    providers = (get_state_store().get(PROVIDERS_KEY) or {}).get('providers', [])
+    return [CircuitBreaker(provider).snapshot() for provider in providers]
@@ -0,0 +1,106 @@
+"""
+LLM 분류 결과 캐시
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parseaddr
+from typing import Optional
+
+from django.conf import settings
+
+
+class ClassificationCache:
+    """
+    메일 지문 기반 분류 결과 캐시 (TTL + LRU, 프로세스 메모리)
+
+    지문은 (사용자, 발신자 이메일, 숫자/날짜를 가린 제목, 폴더 구성 버전)으로 만들기 때문에
+    매주 반복되는 뉴스레터/영수증/알림은 LLM 호출 없이 같은 폴더로 분류되고,
+    사용자의 폴더 트리가 바뀌면 버전이 달라져 이전 결과는 더 이상 사용되지 않습니다.
+    캐시는 프로세스 공용이므로 사용자를 키에 넣어 다른 사용자의 결과(새 폴더 제안 포함)가 섞이지 않게 합니다.
+    """
+
+    # 날짜/시간/숫자 마스킹 (제목 템플릿 추출)
+    MONTH_PATTERN = re.compile(
+        r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\b', re.IGNORECASE
+    )
+    DIGITS_PATTERN = re.compile(r'\d+')
+    SPACES_PATTERN = re.compile(r'\s+')
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 60 * 60 * 24 * 7):
+        """
+        Args:
+            max_entries: 최대 보관 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 삭제)
+            ttl: 항목 보관 시간 (초)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # fingerprint -> (만료 시각, 결과)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def folder_set_version(folders: list) -> str:
+        """폴더 구성 버전 (폴더 ID/경로가 하나라도 바뀌면 달라짐)"""
+        source = '\n'.join(sorted(f"{folder['id']}:{folder['path']}" for folder in folders))
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def subject_template(cls, subject: str) -> str:
+        """숫자/날짜를 가린 제목"""
+        template = cls.MONTH_PATTERN.sub('<m>', (subject or '').lower())
+        template = cls.DIGITS_PATTERN.sub('#', template)
+        return cls.SPACES_PATTERN.sub(' ', template).strip()
+
+    @classmethod
+    def fingerprint(cls, user_id: int, mail_data: dict, folder_version: str) -> str:
+        """메일 분류 캐시 키 (사용자별)"""
+        sender_email = mail_data.get('sender_email') or parseaddr(mail_data.get('sender', ''))[1]
+        source = '\x1f'.join([
+            str(user_id),
+            sender_email.strip().lower(),
+            cls.subject_template(mail_data.get('subject', '')),
+            folder_version,
+        ])
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(result)
+
+    def set(self, key: str, result: dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_classification_cache() -> ClassificationCache:
+    """프로세스 공용 분류 결과 캐시"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ClassificationCache(
+                    max_entries=getattr(settings, 'LLM_CACHE_MAX_ENTRIES', 10000),
+                    ttl=getattr(settings, 'LLM_CACHE_TTL', 60 * 60 * 24 * 7),
+                )
+    return _cache
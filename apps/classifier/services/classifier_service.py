@@ -2,99 +2,151 @@
 메일 분류 서비스
 """
 import logging
-import threading
 import time
 import uuid
+from collections import defaultdict
 from typing import Optional
 
 from django.db import connection, transaction
 from django.utils import timezone
 
 from apps.folders.models import Folder
+from apps.jobs.services import SharedState, dispatch_job, get_state_store
 from apps.mails.models import Mail
+from apps.mails.signals import apply_folder_count_deltas
 
+from .centroid_classifier import FolderCentroidClassifier
+from .dispatcher import LLMBatchDispatcher, get_llm_limiter
+from .folder_index import FolderPathIndex
 from .llm_client import LLMClient
+from .sender_rules import SenderRuleService
 
 logger = logging.getLogger(__name__)
 
 
-class ClassificationState:
-    """분류 상태 관리 (메모리 기반)"""
-    _instances = {}
-
-    def __init__(self, user_id: int):
-        self.user_id = user_id
-        self.classification_id = f"cls_{uuid.uuid4().hex[:8]}"
-        self.state = 'pending'  # pending, in_progress, completed, failed
-        self.total = 0
-        self.processed = 0
-        self.success = 0
-        self.failed = 0
-        self.new_folders_created = 0
-        self.results = []  # 개별 결과
-        self.started_at = None
-        self.completed_at = None
-        self.error = None
-        self.provider = None  # 사용된 LLM 프로바이더 (gemini, openai)
+class ClassificationState(SharedState):
+    """분류 상태 관리 (공유 상태 저장소 기반, 모든 워커에서 조회 가능)"""
+
+    KEY_PREFIX = 'cls'
+    USER_INDEX_PREFIX = 'cls_user'  # 사용자별 최근 분류 작업 ID
+    DEFAULTS = {
+        'classification_id': None,
+        'user_id': None,
+        'state': 'pending',  # pending, in_progress, completed, failed, cancelled
+        'total': 0,
+        'processed': 0,
+        'success': 0,
+        'failed': 0,
+        'new_folders_created': 0,
+        'results': [],  # 개별 결과
+        'started_at': None,
+        'completed_at': None,
+        'error': None,
+        'provider': None,  # 사용된 LLM 프로바이더 (gemini, openai)
+        'usage': None,  # LLM 토큰 사용량 (입력/캐시 적중 입력/출력)
+    }
+    TTL = 60 * 60 * 24  # 완료 후 결과 조회를 위해 하루 보관
+
+    @property
+    def classification_id(self) -> str:
+        return self.state_id
 
     @classmethod
     def create(cls, user_id: int) -> 'ClassificationState':
-        state = cls(user_id)
-        cls._instances[state.classification_id] = state
+        classification_id = f"cls_{uuid.uuid4().hex[:8]}"
+        state = cls(classification_id, {'classification_id': classification_id, 'user_id': user_id})
+        state.save()
+        get_state_store().set(
+            f'{cls.USER_INDEX_PREFIX}:{user_id}',
+            {'classification_id': classification_id},
+            ttl=cls.TTL,
+        )
         return state
 
     @classmethod
     def get(cls, classification_id: str) -> Optional['ClassificationState']:
-        return cls._instances.get(classification_id)
+        return cls.load(classification_id)
 
     @classmethod
     def get_by_user(cls, user_id: int) -> Optional['ClassificationState']:
-        for state in cls._instances.values():
-            if state.user_id == user_id and state.state == 'in_progress':
-                return state
+        index = get_state_store().get(f'{cls.USER_INDEX_PREFIX}:{user_id}')
+        if not index:
+            return None
+        state = cls.load(index['classification_id'])
+        if state and state.state == 'in_progress':
+            return state
         return None
 
     def start(self, total: int):
-        self.state = 'in_progress'
-        self.total = total
-        self.started_at = timezone.now()
+        self.update(state='in_progress', total=total, started_at=timezone.now().isoformat())
 
     def add_result(self, mail_id: int, status: str, folder_data: dict = None, error: str = None):
-        self.processed += 1
-        result = {
-            'mail_id': mail_id,
-            'status': status,
-        }
-        if status == 'success' and folder_data:
-            self.success += 1
-            result['folder'] = folder_data
-            result['is_new_folder'] = folder_data.get('is_new_folder', False)
-            result['confidence'] = folder_data.get('confidence', 0.0)
-            if result['is_new_folder']:
-                self.new_folders_created += 1
-        else:
-            self.failed += 1
-            result['error'] = error or 'Unknown error'
-            result['folder'] = None
-
-        self.results.append(result)
+        self.add_results([(mail_id, status, folder_data, error)])
+
+    def add_results(self, entries: list):
+        """
+        여러 메일의 결과를 한 번에 기록 (저장소 쓰기 1회)
+
+        Args:
+            entries: [(mail_id, status, folder_data, error), ...]
+        """
+        results = []
+        for mail_id, status, folder_data, error in entries:
+            result = {
+                'mail_id': mail_id,
+                'status': status,
+            }
+            if status == 'success' and folder_data:
+                result['folder'] = folder_data
+                result['is_new_folder'] = folder_data.get('is_new_folder', False)
+                result['confidence'] = folder_data.get('confidence', 0.0)
+            else:
+                result['error'] = error or 'Unknown error'
+                result['folder'] = None
+            results.append(result)
+        if not results:
+            return
+
+        def apply(data):
+            for result in results:
+                data['processed'] += 1
+                if 'error' in result:
+                    data['failed'] += 1
+                else:
+                    data['success'] += 1
+                    if result['is_new_folder']:
+                        data['new_folders_created'] += 1
+            data['results'] = data['results'] + results
+            return data
+
+        self.mutate(apply)
+
+    def _finish(self, state: str, error: str = None):
+        """종료 상태 기록 (다른 워커에서 이미 취소된 작업은 취소 상태 유지)"""
+        def apply(data):
+            if data['state'] == 'cancelled':
+                return data
+            data['state'] = state
+            data['completed_at'] = timezone.now().isoformat()
+            if error is not None:
+                data['error'] = error
+            return data
+
+        self.mutate(apply)
 
     def complete(self):
-        self.state = 'completed'
-        self.completed_at = timezone.now()
+        self._finish('completed')
 
     def fail(self, error: str):
-        self.state = 'failed'
-        self.error = error
-        self.completed_at = timezone.now()
+        self._finish('failed', error)
 
     def cancel(self):
         """분류 작업 취소"""
-        self.state = 'cancelled'
-        self.completed_at = timezone.now()
+        self.update(state='cancelled', completed_at=timezone.now().isoformat())
 
     def is_cancelled(self) -> bool:
-        """취소 여부 확인"""
+        """취소 여부 확인 (다른 워커의 취소 요청 반영)"""
+        self.refresh()
         return self.state == 'cancelled'
 
     def to_dict(self) -> dict:
@@ -102,6 +154,7 @@ class ClassificationState:
             'classification_id': self.classification_id,
             'state': self.state,
             'provider': self.provider,
+            'usage': self.usage,
             'results': self.results,
             'summary': {
                 'total': self.total,
@@ -109,8 +162,8 @@ class ClassificationState:
                 'failed': self.failed,
                 'new_folders_created': self.new_folders_created,
             },
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
             'error': self.error,
         }
 
@@ -118,7 +171,10 @@ class ClassificationState:
 class ClassifierService:
     """메일 분류 서비스"""
 
-    MAX_BATCH_SIZE = 20
+    APPLY_BATCH_SIZE = 20  # 스트리밍 결과를 모아서 한 번에 반영할 개수
+    APPLY_MAX_DELAY = 1.0  # 결과를 모아두는 최대 시간 (초)
+
+    MAX_UNCLASSIFIED_PER_JOB = 200  # 미분류 일괄 분류 1회당 최대 메일 수 (LLM 배치는 토큰 예산으로 따로 나눔)
 
     def __init__(self, user):
         self.user = user
@@ -150,19 +206,16 @@ class ClassifierService:
         mail_ids_list = list(mails.values_list('id', flat=True))
         state.start(len(mail_ids_list))
 
-        # 백그라운드 스레드에서 분류 실행
-        user_id = self.user.id
-        thread = threading.Thread(
-            target=self._run_classification_in_background,
-            args=(user_id, mail_ids_list, state.classification_id),
-            daemon=True
-        )
-        thread.start()
+        # 백그라운드 작업으로 분류 실행 (JOB_RUNNER 설정에 따라 워커 또는 스레드)
+        dispatch_job('classification', self.user, {
+            'mail_ids': mail_ids_list,
+            'classification_id': state.classification_id,
+        })
 
         return {
             'classification_id': state.classification_id,
             'mail_count': state.total,
-            'started_at': state.started_at.isoformat(),
+            'started_at': state.started_at,
         }
 
     def classify_unclassified(self) -> dict:
@@ -171,7 +224,7 @@ class ClassifierService:
             user=self.user,
             is_classified=False,
             is_deleted=False
-        )[:self.MAX_BATCH_SIZE]
+        )[:self.MAX_UNCLASSIFIED_PER_JOB]
 
         if not mails.exists():
             return {
@@ -183,19 +236,16 @@ class ClassifierService:
         mail_ids_list = list(mails.values_list('id', flat=True))
         state.start(len(mail_ids_list))
 
-        # 백그라운드 스레드에서 분류 실행
-        user_id = self.user.id
-        thread = threading.Thread(
-            target=self._run_classification_in_background,
-            args=(user_id, mail_ids_list, state.classification_id),
-            daemon=True
-        )
-        thread.start()
+        # 백그라운드 작업으로 분류 실행 (JOB_RUNNER 설정에 따라 워커 또는 스레드)
+        dispatch_job('classification', self.user, {
+            'mail_ids': mail_ids_list,
+            'classification_id': state.classification_id,
+        })
 
         return {
             'classification_id': state.classification_id,
             'mail_count': state.total,
-            'started_at': state.started_at.isoformat(),
+            'started_at': state.started_at,
         }
 
     def _run_classification_in_background(self, user_id: int, mail_ids: list, classification_id: str):
@@ -208,8 +258,8 @@ class ClassifierService:
             from apps.accounts.models import User
             self.user = User.objects.get(id=user_id)
 
-            # 스레드에서 LLM 클라이언트 재생성
-            self.llm_client = LLMClient()
+            # 작업별 LLM 클라이언트 (모델/연결 풀은 프로세스 공용, 429 응답은 공용 동시 호출 제한기에 전달)
+            self.llm_client = LLMClient(rate_limiter=get_llm_limiter())
 
             mails = Mail.objects.filter(
                 user=self.user,
@@ -224,7 +274,7 @@ class ClassifierService:
                 return
 
             # 사용 중인 LLM provider 설정
-            state.provider = self.llm_client.provider
+            state.update(provider=self.llm_client.provider)
 
             self._process_classification(mail_list, state)
         except Exception as e:
@@ -246,28 +296,75 @@ class ClassifierService:
         """분류 처리"""
         existing_folders = list(
             Folder.objects.filter(user=self.user)
-            .values('id', 'path', 'name', 'depth')
+            .values(*FolderPathIndex.FIELDS)
         )
-
-        # 배치 분류 시도 (20개씩, 배치 간 딜레이)
-        batch_size = 20
-        for i in range(0, len(mails), batch_size):
-            # 취소 확인
-            if state.is_cancelled():
-                logger.info(f"Classification cancelled for user {self.user.id}")
-                return
-
-            batch = mails[i:i + batch_size]
-            self._classify_batch(batch, existing_folders, state)
-
-            # 취소 확인 (배치 후)
-            if state.is_cancelled():
-                logger.info(f"Classification cancelled for user {self.user.id}")
-                return
-
-            # 다음 배치 전 대기 (rate limit 방지)
-            if i + batch_size < len(mails):
-                time.sleep(3)
+        folder_index = FolderPathIndex(self.user, existing_folders)
+
+        # 신뢰도 높은 발신자/도메인 규칙이 있는 메일은 LLM 없이 바로 분류
+        sender_rules = SenderRuleService(self.user)
+        matched = sender_rules.match(mails)
+        if matched:
+            self._apply_local_results(mails, {
+                mail_id: {
+                    'folder_path': rule.folder.path,
+                    'is_new_folder': False,
+                    'confidence': round(rule.confidence, 2),
+                }
+                for mail_id, rule in matched.items()
+            }, folder_index, state)
+            mails = [mail for mail in mails if mail.id not in matched]
+
+        # 기존 폴더의 메일들과 충분히 비슷한 메일은 폴더 중심 벡터 유사도로 분류
+        if mails:
+            predicted = self._predict_by_centroid(mails, existing_folders)
+            if predicted:
+                self._apply_local_results(mails, predicted, folder_index, state)
+                mails = [mail for mail in mails if mail.id not in predicted]
+
+        # 토큰 예산에 맞춰 배치를 채우고, 429 응답에 맞춰 조절되는 한도 안에서 여러 배치를 동시에 호출
+        mail_map = {mail.id: mail for mail in mails}
+        batches = [
+            [mail_map[mail_data['id']] for mail_data in batch]
+            for batch in self.llm_client.pack_batches([self._mail_data(mail) for mail in mails], existing_folders)
+        ]
+        # 응답은 스트리밍으로 받아 완성된 항목을 조금씩 모아 일괄 반영
+        dispatcher = LLMBatchDispatcher(lambda batch: self._request_batch(batch, existing_folders))
+        received = set()
+        pending = []  # 반영 대기 중인 (mail, result)
+        flushed_at = time.monotonic()
+
+        cancelled = state.is_cancelled()
+        for batch, result, error in dispatcher.run([] if cancelled else batches):
+            # 취소 시 남은 배치는 보내지 않고, 이미 보낸 호출 결과는 반영하지 않음
+            if cancelled or state.is_cancelled():
+                cancelled = True
+                dispatcher.cancel()
+                continue
+
+            if result is not None:
+                mail = mail_map.get(result.get('mail_id'))
+                if mail and mail.id not in received:
+                    received.add(mail.id)
+                    pending.append((mail, result))
+                if len(pending) >= self.APPLY_BATCH_SIZE or time.monotonic() - flushed_at >= self.APPLY_MAX_DELAY:
+                    self._apply_llm_results(pending, folder_index, state, sender_rules)
+                    pending = []
+                    flushed_at = time.monotonic()
+                continue
+
+            # 배치 종료: 모아둔 결과 반영 후 결과를 받지 못한 메일 실패 처리
+            self._apply_llm_results(pending, folder_index, state, sender_rules)
+            pending = []
+            flushed_at = time.monotonic()
+            self._finish_batch(batch, error, state, received)
+
+        sender_rules.evict()
+        if batches:
+            state.update(usage=self.llm_client.usage_summary())
+
+        if cancelled:
+            logger.info(f"Classification cancelled for user {self.user.id}")
+            return
 
         state.complete()
         logger.info(
@@ -275,132 +372,197 @@ class ClassifierService:
             f"{state.success}/{state.total} success, {state.new_folders_created} new folders"
         )
 
-    def _classify_batch(self, mails: list, existing_folders: list, state: ClassificationState):
-        """배치 분류 처리"""
-        mails_data = [
-            {
-                'id': mail.id,
-                'subject': mail.subject,
-                'sender': mail.sender,
-                'snippet': mail.snippet
-            }
-            for mail in mails
-        ]
+    def _request_batch(self, mails: list, existing_folders: list):
+        """배치 분류 LLM 스트리밍 호출 (디스패처 작업 스레드에서 실행, DB 접근 없음)"""
+        mails_data = [self._mail_data(mail) for mail in mails]
+        return self.llm_client.classify_mails_batch_stream(mails_data, existing_folders, self.user.id)
 
-        try:
-            results = self.llm_client.classify_mails_batch(mails_data, existing_folders)
-            # 실제 사용된 provider 업데이트 (fallback 전환 시 반영)
-            state.provider = self.llm_client.provider
-            mail_map = {mail.id: mail for mail in mails}
+    @staticmethod
+    def _mail_data(mail: Mail) -> dict:
+        """LLM 요청용 메일 데이터"""
+        return {
+            'id': mail.id,
+            'subject': mail.subject,
+            'sender': mail.sender,
+            'sender_email': mail.sender_email,
+            'snippet': mail.snippet
+        }
 
-            for result in results:
-                mail_id = result.get('mail_id')
-                mail = mail_map.get(mail_id)
-                if not mail:
-                    continue
-
-                try:
-                    folder_data = self._apply_classification(mail, result, existing_folders)
-                    state.add_result(mail_id, 'success', folder_data)
-                except Exception as e:
-                    logger.error(f"Failed to apply classification for mail {mail_id}: {e}")
-                    state.add_result(mail_id, 'failed', error=str(e))
+    def _predict_by_centroid(self, mails: list, existing_folders: list) -> dict:
+        """
+        폴더 중심 벡터 유사도로 분류 (유사도가 기준 이상인 메일만)
 
-        except Exception as e:
-            logger.error(f"Batch classification failed: {e}")
-            for mail in mails:
-                state.add_result(mail.id, 'failed', error=str(e))
+        Returns:
+            dict: {mail_id: 분류 결과}
+        """
+        centroid = FolderCentroidClassifier.build(self.user)
+        if not centroid.centroids:
+            return {}
+
+        folder_paths = {folder['id']: folder['path'] for folder in existing_folders}
+        predicted = {}
+        for mail in mails:
+            prediction = centroid.predict(mail.subject, mail.sender_email, mail.snippet)
+            if prediction and prediction[0] in folder_paths:
+                folder_id, score = prediction
+                predicted[mail.id] = {
+                    'folder_path': folder_paths[folder_id],
+                    'is_new_folder': False,
+                    'confidence': round(score, 2),
+                }
 
-    @transaction.atomic
-    def _apply_classification(self, mail: Mail, result: dict, existing_folders: list) -> dict:
-        """분류 결과 적용"""
-        folder_path = result.get('folder_path', '미분류')
-        is_new_folder = result.get('is_new_folder', False)
-        confidence = result.get('confidence', 0.0)
+        if predicted:
+            logger.info(f"Centroid classifier matched {len(predicted)}/{len(mails)} mails for user {self.user.id}")
+        return predicted
 
-        if folder_path == '미분류' or not folder_path:
-            mail.is_classified = True
-            mail.folder = None
-            mail.save(update_fields=['is_classified', 'folder', 'updated_at'])
-            return {
-                'id': None,
-                'name': '미분류',
-                'path': '미분류',
-                'is_new_folder': False,
-                'confidence': confidence,
-            }
+    def _apply_local_results(self, mails: list, decided: dict, folder_index: FolderPathIndex,
+                             state: ClassificationState):
+        """LLM 없이 결정된 분류(발신자 규칙, 중심 벡터 유사도) 반영"""
+        self._apply_results(
+            [(mail, decided[mail.id]) for mail in mails if mail.id in decided], folder_index, state
+        )
 
-        folder = None
-        created = False
-
-        if is_new_folder:
-            folder, created = self._get_or_create_folder(folder_path)
-        else:
-            try:
-                folder = Folder.objects.get(user=self.user, path=folder_path)
-            except Folder.DoesNotExist:
-                folder, created = self._get_or_create_folder(folder_path)
-
-        # 메일에 폴더 할당
-        old_folder = mail.folder
-        mail.folder = folder
-        mail.is_classified = True
-        mail.save(update_fields=['folder', 'is_classified', 'updated_at'])
-
-        # 폴더 카운트 업데이트
-        if folder:
-            folder.mail_count = Mail.objects.filter(
-                user=self.user, folder=folder, is_deleted=False
-            ).count()
-            folder.unread_count = Mail.objects.filter(
-                user=self.user, folder=folder, is_deleted=False, is_read=False
-            ).count()
-            folder.save(update_fields=['mail_count', 'unread_count'])
-
-        if old_folder and old_folder != folder:
-            old_folder.mail_count = Mail.objects.filter(
-                user=self.user, folder=old_folder, is_deleted=False
-            ).count()
-            old_folder.unread_count = Mail.objects.filter(
-                user=self.user, folder=old_folder, is_deleted=False, is_read=False
-            ).count()
-            old_folder.save(update_fields=['mail_count', 'unread_count'])
+    def _apply_llm_results(self, pairs: list, folder_index: FolderPathIndex, state: ClassificationState,
+                           sender_rules: SenderRuleService):
+        """LLM 분류 결과 반영 및 신뢰도 높은 결과로 발신자 규칙 학습"""
+        if not pairs:
+            return
 
-        return {
-            'id': folder.id if folder else None,
-            'name': folder.name if folder else '미분류',
-            'path': folder.path if folder else '미분류',
-            'is_new_folder': created,
-            'confidence': confidence,
-        }
+        # 실제 사용된 provider 업데이트 (fallback 전환 시 반영)
+        if state.provider != self.llm_client.provider:
+            state.update(provider=self.llm_client.provider)
 
-    def _get_or_create_folder(self, folder_path: str) -> tuple:
-        """폴더 생성 또는 조회 (경로 기반)"""
-        parts = folder_path.split('/')
-        parent = None
-        created = False
+        applied = self._apply_results(pairs, folder_index, state)
+        sender_rules.learn([
+            (mail.sender_email, folder_data['id'])
+            for mail, folder_data in applied
+            if folder_data['confidence'] >= SenderRuleService.LEARN_MIN_CONFIDENCE
+        ])
 
-        for i, part in enumerate(parts):
-            if i >= 5:  # 최대 5단계
-                break
+    def _apply_results(self, pairs: list, folder_index: FolderPathIndex, state: ClassificationState) -> list:
+        """
+        분류 결과 일괄 반영 및 상태 기록
 
-            current_path = '/'.join(parts[:i + 1])
+        Args:
+            pairs: [(mail, 분류 결과), ...]
 
-            folder, was_created = Folder.objects.get_or_create(
-                user=self.user,
-                path=current_path,
-                defaults={
-                    'name': part,
-                    'parent': parent,
-                    'depth': i,
-                    'order': Folder.objects.filter(user=self.user, parent=parent).count(),
-                }
-            )
+        Returns:
+            list: 반영에 성공한 [(mail, folder_data), ...]
+        """
+        if not pairs:
+            return []
+
+        try:
+            outcomes = self._apply_classifications(pairs, folder_index)
+        except Exception as e:
+            logger.error(f"Failed to apply {len(pairs)} classifications: {e}")
+            # 롤백된 폴더 생성이 메모리 트리에 남지 않도록 다시 불러옴
+            folder_index.reload()
+            state.add_results([(mail.id, 'failed', None, str(e)) for mail, _ in pairs])
+            return []
+
+        state.add_results([
+            (mail.id, 'success' if folder_data else 'failed', folder_data, error)
+            for mail, folder_data, error in outcomes
+        ])
+        return [(mail, folder_data) for mail, folder_data, _ in outcomes if folder_data]
+
+    def _finish_batch(self, mails: list, error: Optional[Exception], state: ClassificationState, received: set):
+        """배치 호출 종료 시 결과를 받지 못한 메일 실패 처리"""
+        missing = [mail for mail in mails if mail.id not in received]
+        if error is not None:
+            logger.error(f"Batch classification failed after {len(mails) - len(missing)}/{len(mails)} results: {error}")
+        for mail in missing:
+            received.add(mail.id)
+        state.add_results([
+            (mail.id, 'failed', None, str(error) if error else 'AI 응답에 분류 결과가 없습니다.')
+            for mail in missing
+        ])
 
-            if was_created:
-                created = True
-                logger.info(f"Created new folder: {current_path} for user {self.user.id}")
+    @transaction.atomic
+    def _apply_classifications(self, pairs: list, folder_index: FolderPathIndex) -> list:
+        """
+        분류 결과 일괄 적용
 
-            parent = folder
+        폴더 경로는 메모리 폴더 트리에서 찾고(없는 경로만 일괄 생성), 메일은 bulk_update 한 번으로 갱신하며,
+        폴더 카운트는 전체를 다시 세지 않고 폴더별 변화량(F 표현식)으로 반영합니다.
+        (bulk_update는 시그널을 발생시키지 않으므로 카운트는 여기서 직접 처리)
 
-        return parent, created
+        Args:
+            pairs: [(mail, 분류 결과), ...]
+            folder_index: 작업용 폴더 경로 트리
+
+        Returns:
+            list: [(mail, folder_data 또는 None, 오류 메시지 또는 None), ...]
+        """
+        folders, new_paths = folder_index.resolve({
+            result.get('folder_path') for _, result in pairs
+            if result.get('folder_path') and result.get('folder_path') != '미분류'
+        })
+
+        # 현재 메일 상태 (작업 시작 후 다른 요청으로 바뀌었을 수 있으므로 다시 조회)
+        current = {
+            mail_id: (folder_id, is_read, is_deleted)
+            for mail_id, folder_id, is_read, is_deleted in Mail.objects.filter(
+                id__in=[mail.id for mail, _ in pairs]
+            ).values_list('id', 'folder_id', 'is_read', 'is_deleted')
+        }
+
+        now = timezone.now()
+        deltas = defaultdict(lambda: {'mail': 0, 'unread': 0})
+        outcomes = []
+        to_update = []
+        for mail, result in pairs:
+            if mail.id not in current:
+                outcomes.append((mail, None, '메일을 찾을 수 없습니다.'))
+                continue
+
+            folder = folders.get(result.get('folder_path'))
+            old_folder_id, is_read, is_deleted = current[mail.id]
+            new_folder_id = folder['id'] if folder else None
+
+            if not is_deleted and old_folder_id != new_folder_id:
+                unread = 0 if is_read else 1
+                if old_folder_id:
+                    deltas[old_folder_id]['mail'] -= 1
+                    deltas[old_folder_id]['unread'] -= unread
+                if new_folder_id:
+                    deltas[new_folder_id]['mail'] += 1
+                    deltas[new_folder_id]['unread'] += unread
+            current[mail.id] = (new_folder_id, is_read, is_deleted)
+
+            mail.folder_id = new_folder_id
+            mail.is_classified = True
+            mail.updated_at = now
+            to_update.append(mail)
+
+            # 새로 만든 폴더는 처음 배정된 메일에서만 새 폴더로 집계
+            is_new_folder = bool(folder) and folder['path'] in new_paths
+            if is_new_folder:
+                new_paths.discard(folder['path'])
+            outcomes.append((mail, {
+                'id': new_folder_id,
+                'name': folder['name'] if folder else '미분류',
+                'path': folder['path'] if folder else '미분류',
+                'is_new_folder': is_new_folder,
+                'confidence': result.get('confidence', 0.0),
+            }, None))
+
+        Mail.objects.bulk_update(to_update, ['folder', 'is_classified', 'updated_at'], batch_size=500)
+        apply_folder_count_deltas(deltas)
+        return outcomes
+
+
+def run_classification_job(user_id: int, mail_ids: list, classification_id: str):
+    """
+    작업 큐 핸들러: 분류 실행
+
+    Args:
+        user_id: 사용자 ID
+        mail_ids: 분류할 메일 ID 목록
+        classification_id: 진행 상태를 기록할 분류 작업 ID
+    """
+    from apps.accounts.models import User
+
+    service = ClassifierService(User.objects.get(id=user_id))
+    service._run_classification_in_background(user_id, mail_ids, classification_id)
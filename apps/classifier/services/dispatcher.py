@@ -0,0 +1,152 @@
+"""
+LLM 배치 동시 호출 디스패처
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD(가산 증가/승산 감소) 방식 동시 호출 수 제한
+
+    - 호출 성공: 한도만큼 성공할 때마다 한도 +1 (호출당 +1/한도)
+    - 429 응답: 한도를 절반으로 줄이고 cooldown 동안 새 호출 중단
+    """
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 4, cooldown: float = 2.0):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.cooldown = cooldown
+        self._limit = float(min(max(initial, minimum), self.maximum))
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """여유가 있으면 호출 슬롯을 차지"""
+        with self._cond:
+            if time.monotonic() < self._paused_until or self._in_flight >= int(self._limit):
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self):
+        """호출 슬롯 반환"""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def wait(self, timeout: float):
+        """슬롯 반환 또는 cooldown 종료를 최대 timeout초 대기"""
+        with self._cond:
+            remaining = self._paused_until - time.monotonic()
+            self._cond.wait(min(timeout, remaining) if remaining > 0 else timeout)
+
+    def on_success(self):
+        with self._cond:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def on_rate_limited(self):
+        with self._cond:
+            self._limit = max(self.minimum, self._limit / 2)
+            self._paused_until = max(self._paused_until, time.monotonic() + self.cooldown)
+        logger.info(f"LLM rate limited, concurrency limit reduced to {self.limit}")
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_llm_limiter() -> AdaptiveConcurrencyLimiter:
+    """프로세스 공용 LLM 동시 호출 제한기 (같은 API 키를 쓰는 모든 분류 작업이 공유)"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = AdaptiveConcurrencyLimiter(
+                    maximum=getattr(settings, 'LLM_MAX_CONCURRENCY', 4),
+                )
+    return _limiter
+
+
+class LLMBatchDispatcher:
+    """
+    여러 배치를 동시에 LLM에 보내고 결과를 받는 대로 반환
+
+    호출만 작업 스레드에서 실행하고, 결과 반영(DB 쓰기)은 run()을 순회하는 스레드에서 처리합니다.
+    스트리밍 호출이면 배치가 끝나기 전에도 완성된 항목부터 전달됩니다.
+    """
+
+    POLL_INTERVAL = 0.5  # 결과/슬롯 확인 주기 (초)
+
+    def __init__(self, call: Callable[[list], Iterable[dict]], limiter: Optional[AdaptiveConcurrencyLimiter] = None):
+        """
+        Args:
+            call: 배치 하나를 받아 분류 결과를 하나씩 내보내는 함수 (제너레이터 또는 목록 반환)
+            limiter: 동시 호출 제한기 (기본값: 프로세스 공용 제한기)
+        """
+        self.call = call
+        self.limiter = limiter or get_llm_limiter()
+        self._cancelled = False
+
+    def cancel(self):
+        """남은 배치 전송 중단 (이미 보낸 호출은 끝날 때까지 기다림)"""
+        self._cancelled = True
+
+    def _call(self, batch: list, events: queue.Queue):
+        try:
+            for result in self.call(batch):
+                events.put((batch, result, None))
+            self.limiter.on_success()
+            events.put((batch, None, None))
+        except Exception as e:
+            events.put((batch, None, e))
+        finally:
+            self.limiter.release()
+
+    def run(self, batches: list):
+        """
+        배치 동시 호출 (제너레이터)
+
+        Yields:
+            tuple: (batch, 결과 1건, None) - 결과를 받을 때마다
+                   (batch, None, 예외 또는 None) - 배치 호출이 끝났을 때 (성공 시 예외 None)
+        """
+        queued = deque(batches)
+        events = queue.Queue()
+        in_flight = 0
+
+        with ThreadPoolExecutor(max_workers=self.limiter.maximum, thread_name_prefix='llm') as executor:
+            while queued or in_flight:
+                if self._cancelled:
+                    queued.clear()
+                while queued and self.limiter.try_acquire():
+                    executor.submit(self._call, queued.popleft(), events)
+                    in_flight += 1
+
+                if not in_flight:
+                    # 429 cooldown 중이거나 다른 작업이 슬롯을 모두 사용 중
+                    self.limiter.wait(self.POLL_INTERVAL)
+                    continue
+
+                try:
+                    batch, result, error = events.get(timeout=self.POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if result is None:
+                    in_flight -= 1
+                yield batch, result, error
@@ -0,0 +1,161 @@
+"""
+분류 작업용 폴더 경로 트리
+"""
+import logging
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+
+from apps.folders.models import Folder
+
+logger = logging.getLogger(__name__)
+
+
+class FolderPathIndex:
+    """
+    사용자 폴더를 경로 단계별 트리(trie)로 들고 있는 메모리 인덱스
+
+    분류 작업 시작 시 조회한 폴더 목록으로 한 번만 만들고, 경로 조회는 DB 없이 처리합니다.
+    없는 경로는 단계(깊이)별로 모아 bulk_create로 한 번에 만듭니다.
+    동시에 실행 중인 다른 작업이 같은 경로를 먼저 만든 경우(unique_user_folder_path 충돌)에는
+    충돌을 무시하고 다시 넣은 뒤 해당 경로를 다시 조회해 이미 만들어진 폴더를 사용합니다.
+    """
+
+    MAX_DEPTH = 5  # 최대 5단계
+    FIELDS = ('id', 'name', 'path', 'depth', 'parent_id', 'order')
+
+    def __init__(self, user, folders: list):
+        """
+        Args:
+            user: 폴더 소유 사용자
+            folders: 폴더 목록 (FIELDS 값 포함)
+        """
+        self.user = user
+        self._load(folders)
+
+    def _load(self, folders: list):
+        self._root = {}  # 이름 -> 노드 {'id', 'name', 'path', 'depth', 'children'}
+        self._next_order = defaultdict(int)  # 부모 폴더 ID -> 다음 정렬 순서
+        for folder in sorted(folders, key=lambda folder: folder['depth']):
+            self._add(folder)
+
+    def reload(self):
+        """DB에서 다시 불러오기 (트랜잭션이 롤백되어 메모리 상태가 어긋났을 때)"""
+        self._load(list(Folder.objects.filter(user=self.user).values(*self.FIELDS)))
+
+    def _add(self, folder: dict) -> dict:
+        segments = folder['path'].split('/')
+        children = self._root
+        for segment in segments[:-1]:
+            parent = children.get(segment)
+            if parent is None:
+                # 부모가 목록에 없는 비정상 데이터는 트리에 넣지 않음
+                return None
+            children = parent['children']
+
+        node = children.get(segments[-1])
+        if node is None:
+            node = children[segments[-1]] = {'children': {}}
+        node.update(id=folder['id'], name=folder['name'], path=folder['path'], depth=folder['depth'])
+
+        parent_id = folder.get('parent_id')
+        self._next_order[parent_id] = max(self._next_order[parent_id], folder.get('order', 0) + 1)
+        return node
+
+    @classmethod
+    def segments(cls, path: str) -> tuple:
+        """경로를 단계별 이름으로 분리 (빈 단계 제거, 최대 MAX_DEPTH단계)"""
+        max_length = Folder._meta.get_field('name').max_length
+        parts = [part.strip()[:max_length] for part in (path or '').split('/')]
+        return tuple(part for part in parts if part)[:cls.MAX_DEPTH]
+
+    def find(self, segments: tuple) -> dict:
+        """경로에 해당하는 노드 (없으면 None)"""
+        node = None
+        children = self._root
+        for segment in segments:
+            node = children.get(segment)
+            if node is None:
+                return None
+            children = node['children']
+        return node
+
+    def resolve(self, paths) -> tuple:
+        """
+        경로 목록을 폴더로 변환 (없는 경로는 한 번에 생성)
+
+        Args:
+            paths: 폴더 경로 목록
+
+        Returns:
+            tuple: ({경로: 노드}, 이 작업에서 새로 만든 폴더 경로 집합)
+        """
+        wanted = {path: self.segments(path) for path in paths}
+        created = self._create_missing([segments for segments in wanted.values() if segments])
+        resolved = {}
+        for path, segments in wanted.items():
+            node = self.find(segments) if segments else None
+            if node is not None:
+                resolved[path] = node
+        return resolved, created
+
+    def _create_missing(self, targets: list) -> set:
+        """
+        없는 폴더를 얕은 단계부터 단계별 bulk_create 한 번으로 생성
+
+        Returns:
+            set: 새로 만든 폴더 경로
+        """
+        created = set()
+        for depth in range(self.MAX_DEPTH):
+            missing = {}  # 경로 -> (부모 노드, 이름)
+            for segments in targets:
+                if len(segments) <= depth:
+                    continue
+                parent = self.find(segments[:depth]) if depth else None
+                if depth and parent is None:
+                    continue
+                if self.find(segments[:depth + 1]) is None:
+                    missing['/'.join(segments[:depth + 1])] = (parent, segments[depth])
+            if not missing:
+                continue
+
+            folders = []
+            for path, (parent, name) in missing.items():
+                parent_id = parent['id'] if parent else None
+                folders.append(Folder(
+                    user=self.user,
+                    parent_id=parent_id,
+                    name=name,
+                    path=path,
+                    depth=depth,
+                    order=self._next_order[parent_id],
+                ))
+                self._next_order[parent_id] += 1
+            created |= self._insert(folders)
+        return created
+
+    def _insert(self, folders: list) -> set:
+        """폴더 일괄 생성 후 트리에 추가 (다른 작업과 경로가 겹치면 그쪽 폴더를 사용)"""
+        paths = [folder.path for folder in folders]
+        try:
+            with transaction.atomic():
+                Folder.objects.bulk_create(folders)
+            created = set(paths)
+        except IntegrityError:
+            # 동시에 실행 중인 다른 작업이 같은 경로를 먼저 만든 경우
+            logger.info(f"Folder path conflict for user {self.user.id}, reusing existing folders")
+            existing = set(Folder.objects.filter(user=self.user, path__in=paths).values_list('path', flat=True))
+            Folder.objects.bulk_create(folders, ignore_conflicts=True)
+            created = set(paths) - existing
+
+        if created == set(paths) and all(folder.pk for folder in folders):
+            rows = [{field: getattr(folder, field) for field in self.FIELDS} for folder in folders]
+        else:
+            # ignore_conflicts로 넣었거나 DB가 생성된 ID를 돌려주지 않는 경우 다시 조회
+            rows = Folder.objects.filter(user=self.user, path__in=paths).values(*self.FIELDS)
+        for row in rows:
+            self._add(row)
+        if created:
+            logger.info(f"Created {len(created)} new folders for user {self.user.id}: {sorted(created)}")
+        return created
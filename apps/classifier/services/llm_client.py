@@ -1,15 +1,28 @@
 """
 LLM API 클라이언트 (Gemini 우선, OpenAI GPT 폴백)
 """
+import itertools
 import json
 import logging
+import math
 import re
+import threading
 import time
 
 from django.conf import settings
 from rest_framework.exceptions import ValidationError
 
-from ..prompts import BATCH_CLASSIFICATION_PROMPT, CLASSIFICATION_PROMPT, SYSTEM_PROMPT
+from ..prompts import (
+    BATCH_CLASSIFICATION_EMAILS,
+    BATCH_CLASSIFICATION_SCHEMA,
+    CLASSIFICATION_PROMPT,
+    SYSTEM_PROMPT,
+)
+from .circuit_breaker import get_circuit_breaker
+from .classification_cache import ClassificationCache, get_classification_cache
+from .llm_registry import get_llm_registry
+from .prompt_builder import BatchPromptBuilder
+from .stream_parser import JSONArrayStreamParser
 
 logger = logging.getLogger(__name__)
 
@@ -17,54 +30,41 @@ logger = logging.getLogger(__name__)
 class LLMClient:
     """LLM API 클라이언트 (Gemini 우선, GPT 폴백) - LangChain 통합"""
 
-    def __init__(self):
-        self.primary_llm = None
-        self.fallback_llm = None
-        self.primary_provider = None
-        self.fallback_provider = None
-
-        google_api_key = getattr(settings, 'GOOGLE_API_KEY', None)
-        openai_api_key = getattr(settings, 'OPENAI_API_KEY', None)
-
-        # Gemini 우선 초기화
-        if google_api_key:
-            try:
-                from langchain_google_genai import ChatGoogleGenerativeAI
-                model = "gemini-2.5-flash"
-                self.primary_llm = ChatGoogleGenerativeAI(
-                    model=model,
-                    google_api_key=google_api_key,
-                    temperature=0.1,
-                    max_tokens=2048,
-                )
-                self.primary_provider = model
-                logger.info("Primary LLM: Google Gemini (LangChain)")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Gemini: {e}")
-
-        # OpenAI를 폴백으로 초기화
-        if openai_api_key:
-            try:
-                from langchain_openai import ChatOpenAI
-                model="gpt-5-nano"
-                self.fallback_llm = ChatOpenAI(
-                    model=model,
-                    api_key=openai_api_key,
-                    temperature=0.1,
-                    max_tokens=2048,
-                )
-                self.fallback_provider = model
-                logger.info("Fallback LLM: OpenAI GPT (LangChain)")
-            except Exception as e:
-                logger.warning(f"Failed to initialize OpenAI: {e}")
-
-        # Primary가 없으면 fallback을 primary로 승격
-        if self.primary_llm is None and self.fallback_llm is not None:
-            self.primary_llm = self.fallback_llm
-            self.primary_provider = self.fallback_provider
-            self.fallback_llm = None
-            self.fallback_provider = None
-            logger.info(f"Promoted {self.primary_provider} to primary (no Gemini available)")
+    CACHE_MIN_CONFIDENCE = 0.7  # 캐시에 저장할 분류 결과의 최소 confidence
+
+    # 배치 크기 산정용 토큰 예산
+    MAX_OUTPUT_TOKENS = 2048  # 응답 최대 토큰 (모델 설정값)
+    OUTPUT_HEADROOM = 0.8  # 응답이 잘리지 않도록 출력 예산의 80%까지만 사용
+    RESULT_BASE_TOKENS = 60  # 분류 결과 1건의 고정 토큰 (필드명, mail_id, confidence, reason)
+    INPUT_TOKEN_BUDGET = 16000  # 프롬프트 최대 토큰 (지연 시간/비용 상한)
+    MODEL_CONTEXT_WINDOWS = {
+        'gemini-2.5-flash': 1048576,
+        'gpt-5-nano': 400000,
+    }
+    SNIPPET_MAX_CHARS = 200
+
+    MAX_REPAIR_ATTEMPTS = 1  # 응답에 없거나 잘못된 메일만 다시 요청하는 횟수
+    # 구조화 출력 방식 (없으면 LangChain 기본값: tool/function calling)
+    STRUCTURED_OUTPUT_METHODS = {
+        'gpt-5-nano': 'json_schema',
+    }
+
+    def __init__(self, rate_limiter=None):
+        """
+        Args:
+            rate_limiter: 429 응답을 전달받을 동시 호출 제한기 (AdaptiveConcurrencyLimiter)
+        """
+        self.rate_limiter = rate_limiter
+        self.structured_output = getattr(settings, 'LLM_STRUCTURED_OUTPUT', False)
+        self.usage = {'calls': 0, 'input_tokens': 0, 'cached_input_tokens': 0, 'output_tokens': 0}
+        self._usage_lock = threading.Lock()
+
+        # 모델(HTTP 연결 풀 포함)은 프로세스 공용 레지스트리에서 가져오고, 클라이언트에는 작업별 상태만 둠
+        self.registry = get_llm_registry(self.MAX_OUTPUT_TOKENS)
+        self.primary_llm = self.registry.primary_llm
+        self.fallback_llm = self.registry.fallback_llm
+        self.primary_provider = self.registry.primary_provider
+        self.fallback_provider = self.registry.fallback_provider
 
         if self.primary_llm is None:
             raise ValidationError({
@@ -72,6 +72,11 @@ class LLMClient:
                 'message': 'GOOGLE_API_KEY 또는 OPENAI_API_KEY가 설정되지 않았습니다.'
             })
 
+        # 헬스 체크에 설정된 프로바이더가 모두 보이도록 서킷 브레이커 등록
+        for provider in (self.primary_provider, self.fallback_provider):
+            if provider:
+                get_circuit_breaker(provider)
+
         # 호환성을 위한 속성
         self.llm = self.primary_llm
         self.provider = self.primary_provider
@@ -80,9 +85,8 @@ class LLMClient:
         """
         단일 메일 분류
         """
-        folders_str = self._format_folders(existing_folders)
         prompt = CLASSIFICATION_PROMPT.format(
-            folders=folders_str,
+            folders=BatchPromptBuilder.format_folder_tree(existing_folders),
             subject=mail_data.get('subject', '(제목 없음)'),
             sender=mail_data.get('sender', '(알 수 없음)'),
             snippet=mail_data.get('snippet', '')[:500]
@@ -98,108 +102,390 @@ class LLMClient:
                 'message': f'AI 분류 실패: {str(e)}'
             })
 
-    def classify_mails_batch(self, mails_data: list, existing_folders: list) -> list:
-        """
-        배치 메일 분류 (최대 20개)
+    def classify_mails_batch(self, mails_data: list, existing_folders: list, user_id: int) -> list:
+        """배치 메일 분류 (모든 결과를 모아서 반환)"""
+        return list(self.classify_mails_batch_stream(mails_data, existing_folders, user_id))
+
+    def classify_mails_batch_stream(self, mails_data: list, existing_folders: list, user_id: int):
         """
-        if len(mails_data) > 20:
-            mails_data = mails_data[:20]
+        배치 메일 분류 (스트리밍, 제너레이터)
 
-        folders_str = self._format_folders(existing_folders)
-        emails_str = self._format_emails(mails_data)
+        같은 발신자/제목 템플릿/폴더 구성으로 이미 분류한 메일은 캐시된 결과를 먼저 반환하고,
+        나머지는 LLM 응답을 스트리밍으로 받으며 항목이 완성되는 대로 반환합니다
+        (구조화 출력 모드에서는 호출 단위로 반환). 한 번의 호출 예산을 넘는 메일은 나누어 순서대로 요청합니다.
 
-        prompt = BATCH_CLASSIFICATION_PROMPT.format(
-            folders=folders_str,
-            emails=emails_str
-        )
+        Args:
+            mails_data: 분류할 메일 데이터 목록
+            existing_folders: 사용자의 기존 폴더 목록
+            user_id: 메일 소유 사용자 ID (캐시는 사용자별로 구분)
 
-        try:
-            response = self._invoke_with_retry(prompt)
-            return self._parse_batch_response(response, mails_data)
-        except Exception as e:
-            logger.error(f"LLM batch classification failed: {e}")
-            raise ValidationError({
-                'code': 'LLM_API_ERROR',
-                'message': f'AI 배치 분류 실패: {str(e)}'
-            })
+        Yields:
+            dict: 메일 1건의 분류 결과 (mail_id 포함)
+        """
+        cache = get_classification_cache()
+        folder_version = cache.folder_set_version(existing_folders)
+        uncached = []
+        for mail in mails_data:
+            key = ClassificationCache.fingerprint(user_id, mail, folder_version)
+            hit = cache.get(key)
+            if hit:
+                yield {**hit, 'mail_id': mail['id']}
+            else:
+                uncached.append((key, mail))
+
+        if not uncached:
+            return
+
+        keys = {mail['id']: key for key, mail in uncached}
+        builder = BatchPromptBuilder(existing_folders, self.SNIPPET_MAX_CHARS)
+        for chunk in self.pack_batches([mail for _, mail in uncached], existing_folders, builder):
+            for result in self._classify_chunk(chunk, builder):
+                key = keys.get(result['mail_id'])
+                if key and result['confidence'] >= self.CACHE_MIN_CONFIDENCE:
+                    cache.set(key, {k: v for k, v in result.items() if k != 'mail_id'})
+                yield result
+
+    def _classify_chunk(self, mails_data: list, builder: BatchPromptBuilder):
+        """
+        배치 1회 분류 (누락/오류 항목만 재요청)
 
-    def _invoke_with_retry(self, prompt: str, max_retries: int = 2) -> str:
-        """LLM 호출 (재시도 포함, 폴백 지원)"""
-        last_error = None
+        응답에 없거나 검증에 실패한 메일만 모아 최대 MAX_REPAIR_ATTEMPTS번 다시 요청합니다.
+        그래도 결과가 없는 메일은 반환하지 않으므로, 호출한 쪽에서 실패로 처리해 다음 분류 때 다시 시도됩니다.
+
+        Yields:
+            dict: 메일 1건의 분류 결과
+        """
+        request = self._request_structured if self.structured_output else self._request_stream
+        remaining = mails_data
+        total_emitted = 0
 
-        # Primary LLM 시도
-        for attempt in range(max_retries):
+        for attempt in range(self.MAX_REPAIR_ATTEMPTS + 1):
+            emitted = set()
+            failed = False
             try:
-                result = self._invoke_llm(prompt, self.primary_llm, self.primary_provider)
-                self.provider = self.primary_provider  # 실제 사용된 provider 기록
-                return result
+                for result in request(remaining, builder):
+                    emitted.add(result['mail_id'])
+                    yield result
             except Exception as e:
-                last_error = e
-                error_str = str(e).lower()
-                logger.warning(f"Primary LLM ({self.primary_provider}) attempt {attempt + 1} failed: {e}")
-
-                # 429, rate limit, 연결 에러 체크
-                is_retriable = (
-                    '429' in error_str or
-                    'rate' in error_str or
-                    'resource_exhausted' in error_str or
-                    'quota' in error_str or
-                    'connection' in error_str or
-                    'timeout' in error_str
-                )
-
-                if is_retriable:
-                    wait_time = (2 ** attempt) * 2  # 2초, 4초
-                    logger.info(f"Retriable error, waiting {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    time.sleep(1)
-
-        # Fallback LLM 시도
+                if not total_emitted and not emitted:
+                    logger.error(f"LLM batch classification failed: {e}")
+                    raise ValidationError({
+                        'code': 'LLM_API_ERROR',
+                        'message': f'AI 배치 분류 실패: {str(e)}'
+                    })
+                logger.warning(f"LLM batch request interrupted after {len(emitted)}/{len(remaining)} results: {e}")
+                failed = not emitted
+
+            total_emitted += len(emitted)
+            remaining = [mail for mail in remaining if mail['id'] not in emitted]
+            if not remaining or failed:
+                break
+            if attempt < self.MAX_REPAIR_ATTEMPTS:
+                logger.info(f"Re-requesting {len(remaining)} missing or invalid results")
+
+        if remaining:
+            logger.warning(f"No valid LLM result for {len(remaining)}/{len(mails_data)} mails, leaving them unclassified")
+
+    def _request_stream(self, mails_data: list, builder: BatchPromptBuilder):
+        """
+        배치 프롬프트 스트리밍 호출 및 증분 파싱
+
+        항목이 완성되는 대로 검증해 반환하므로, 응답이 잘리거나 중간에 끊겨도
+        이미 받은 항목은 유지됩니다.
+
+        Yields:
+            dict: 검증을 통과한 분류 결과
+        """
+        expected = {mail['id'] for mail in mails_data}
+        parser = JSONArrayStreamParser()
+        invalid = 0
+
+        for text in self._stream_with_retry(builder.build(mails_data)):
+            for item in parser.feed(text):
+                result = self._validate_batch_item(item, expected)
+                if result is None:
+                    invalid += 1
+                    continue
+                yield result
+
+        if expected:
+            logger.warning(
+                f"LLM batch response missing {len(expected)}/{len(mails_data)} results "
+                f"({parser.errors} malformed, {invalid} invalid, finished={parser.finished})"
+            )
+
+    def _request_structured(self, mails_data: list, builder: BatchPromptBuilder):
+        """
+        구조화 출력 모드 배치 호출 (프로바이더가 스키마에 맞춘 응답을 반환)
+
+        Yields:
+            dict: 검증을 통과한 분류 결과
+        """
+        expected = {mail['id'] for mail in mails_data}
+        response = self._invoke_with_retry(builder.build(mails_data), invoke=self._invoke_structured)
+        items = response.get('classifications') if isinstance(response, dict) else None
+
+        invalid = 0
+        for item in items or []:
+            result = self._validate_batch_item(item, expected) if isinstance(item, dict) else None
+            if result is None:
+                invalid += 1
+                continue
+            yield result
+
+        if expected:
+            logger.warning(
+                f"Structured LLM response missing {len(expected)}/{len(mails_data)} results ({invalid} invalid)"
+            )
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """
+        토큰 수 추정 (토크나이저 없이 보수적으로 계산)
+
+        영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 1토큰으로 계산합니다.
+        """
+        if not text:
+            return 0
+        non_ascii = sum(1 for ch in text if ord(ch) > 127)
+        return non_ascii + math.ceil((len(text) - non_ascii) / 4)
+
+    def _mail_token_budget(self, fixed_tokens: int) -> int:
+        """
+        배치 하나의 메일 목록에 사용할 수 있는 토큰 수
+
+        프롬프트 전체를 INPUT_TOKEN_BUDGET 안에 맞추되, 폴더 목록이 너무 커서 남는 예산이 적으면
+        메일 1~2개씩 호출하며 폴더 목록 비용을 반복하지 않도록 예산의 1/4은 메일용으로 보장합니다.
+        설정된 모델 중 가장 작은 컨텍스트 윈도우는 넘지 않습니다.
+        """
+        windows = [
+            self.MODEL_CONTEXT_WINDOWS.get(provider, self.INPUT_TOKEN_BUDGET + self.MAX_OUTPUT_TOKENS)
+            for provider in (self.primary_provider, self.fallback_provider)
+            if provider
+        ]
+        context_budget = min(windows, default=self.INPUT_TOKEN_BUDGET + self.MAX_OUTPUT_TOKENS)
+        context_budget -= self.MAX_OUTPUT_TOKENS + fixed_tokens
+        return min(context_budget, max(self.INPUT_TOKEN_BUDGET - fixed_tokens, self.INPUT_TOKEN_BUDGET // 4))
+
+    def pack_batches(self, mails_data: list, existing_folders: list, builder: BatchPromptBuilder = None) -> list:
+        """
+        토큰 예산에 맞춰 메일을 배치로 묶기
+
+        폴더 목록/프롬프트 고정 비용을 뺀 입력 예산과, 응답이 MAX_OUTPUT_TOKENS에서 잘리지 않는
+        출력 예산을 모두 넘지 않는 범위에서 순서대로 최대한 채웁니다.
+
+        Args:
+            mails_data: 분류할 메일 데이터 목록
+            existing_folders: 기존 폴더 목록
+            builder: 프롬프트 생성기 (없으면 existing_folders로 생성)
+
+        Returns:
+            list: 메일 데이터 배치 목록 (배치마다 최소 1개)
+        """
+        builder = builder or BatchPromptBuilder(existing_folders, self.SNIPPET_MAX_CHARS)
+        fixed_tokens = (
+            self.estimate_tokens(SYSTEM_PROMPT) +
+            self.estimate_tokens(builder.prefix) +
+            self.estimate_tokens(BATCH_CLASSIFICATION_EMAILS)
+        )
+        input_budget = self._mail_token_budget(fixed_tokens)
+
+        # 결과 1건 = 고정 필드 + 폴더 경로 (기존 폴더 중 가장 긴 경로 또는 새 폴더 제안)
+        longest_path = max((self.estimate_tokens(folder['path']) for folder in existing_folders), default=10)
+        result_tokens = self.RESULT_BASE_TOKENS + max(longest_path, 10)
+        output_budget = int(self.MAX_OUTPUT_TOKENS * self.OUTPUT_HEADROOM)
+
+        batches = []
+        batch = []
+        input_used = 0
+        for mail in mails_data:
+            mail_tokens = self.estimate_tokens(builder.format_emails([mail]))
+            fits = (
+                input_used + mail_tokens <= input_budget and
+                (len(batch) + 1) * result_tokens <= output_budget
+            )
+            if batch and not fits:
+                batches.append(batch)
+                batch = []
+                input_used = 0
+            batch.append(mail)
+            input_used += mail_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _invoke_with_retry(self, prompt: str, max_retries: int = 2, invoke=None):
+        """
+        LLM 호출 (재시도 포함, 서킷 브레이커 기반 폴백)
+
+        서킷이 열린(최근 실패/지연이 잦은) 프로바이더는 호출하지 않고 바로 다음 프로바이더를 사용합니다.
+        실패 시 사용할 수 있는 다음 프로바이더가 있으면 대기 없이 전환하고, 없을 때만 백오프 후 재시도합니다.
+
+        Args:
+            invoke: 실제 호출 함수 (prompt, llm, provider) (기본값: 응답 전체를 받는 _invoke_llm)
+        """
+        invoke = invoke or self._invoke_llm
+        providers = [(self.primary_llm, self.primary_provider)]
         if self.fallback_llm is not None:
-            logger.info(f"Switching to fallback LLM ({self.fallback_provider})")
+            providers.append((self.fallback_llm, self.fallback_provider))
+        last_error = None
+
+        for index, (llm, provider) in enumerate(providers):
+            breaker = get_circuit_breaker(provider)
+            next_breaker = get_circuit_breaker(providers[index + 1][1]) if index + 1 < len(providers) else None
+            if index > 0:
+                logger.info(f"Switching to fallback LLM ({provider})")
+
             for attempt in range(max_retries):
+                if not breaker.allow():
+                    logger.info(f"Circuit open for {provider}, skipping")
+                    break
+
+                started = time.monotonic()
                 try:
-                    result = self._invoke_llm(prompt, self.fallback_llm, self.fallback_provider)
-                    self.provider = self.fallback_provider  # 실제 사용된 provider 기록
-                    return result
+                    result = invoke(prompt, llm, provider)
                 except Exception as e:
+                    breaker.record_failure(time.monotonic() - started, str(e))
                     last_error = e
-                    logger.warning(f"Fallback LLM ({self.fallback_provider}) attempt {attempt + 1} failed: {e}")
-                    time.sleep(2 ** attempt)
+                    error_str = str(e).lower()
+                    logger.warning(f"LLM ({provider}) attempt {attempt + 1} failed: {e}")
+
+                    # 동시 호출 한도를 줄여 다른 요청도 함께 속도를 낮추도록 알림
+                    is_rate_limited = self._is_rate_limit_error(error_str)
+                    if is_rate_limited and self.rate_limiter is not None:
+                        self.rate_limiter.on_rate_limited()
+
+                    # 정상인 다음 프로바이더가 있으면 대기 없이 전환
+                    if next_breaker is not None and next_breaker.is_available():
+                        break
+                    if attempt + 1 < max_retries:
+                        is_retriable = is_rate_limited or 'connection' in error_str or 'timeout' in error_str
+                        wait_time = (2 ** attempt) * 2 if is_retriable else 1  # 2초, 4초
+                        logger.info(f"Waiting {wait_time} seconds before retry...")
+                        time.sleep(wait_time)
+                    continue
+
+                breaker.record_success(time.monotonic() - started)
+                self.provider = provider  # 실제 사용된 provider 기록
+                return result
 
+        if last_error is None:
+            raise RuntimeError('모든 LLM 프로바이더의 서킷이 열려 있습니다. 잠시 후 다시 시도해주세요.')
         raise last_error
 
+    @staticmethod
+    def _is_rate_limit_error(error_str: str) -> bool:
+        """429/할당량 초과 오류 여부 (소문자 오류 메시지 기준)"""
+        return (
+            '429' in error_str or
+            'rate' in error_str or
+            'resource_exhausted' in error_str or
+            'quota' in error_str
+        )
+
     def _invoke_llm(self, prompt: str, llm=None, provider: str = None) -> str:
         """LangChain 통합 LLM 호출"""
         if llm is None:
             llm = self.primary_llm
             provider = self.primary_provider
 
-        messages = [
-            ("system", SYSTEM_PROMPT),
-            ("human", prompt)
-        ]
         logger.debug(f"Invoking {provider} LLM...")
-        response = llm.invoke(messages)
+        response = llm.invoke(self._messages(prompt))
+        self._record_usage(provider, self._usage_counts(getattr(response, 'usage_metadata', None)))
         return response.content
 
-    def _format_folders(self, folders: list) -> str:
-        """폴더 목록 포맷팅"""
-        if not folders:
-            return "(폴더 없음 - 새 폴더를 제안해주세요)"
-        return "\n".join([f"- {f['path']}" for f in folders])
-
-    def _format_emails(self, mails: list) -> str:
-        """이메일 목록 포맷팅"""
-        result = []
-        for mail in mails:
-            result.append(f"""### 이메일 #{mail['id']}
-- 제목: {mail.get('subject', '(제목 없음)')}
-- 발신자: {mail.get('sender', '(알 수 없음)')}
-- 내용: {mail.get('snippet', '')[:200]}
-""")
-        return "\n".join(result)
+    def _invoke_structured(self, prompt: str, llm, provider: str):
+        """구조화 출력 호출 (BATCH_CLASSIFICATION_SCHEMA에 맞춘 dict 반환)"""
+        structured_llm = self.registry.structured(
+            provider, llm, BATCH_CLASSIFICATION_SCHEMA, self.STRUCTURED_OUTPUT_METHODS.get(provider)
+        )
+
+        logger.debug(f"Invoking {provider} LLM (structured output)...")
+        response = structured_llm.invoke(self._messages(prompt))
+        self._record_usage(provider, self._usage_counts(getattr(response.get('raw'), 'usage_metadata', None)))
+        if response.get('parsing_error'):
+            logger.warning(f"Structured output parsing failed ({provider}): {response['parsing_error']}")
+        return response.get('parsed')
+
+    def _stream_with_retry(self, prompt: str):
+        """
+        스트리밍 LLM 호출 (첫 응답 조각을 받기 전 실패는 재시도/폴백)
+
+        Returns:
+            iterator: 응답 텍스트 조각 (이후 끊기면 순회 중 예외 발생)
+        """
+        return self._invoke_with_retry(prompt, invoke=self._start_stream)
+
+    def _start_stream(self, prompt: str, llm, provider: str):
+        """스트리밍 시작 후 첫 조각까지 받아 연결/할당량 오류를 이 시점에 드러냄"""
+        logger.debug(f"Streaming {provider} LLM...")
+        stream = llm.stream(self._messages(prompt))
+        first = next(stream, None)
+        chunks = stream if first is None else itertools.chain([first], stream)
+        return self._stream_text(chunks, provider)
+
+    def _stream_text(self, chunks, provider: str):
+        """응답 조각의 텍스트를 내보내고, 조각별 토큰 사용량은 합산해 스트림이 끝나면 기록"""
+        usage = {}
+        try:
+            for chunk in chunks:
+                for key, value in self._usage_counts(getattr(chunk, 'usage_metadata', None)).items():
+                    usage[key] = usage.get(key, 0) + value
+                yield self._chunk_text(chunk)
+        finally:
+            self._record_usage(provider, usage)
+
+    @staticmethod
+    def _usage_counts(usage_metadata) -> dict:
+        """LangChain usage_metadata -> 입력/캐시 입력/출력 토큰 수"""
+        if not usage_metadata:
+            return {}
+        details = usage_metadata.get('input_token_details') or {}
+        return {
+            'input_tokens': usage_metadata.get('input_tokens') or 0,
+            'cached_input_tokens': details.get('cache_read') or 0,
+            'output_tokens': usage_metadata.get('output_tokens') or 0,
+        }
+
+    def usage_summary(self) -> dict:
+        """누적 토큰 사용량 (캐시 적중률 포함)"""
+        with self._usage_lock:
+            usage = dict(self.usage)
+        usage['cache_hit_rate'] = (
+            round(usage['cached_input_tokens'] / usage['input_tokens'], 3) if usage['input_tokens'] else 0.0
+        )
+        return usage
+
+    def _record_usage(self, provider: str, counts: dict):
+        """호출 1회의 토큰 사용량 기록 (프롬프트 캐시 적중 토큰 포함)"""
+        if not counts:
+            return
+        with self._usage_lock:
+            self.usage['calls'] += 1
+            for key, value in counts.items():
+                self.usage[key] += value
+        logger.info(
+            f"LLM usage ({provider}): input={counts['input_tokens']} "
+            f"(cached={counts['cached_input_tokens']}), output={counts['output_tokens']}"
+        )
+
+    @staticmethod
+    def _chunk_text(chunk) -> str:
+        """응답 조각의 텍스트 (프로바이더에 따라 content가 문자열 또는 파트 목록)"""
+        content = chunk.content
+        if isinstance(content, str):
+            return content
+        return ''.join(
+            part if isinstance(part, str) else part.get('text', '')
+            for part in content
+        )
+
+    @staticmethod
+    def _messages(prompt: str) -> list:
+        return [
+            ("system", SYSTEM_PROMPT),
+            ("human", prompt)
+        ]
 
     def _parse_response(self, response: str) -> dict:
         """단일 분류 응답 파싱"""
@@ -223,32 +509,34 @@ class LLMClient:
             'reason': 'AI 응답 파싱 실패'
         }
 
-    def _parse_batch_response(self, response: str, mails_data: list) -> list:
-        """배치 분류 응답 파싱"""
-        try:
-            json_match = re.search(r'\[[\s\S]*\]', response)
-            if json_match:
-                data = json.loads(json_match.group())
-                results = []
-                for item in data:
-                    results.append({
-                        'mail_id': item.get('mail_id'),
-                        'folder_path': item.get('folder_path', '미분류'),
-                        'is_new_folder': item.get('is_new_folder', False),
-                        'confidence': float(item.get('confidence', 0.5)),
-                        'reason': item.get('reason', '')
-                    })
-                return results
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.warning(f"Failed to parse batch response: {e}")
+    @staticmethod
+    def _validate_batch_item(item: dict, expected: set):
+        """
+        배치 응답 항목 검증
 
-        return [
-            {
-                'mail_id': mail['id'],
-                'folder_path': '미분류',
-                'is_new_folder': False,
-                'confidence': 0.0,
-                'reason': 'AI 응답 파싱 실패'
-            }
-            for mail in mails_data
-        ]
+        요청한 mail_id이고 폴더 경로/확신도가 올바른 항목만 통과시키며,
+        통과한 mail_id는 expected에서 제거합니다 (중복 응답 방지).
+
+        Returns:
+            dict: 정리된 분류 결과 (잘못된 항목은 None)
+        """
+        try:
+            mail_id = int(item.get('mail_id'))
+            confidence = float(item.get('confidence', 0.5))
+        except (TypeError, ValueError):
+            return None
+
+        folder_path = item.get('folder_path')
+        if mail_id not in expected or not isinstance(folder_path, str) or not folder_path.strip():
+            return None
+        if not 0.0 <= confidence <= 1.0:
+            return None
+
+        expected.discard(mail_id)
+        return {
+            'mail_id': mail_id,
+            'folder_path': folder_path.strip(),
+            'is_new_folder': bool(item.get('is_new_folder', False)),
+            'confidence': confidence,
+            'reason': str(item.get('reason') or '')
+        }
@@ -0,0 +1,115 @@
+"""
+프로세스 공용 LLM 모델 레지스트리
+"""
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMModelRegistry:
+    """
+    LangChain 채팅 모델 보관소 (Gemini 우선, OpenAI GPT 폴백)
+
+    모델 객체는 내부에 HTTP 연결 풀(keep-alive)을 가지고 있어, 프로세스에서 한 번만 만들고
+    모든 분류 작업이 같은 객체를 공유합니다. LangChain 모델 호출은 스레드 안전합니다.
+    """
+
+    PRIMARY_MODEL = "gemini-2.5-flash"
+    FALLBACK_MODEL = "gpt-5-nano"
+
+    def __init__(self, google_api_key: str, openai_api_key: str, max_output_tokens: int):
+        self.primary_llm = None
+        self.fallback_llm = None
+        self.primary_provider = None
+        self.fallback_provider = None
+        self._structured_llms = {}  # (provider, method) -> with_structured_output 래핑 모델
+        self._lock = threading.Lock()
+
+        # Gemini 우선 초기화
+        if google_api_key:
+            try:
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                self.primary_llm = ChatGoogleGenerativeAI(
+                    model=self.PRIMARY_MODEL,
+                    google_api_key=google_api_key,
+                    temperature=0.1,
+                    max_tokens=max_output_tokens,
+                )
+                self.primary_provider = self.PRIMARY_MODEL
+                logger.info("Primary LLM: Google Gemini (LangChain)")
+            except Exception as e:
+                logger.warning(f"Failed to initialize Gemini: {e}")
+
+        # OpenAI를 폴백으로 초기화
+        if openai_api_key:
+            try:
+                from langchain_openai import ChatOpenAI
+                self.fallback_llm = ChatOpenAI(
+                    model=self.FALLBACK_MODEL,
+                    api_key=openai_api_key,
+                    temperature=0.1,
+                    max_tokens=max_output_tokens,
+                    stream_usage=True,
+                )
+                self.fallback_provider = self.FALLBACK_MODEL
+                logger.info("Fallback LLM: OpenAI GPT (LangChain)")
+            except Exception as e:
+                logger.warning(f"Failed to initialize OpenAI: {e}")
+
+        # Primary가 없으면 fallback을 primary로 승격
+        if self.primary_llm is None and self.fallback_llm is not None:
+            self.primary_llm = self.fallback_llm
+            self.primary_provider = self.fallback_provider
+            self.fallback_llm = None
+            self.fallback_provider = None
+            logger.info(f"Promoted {self.primary_provider} to primary (no Gemini available)")
+
+    def structured(self, provider: str, llm, schema: dict, method: str = None):
+        """
+        구조화 출력 래핑 모델 (프로바이더/방식별로 한 번만 생성)
+
+        Args:
+            provider: 프로바이더(모델) 이름
+            llm: 원본 채팅 모델
+            schema: JSON schema
+            method: with_structured_output 방식 (없으면 LangChain 기본값)
+        """
+        key = (provider, method, schema.get('title'))
+        structured_llm = self._structured_llms.get(key)
+        if structured_llm is None:
+            with self._lock:
+                structured_llm = self._structured_llms.get(key)
+                if structured_llm is None:
+                    kwargs = {'method': method} if method else {}
+                    structured_llm = llm.with_structured_output(schema, include_raw=True, **kwargs)
+                    self._structured_llms[key] = structured_llm
+        return structured_llm
+
+
+_registry = None
+_registry_key = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry(max_output_tokens: int) -> LLMModelRegistry:
+    """
+    프로세스 공용 모델 레지스트리 (처음 사용할 때 생성, API 키 설정이 바뀌면 다시 생성)
+
+    Args:
+        max_output_tokens: 응답 최대 토큰
+    """
+    global _registry, _registry_key
+    key = (
+        getattr(settings, 'GOOGLE_API_KEY', None),
+        getattr(settings, 'OPENAI_API_KEY', None),
+        max_output_tokens,
+    )
+    if _registry is None or _registry_key != key:
+        with _registry_lock:
+            if _registry is None or _registry_key != key:
+                _registry = LLMModelRegistry(key[0], key[1], max_output_tokens)
+                _registry_key = key
+    return _registry
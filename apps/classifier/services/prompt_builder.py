@@ -0,0 +1,66 @@
+"""
+배치 분류 프롬프트 생성
+"""
+from ..prompts import BATCH_CLASSIFICATION_EMAILS, BATCH_CLASSIFICATION_PREFIX
+
+
+class BatchPromptBuilder:
+    """
+    배치 분류 프롬프트 생성
+
+    폴더 트리와 응답 형식으로 이루어진 앞부분은 같은 폴더 구성이면 항상 같은 문자열이 되도록
+    정렬해서 한 번만 만들고, 호출마다 바뀌는 이메일 목록은 맨 뒤에 붙입니다.
+    시스템 프롬프트 + 앞부분이 호출 간에 그대로 유지되므로 프로바이더의 프롬프트 캐시가 적용됩니다.
+    """
+
+    INDENT = '  '
+
+    def __init__(self, existing_folders: list, snippet_max_chars: int = 200):
+        """
+        Args:
+            existing_folders: 기존 폴더 목록 (path 포함)
+            snippet_max_chars: 이메일 내용 미리보기 최대 길이
+        """
+        self.snippet_max_chars = snippet_max_chars
+        self.prefix = BATCH_CLASSIFICATION_PREFIX.format(folders=self.format_folder_tree(existing_folders))
+
+    @classmethod
+    def format_folder_tree(cls, folders: list) -> str:
+        """
+        폴더 목록을 들여쓰기 트리로 표현 (전체 경로 대신 마지막 이름만 반복)
+
+        예: 업무, 업무/프로젝트A, 업무/프로젝트B ->
+            업무
+              프로젝트A
+              프로젝트B
+        """
+        if not folders:
+            return "(폴더 없음 - 새 폴더를 제안해주세요)"
+
+        paths = sorted({tuple(folder['path'].split('/')) for folder in folders if folder.get('path')})
+        lines = []
+        previous = ()
+        for segments in paths:
+            # 직전 경로와 겹치는 상위 폴더는 생략하고, 달라지는 단계부터 출력
+            common = 0
+            while common < min(len(previous), len(segments)) and previous[common] == segments[common]:
+                common += 1
+            for depth in range(common, len(segments)):
+                lines.append(f"{cls.INDENT * depth}{segments[depth]}")
+            previous = segments
+        return "\n".join(lines)
+
+    def format_emails(self, mails: list) -> str:
+        """이메일 목록 포맷팅"""
+        result = []
+        for mail in mails:
+            result.append(f"""### 이메일 #{mail['id']}
+- 제목: {mail.get('subject', '(제목 없음)')}
+- 발신자: {mail.get('sender', '(알 수 없음)')}
+- 내용: {mail.get('snippet', '')[:self.snippet_max_chars]}
+""")
+        return "\n".join(result)
+
+    def build(self, mails: list) -> str:
+        """고정 앞부분 + 이메일 목록"""
+        return self.prefix + BATCH_CLASSIFICATION_EMAILS.format(emails=self.format_emails(mails))
@@ -0,0 +1,199 @@
+"""
+발신자/도메인 규칙 기반 분류 서비스
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import SenderRule
+
+logger = logging.getLogger(__name__)
+
+
+class SenderRuleService:
+    """
+    발신자/도메인 규칙 학습 및 적용
+
+    같은 발신자(또는 도메인)의 메일이 꾸준히 같은 폴더로 분류되면 규칙으로 기록하고,
+    신뢰도가 충분한 규칙은 LLM을 거치지 않고 바로 폴더를 지정합니다.
+    """
+
+    MIN_SUPPORT = 3  # 규칙 적용에 필요한 최소 학습 횟수
+    MIN_CONFIDENCE = 0.9  # 규칙 적용에 필요한 최소 신뢰도
+    LEARN_MIN_CONFIDENCE = 0.7  # 학습에 사용할 LLM 분류 결과의 최소 confidence
+    MANUAL_WEIGHT = 3  # 사용자가 직접 이동한 결과의 가중치
+    RULE_TTL = timedelta(days=90)  # 이 기간 동안 적용/학습되지 않은 규칙은 삭제
+    MAX_RULES_PER_USER = 2000  # 사용자당 최대 규칙 수 (초과 시 오래된 규칙부터 삭제)
+
+    # 여러 사람이 함께 쓰는 메일 서비스 도메인은 도메인 규칙을 만들지 않음
+    SHARED_DOMAINS = {
+        'gmail.com', 'googlemail.com', 'naver.com', 'daum.net', 'hanmail.net', 'kakao.com',
+        'nate.com', 'outlook.com', 'hotmail.com', 'live.com', 'yahoo.com', 'icloud.com', 'me.com',
+    }
+
+    def __init__(self, user):
+        self.user = user
+
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        return (email or '').strip().lower()
+
+    @classmethod
+    def _domain_of(cls, email: str) -> str:
+        email = cls._normalize_email(email)
+        if '@' not in email:
+            return ''
+        domain = email.rsplit('@', 1)[1]
+        return '' if domain in cls.SHARED_DOMAINS else domain
+
+    def _keys_for(self, email: str) -> list:
+        """메일 주소에 해당하는 규칙 키 목록 [(kind, key), ...] (발신자 규칙 우선)"""
+        keys = []
+        email = self._normalize_email(email)
+        if email:
+            keys.append(('sender', email))
+        domain = self._domain_of(email)
+        if domain:
+            keys.append(('domain', domain))
+        return keys
+
+    def _load_rules(self, emails) -> dict:
+        """메일 주소 목록에 해당하는 규칙 조회 (쿼리 1회) -> {(kind, key): SenderRule}"""
+        senders = set()
+        domains = set()
+        for email in emails:
+            for kind, key in self._keys_for(email):
+                (senders if kind == 'sender' else domains).add(key)
+        if not senders and not domains:
+            return {}
+
+        rules = SenderRule.objects.filter(user=self.user).filter(
+            Q(kind='sender', key__in=senders) | Q(kind='domain', key__in=domains)
+        ).select_related('folder')
+        return {(rule.kind, rule.key): rule for rule in rules}
+
+    def match(self, mails: list) -> dict:
+        """
+        신뢰도 높은 규칙으로 폴더 결정
+
+        Args:
+            mails: Mail 목록
+
+        Returns:
+            dict: {mail_id: SenderRule} (규칙이 없거나 신뢰도가 낮은 메일은 제외)
+        """
+        rules = self._load_rules(mail.sender_email for mail in mails)
+        if not rules:
+            return {}
+
+        matched = {}
+        for mail in mails:
+            for rule_key in self._keys_for(mail.sender_email):
+                rule = rules.get(rule_key)
+                if rule and rule.support >= self.MIN_SUPPORT and rule.confidence >= self.MIN_CONFIDENCE:
+                    matched[mail.id] = rule
+                    break
+
+        # 적용 횟수/최근 사용 시각 갱신 (같은 증가량끼리 묶어 UPDATE)
+        uses = defaultdict(int)
+        for rule in matched.values():
+            uses[rule.id] += 1
+        by_count = defaultdict(list)
+        for rule_id, count in uses.items():
+            by_count[count].append(rule_id)
+        now = timezone.now()
+        for count, rule_ids in by_count.items():
+            SenderRule.objects.filter(id__in=rule_ids).update(hits=F('hits') + count, last_used_at=now)
+
+        return matched
+
+    def learn(self, observations: list, manual: bool = False):
+        """
+        분류/이동 결과로 규칙 학습
+
+        Args:
+            observations: [(sender_email, folder_id), ...] (folder_id가 None인 항목은 무시)
+            manual: 사용자가 직접 이동한 결과 여부 (가중치를 높이고, 발신자 규칙은 즉시 교체)
+        """
+        weight = self.MANUAL_WEIGHT if manual else 1
+
+        # 키별로 폴더 관측 횟수 집계
+        votes = defaultdict(lambda: defaultdict(int))
+        for email, folder_id in observations:
+            if folder_id is None:
+                continue
+            for rule_key in self._keys_for(email):
+                votes[rule_key][folder_id] += weight
+        if not votes:
+            return
+
+        rules = self._load_rules(email for email, _ in observations)
+        now = timezone.now()
+        to_create = []
+        to_update = []
+
+        for rule_key, folder_votes in votes.items():
+            rule = rules.get(rule_key)
+            if rule is None:
+                # 가장 많이 관측된 폴더로 새 규칙 생성
+                folder_id, count = max(folder_votes.items(), key=lambda item: item[1])
+                others = sum(folder_votes.values()) - count
+                to_create.append(SenderRule(
+                    user=self.user,
+                    kind=rule_key[0],
+                    key=rule_key[1],
+                    folder_id=folder_id,
+                    support=count,
+                    misses=others,
+                    last_used_at=now,
+                ))
+                continue
+
+            for folder_id, count in folder_votes.items():
+                if folder_id == rule.folder_id:
+                    rule.support += count
+                elif (manual and rule.kind == 'sender') or rule.misses + count > rule.support:
+                    # 사용자가 직접 옮긴 발신자이거나 다른 폴더가 다수가 되면 규칙 교체
+                    rule.folder_id = folder_id
+                    rule.support = count
+                    rule.misses = 0
+                    rule.hits = 0
+                else:
+                    rule.misses += count
+            rule.last_used_at = now
+            rule.updated_at = now
+            to_update.append(rule)
+
+        if to_create:
+            SenderRule.objects.bulk_create(to_create, ignore_conflicts=True)
+        if to_update:
+            SenderRule.objects.bulk_update(
+                to_update, ['folder', 'support', 'misses', 'hits', 'last_used_at', 'updated_at']
+            )
+
+    def evict(self) -> int:
+        """
+        오래되었거나 신뢰도가 떨어진 규칙 정리
+
+        Returns:
+            int: 삭제된 규칙 수
+        """
+        rules = SenderRule.objects.filter(user=self.user)
+        deleted, _ = rules.filter(
+            Q(last_used_at__lt=timezone.now() - self.RULE_TTL) |
+            Q(misses__gt=F('support'))
+        ).delete()
+
+        # 상한 초과분은 가장 오래 사용되지 않은 규칙부터 삭제
+        overflow_ids = list(
+            rules.order_by('-last_used_at').values_list('id', flat=True)[self.MAX_RULES_PER_USER:]
+        )
+        if overflow_ids:
+            deleted += SenderRule.objects.filter(id__in=overflow_ids).delete()[0]
+
+        if deleted:
+            logger.info(f"Evicted {deleted} sender rules for user {self.user.id}")
+        return deleted
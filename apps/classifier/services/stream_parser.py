@@ -0,0 +1,93 @@
+"""
+스트리밍 LLM 응답용 증분 JSON 배열 파서
+"""
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JSONArrayStreamParser:
+    """
+    응답 조각을 받을 때마다 JSON 배열에서 완성된 객체만 꺼내는 파서
+
+    배열 앞의 설명 문장이나 코드 블록 표시는 건너뛰고, 객체 하나가 닫히는 즉시 반환합니다.
+    잘못된 항목은 해당 항목만 버리므로, 응답이 중간에 잘려도 이미 완성된 항목은 유지됩니다.
+    """
+
+    def __init__(self):
+        self.errors = 0  # 파싱에 실패해 버린 항목 수
+        self._started = False  # 배열 시작('[') 여부
+        self._finished = False  # 배열 종료(']') 여부
+        self._depth = 0  # 현재 객체 안의 괄호 깊이 (0이면 객체 밖)
+        self._in_string = False
+        self._escape = False
+        self._buffer = []
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, text: str) -> list:
+        """
+        응답 조각 추가
+
+        Args:
+            text: 새로 받은 응답 텍스트
+
+        Returns:
+            list: 이번 조각으로 완성된 객체 목록
+        """
+        items = []
+        for ch in text:
+            if self._finished:
+                break
+
+            if not self._started:
+                if ch == '[':
+                    self._started = True
+                continue
+
+            if self._depth == 0:
+                if ch == '{':
+                    self._depth = 1
+                    self._buffer = [ch]
+                elif ch == ']':
+                    self._finished = True
+                elif not (ch.isspace() or ch == ','):
+                    # '[참고]' 같은 본문 괄호였으면 다음 '['부터 다시 찾음
+                    self._started = False
+                continue
+
+            self._buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    item = self._decode(''.join(self._buffer))
+                    if item is not None:
+                        items.append(item)
+                    self._buffer = []
+        return items
+
+    def _decode(self, source: str):
+        try:
+            item = json.loads(source)
+        except json.JSONDecodeError as e:
+            self.errors += 1
+            logger.warning(f"Skipping malformed item in LLM response: {e}")
+            return None
+        if not isinstance(item, dict):
+            self.errors += 1
+            return None
+        return item
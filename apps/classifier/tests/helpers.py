@@ -0,0 +1,107 @@
+import json
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.classifier.services import ClassificationState, ClassifierService, get_classification_cache
+from apps.jobs.services import MemoryStateStore
+from apps.mails.models import Mail
+
+
+class FakeChunk:
+    usage_metadata = None
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeChatModel:
+    """
+    호출마다 미리 정한 응답을 순서대로 돌려주는 가짜 LLM
+
+    스트리밍 응답은 텍스트 조각 목록이고, 조각 대신 예외를 넣으면 그 지점에서 스트림이 끊깁니다.
+    """
+
+    def __init__(self, responses: list):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        return self.responses.pop(0)
+
+    def stream(self, messages):
+        for piece in self._next():
+            if isinstance(piece, Exception):
+                raise piece
+            yield FakeChunk(piece)
+
+    def invoke(self, messages):
+        return {'parsed': self._next(), 'raw': None, 'parsing_error': None}
+
+
+def fake_registry(model: FakeChatModel):
+    """LLM 레지스트리 대역 (구조화 출력도 같은 가짜 모델로 응답)"""
+    return SimpleNamespace(
+        primary_llm=model,
+        fallback_llm=None,
+        primary_provider='fake',
+        fallback_provider=None,
+        structured=lambda provider, llm, schema, method: llm,
+    )
+
+
+def result_item(mail, folder_path: str, confidence: float = 0.9) -> dict:
+    return {
+        'mail_id': mail.id,
+        'folder_path': folder_path,
+        'is_new_folder': True,
+        'confidence': confidence,
+        'reason': 'test',
+    }
+
+
+def stream_pieces(items: list) -> list:
+    """분류 결과 목록을 JSON 배열 스트림 조각으로"""
+    return ['[' + ', '.join(json.dumps(item, ensure_ascii=False) for item in items) + ']']
+
+
+class ClassifierTestMixin:
+    """분류 서비스 테스트 공통 준비 (작업 상태는 프로세스 메모리 저장소 사용)"""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('apps.jobs.services.state_store._store', MemoryStateStore())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_classification_cache().clear()
+        self.addCleanup(get_classification_cache().clear)
+
+        self.user = get_user_model().objects.create_user(
+            username='classifier', email='classifier@example.com', password='unused',
+        )
+
+    def make_mail(self, subject: str, **fields) -> Mail:
+        defaults = {
+            'gmail_id': uuid.uuid4().hex,
+            'thread_id': uuid.uuid4().hex,
+            'subject': subject,
+            'sender': f'{subject} <{subject.lower().replace(" ", ".")}@example.com>',
+            'sender_email': f'{subject.lower().replace(" ", ".")}@example.com',
+            'received_at': timezone.now(),
+        }
+        return Mail.objects.create(user=self.user, **{**defaults, **fields})
+
+    def run_classification(self, mails: list, model: FakeChatModel, structured: bool = False) -> ClassificationState:
+        """가짜 LLM으로 분류 작업을 동기 실행"""
+        with mock.patch('apps.classifier.services.llm_client.get_llm_registry', return_value=fake_registry(model)):
+            service = ClassifierService(self.user)
+        service.llm_client.structured_output = structured
+
+        state = ClassificationState.create(self.user.id)
+        state.start(len(mails))
+        service._process_classification(mails, state)
+        return ClassificationState.get(state.classification_id)
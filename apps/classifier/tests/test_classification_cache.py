@@ -0,0 +1,44 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.classifier.services import ClassificationCache, LLMClient
+
+from .helpers import ClassifierTestMixin, FakeChatModel, fake_registry, stream_pieces
+
+
+class ClassificationCacheTests(ClassifierTestMixin, TestCase):
+    def mail_data(self, mail_id: int) -> dict:
+        return {
+            'id': mail_id,
+            'subject': 'Your receipt #1234',
+            'sender': 'Shop <shop@example.com>',
+            'sender_email': 'shop@example.com',
+            'snippet': '',
+        }
+
+    def classify(self, model: FakeChatModel, mail_id: int, user_id: int) -> list:
+        with mock.patch('apps.classifier.services.llm_client.get_llm_registry', return_value=fake_registry(model)):
+            client = LLMClient()
+        return client.classify_mails_batch([self.mail_data(mail_id)], [], user_id)
+
+    def test_fingerprint_differs_per_user(self):
+        version = ClassificationCache.folder_set_version([])
+        self.assertNotEqual(
+            ClassificationCache.fingerprint(1, self.mail_data(1), version),
+            ClassificationCache.fingerprint(2, self.mail_data(1), version),
+        )
+
+    def test_cached_result_is_not_served_to_another_user(self):
+        first = {'mail_id': 1, 'folder_path': '쇼핑/영수증', 'is_new_folder': True, 'confidence': 0.95, 'reason': ''}
+        second = {**first, 'mail_id': 2, 'folder_path': '지출'}
+        model = FakeChatModel([stream_pieces([first]), stream_pieces([second])])
+
+        self.assertEqual(self.classify(model, 1, user_id=1)[0]['folder_path'], '쇼핑/영수증')
+        # 같은 사용자의 같은 템플릿 메일은 캐시 적중
+        self.assertEqual(self.classify(model, 3, user_id=1)[0]['folder_path'], '쇼핑/영수증')
+        self.assertEqual(model.calls, 1)
+
+        # 다른 사용자는 캐시를 쓰지 않고 LLM을 호출
+        self.assertEqual(self.classify(model, 2, user_id=2)[0]['folder_path'], '지출')
+        self.assertEqual(model.calls, 2)
@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.db.models import Count, Q
+from django.test import TestCase
+
+from apps.classifier.services import ClassifierService, LLMClient
+from apps.folders.models import Folder
+from apps.mails.models import Mail
+
+from .helpers import ClassifierTestMixin, FakeChatModel, result_item, stream_pieces
+
+
+class ApplyClassificationsTests(ClassifierTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # 폴더 중심 벡터 분류가 끼어들지 않도록 LLM 결과만 사용
+        patcher = mock.patch.object(ClassifierService, '_predict_by_centroid', return_value={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_counts_match(self):
+        own = {
+            row['folder_id']: (row['mails'], row['unread'])
+            for row in Mail.objects.filter(user=self.user, is_deleted=False, folder__isnull=False)
+            .values('folder_id')
+            .annotate(mails=Count('id'), unread=Count('id', filter=Q(is_read=False)))
+        }
+        folders = list(Folder.objects.filter(user=self.user))
+        for folder in folders:
+            subtree = [f.id for f in folders if f.path == folder.path or f.path.startswith(f'{folder.path}/')]
+            expected = (
+                *own.get(folder.id, (0, 0)),
+                sum(own.get(folder_id, (0, 0))[0] for folder_id in subtree),
+                sum(own.get(folder_id, (0, 0))[1] for folder_id in subtree),
+            )
+            actual = (folder.mail_count, folder.unread_count, folder.total_mail_count, folder.total_unread_count)
+            self.assertEqual(actual, expected, folder.path)
+
+    def test_folder_counts_match_recount_after_classification(self):
+        work = Folder.objects.create(user=self.user, name='업무')
+        archive = Folder.objects.create(user=self.user, name='보관')
+        self.make_mail('Old 1', folder=work)
+        self.make_mail('Old 2', folder=work, is_read=True)
+
+        new_unread = self.make_mail('New 1')
+        new_read = self.make_mail('New 2', is_read=True)
+        moved = self.make_mail('Moved', folder=archive)
+        unfiled = self.make_mail('Unfiled', folder=work)
+        deleted = self.make_mail('Deleted', folder=archive)
+        # 작업 시작 후 다른 요청으로 삭제된 메일 (작업이 들고 있는 객체는 삭제 전 상태)
+        stale = Mail.objects.get(id=deleted.id)
+        stale.is_deleted = True
+        stale.save()
+
+        mails = [new_unread, new_read, moved, unfiled, deleted]
+        model = FakeChatModel([stream_pieces([
+            result_item(new_unread, '업무'),
+            result_item(new_read, '업무/새 프로젝트'),
+            result_item(moved, '업무'),
+            result_item(unfiled, '미분류'),
+            result_item(deleted, '업무'),
+        ])])
+
+        state = self.run_classification(mails, model)
+
+        self.assertEqual(state.success, len(mails))
+        self.assert_counts_match()
+        moved.refresh_from_db()
+        unfiled.refresh_from_db()
+        self.assertEqual(moved.folder_id, work.id)
+        self.assertIsNone(unfiled.folder_id)
+        self.assertTrue(unfiled.is_classified)
+        self.assertEqual(Folder.objects.get(id=work.id).mail_count, 4)
+
+    def test_folder_counts_match_recount_after_reclassifying_many_mails(self):
+        folders = [Folder.objects.create(user=self.user, name=name) for name in ('가', '나')]
+        mails = [
+            self.make_mail(f'Mail {n}', folder=folders[n % 2], is_read=n % 3 == 0)
+            for n in range(45)
+        ]
+        # 결과 반영 배치(APPLY_BATCH_SIZE)를 여러 번 거치도록 폴더를 서로 바꾸거나 새 하위 폴더로 이동
+        targets = ['나', '가', '가/하위']
+        one_batch = mock.patch.object(LLMClient, 'pack_batches', side_effect=lambda mails_data, *args: [mails_data])
+        model = FakeChatModel([stream_pieces([
+            result_item(mail, targets[n % 3]) for n, mail in enumerate(mails)
+        ])])
+
+        with one_batch:
+            state = self.run_classification(mails, model)
+
+        self.assertEqual(state.success, len(mails))
+        self.assert_counts_match()
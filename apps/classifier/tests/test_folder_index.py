@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.classifier.services import FolderPathIndex
+from apps.folders.models import Folder
+
+
+class FolderPathIndexTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='index', email='index@example.com', password='unused',
+        )
+        self.work = Folder.objects.create(user=self.user, name='업무')
+        self.project = Folder.objects.create(user=self.user, name='프로젝트', parent=self.work)
+
+    def build_index(self, folders=None):
+        if folders is None:
+            folders = list(Folder.objects.filter(user=self.user).values(*FolderPathIndex.FIELDS))
+        return FolderPathIndex(self.user, folders)
+
+    def test_existing_paths_are_resolved_without_queries(self):
+        index = self.build_index()
+
+        with self.assertNumQueries(0):
+            resolved, created = index.resolve(['업무', ' 업무 / 프로젝트 /'])
+
+        self.assertEqual(created, set())
+        self.assertEqual(resolved['업무']['id'], self.work.id)
+        self.assertEqual(resolved[' 업무 / 프로젝트 /']['id'], self.project.id)
+
+    def test_missing_paths_are_created_once_under_existing_parents(self):
+        index = self.build_index()
+
+        resolved, created = index.resolve(['업무/프로젝트/회의록', '업무/프로젝트/회의록', '업무/출장', '개인/가족'])
+
+        self.assertEqual(created, {'업무/프로젝트/회의록', '업무/출장', '개인', '개인/가족'})
+        self.assertEqual(Folder.objects.filter(user=self.user).count(), 6)
+        minutes = Folder.objects.get(user=self.user, path='업무/프로젝트/회의록')
+        self.assertEqual(resolved['업무/프로젝트/회의록']['id'], minutes.id)
+        self.assertEqual((minutes.parent_id, minutes.depth), (self.project.id, 2))
+        self.assertEqual(Folder.objects.get(user=self.user, path='개인/가족').parent.path, '개인')
+
+        # 같은 인덱스로 다시 요청하면 새로 만들지 않음
+        with self.assertNumQueries(0):
+            _, created = index.resolve(['업무/프로젝트/회의록', '개인/가족'])
+        self.assertEqual(created, set())
+
+    def test_path_created_by_another_job_is_reused(self):
+        # 이 작업이 폴더 목록을 읽은 뒤 다른 작업이 같은 경로를 먼저 만든 상황
+        index = self.build_index()
+        other = Folder.objects.create(user=self.user, name='출장', parent=self.work)
+
+        resolved, created = index.resolve(['업무/출장', '업무/교육'])
+
+        self.assertEqual(created, {'업무/교육'})
+        self.assertEqual(resolved['업무/출장']['id'], other.id)
+        self.assertEqual(Folder.objects.filter(user=self.user, path='업무/출장').count(), 1)
+        self.assertEqual(Folder.objects.get(user=self.user, path='업무/교육').parent_id, self.work.id)
+
+    def test_nested_path_under_folder_created_by_another_job(self):
+        index = self.build_index(folders=[])
+        Folder.objects.create(user=self.user, name='개인')
+
+        resolved, created = index.resolve(['업무/프로젝트/회의록', '개인/가족'])
+
+        self.assertEqual(created, {'업무/프로젝트/회의록', '개인/가족'})
+        self.assertEqual(Folder.objects.filter(user=self.user).count(), 5)
+        self.assertEqual(resolved['업무/프로젝트/회의록']['id'], Folder.objects.get(path='업무/프로젝트/회의록').id)
+        self.assertEqual(Folder.objects.get(path='업무/프로젝트/회의록').parent_id, self.project.id)
+        self.assertEqual(Folder.objects.get(path='개인/가족').parent.path, '개인')
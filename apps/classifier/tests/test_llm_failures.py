@@ -0,0 +1,52 @@
+import json
+
+from django.test import TestCase
+
+from apps.classifier.services import LLMClient
+
+from .helpers import ClassifierTestMixin, FakeChatModel, result_item
+
+
+class TruncatedStreamTests(ClassifierTestMixin, TestCase):
+    def test_mails_missing_from_truncated_stream_stay_unclassified(self):
+        first, second, third = (self.make_mail(f'Mail {n}') for n in range(3))
+        model = FakeChatModel([
+            # 첫 항목만 완성된 뒤 연결이 끊김
+            ['[' + json.dumps(result_item(first, '업무'), ensure_ascii=False), ', {"mail_id": ',
+             ConnectionError('stream reset')],
+            # 누락된 메일 재요청도 항목 없이 끊김
+            ['[', ConnectionError('stream reset')],
+        ])
+
+        state = self.run_classification([first, second, third], model)
+
+        self.assertEqual(model.calls, 2)
+        self.assertEqual((state.success, state.failed), (1, 2))
+
+        first.refresh_from_db()
+        self.assertTrue(first.is_classified)
+        self.assertEqual(first.folder.path, '업무')
+        for mail in (second, third):
+            mail.refresh_from_db()
+            self.assertFalse(mail.is_classified)
+            self.assertIsNone(mail.folder_id)
+        failed = {entry['mail_id'] for entry in state.results if entry['status'] == 'failed'}
+        self.assertEqual(failed, {second.id, third.id})
+
+
+class StructuredOutputFailureTests(ClassifierTestMixin, TestCase):
+    def test_mails_failing_validation_in_every_attempt_stay_unclassified(self):
+        first, second = self.make_mail('Mail 0'), self.make_mail('Mail 1')
+        invalid = {'mail_id': second.id, 'folder_path': '', 'confidence': 1.5}
+        model = FakeChatModel([
+            {'classifications': [result_item(first, '업무'), invalid]},
+            {'classifications': [invalid]},
+        ])
+
+        state = self.run_classification([first, second], model, structured=True)
+
+        self.assertEqual(model.calls, LLMClient.MAX_REPAIR_ATTEMPTS + 1)
+        self.assertEqual((state.success, state.failed), (1, 1))
+        second.refresh_from_db()
+        self.assertFalse(second.is_classified)
+        self.assertIsNone(second.folder_id)
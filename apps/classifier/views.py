@@ -10,9 +10,10 @@ from rest_framework.views import APIView
 from .serializers import (
     ClassificationStartResponseSerializer,
     ClassificationStatusResponseSerializer,
+    ClassifierHealthResponseSerializer,
     ClassifyRequestSerializer,
 )
-from .services import ClassificationState, ClassifierService
+from .services import ClassificationState, ClassifierService, get_provider_health
 
 
 @extend_schema(tags=['분류'])
@@ -87,6 +88,30 @@ class ClassifyUnclassifiedView(APIView):
         }, status=status.HTTP_202_ACCEPTED)
 
 
+@extend_schema(tags=['분류'])
+class ClassifierHealthView(APIView):
+    """분류 LLM 프로바이더 상태"""
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary='LLM 프로바이더 상태 조회',
+        description='프로바이더별 서킷 브레이커 상태, 최근 실패율, 평균 지연 시간을 조회합니다 (모든 워커가 공유하는 상태).',
+        responses={
+            200: OpenApiResponse(
+                response=ClassifierHealthResponseSerializer,
+                description='프로바이더 상태'
+            ),
+        },
+    )
+    def get(self, request):
+        return Response({
+            'status': 'success',
+            'data': {
+                'providers': get_provider_health(),
+            }
+        })
+
+
 @extend_schema(tags=['분류'])
 class ClassificationStatusView(APIView):
     """분류 결과 조회"""
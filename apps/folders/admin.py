@@ -13,8 +13,8 @@ class FolderAdmin(admin.ModelAdmin):
     fieldsets = (
         (None, {'fields': ('user', 'name', 'parent')}),
         ('트리 구조', {'fields': ('path', 'depth', 'order')}),
-        ('통계', {'fields': ('mail_count', 'unread_count')}),
+        ('통계', {'fields': ('mail_count', 'unread_count', 'total_mail_count', 'total_unread_count')}),
         ('타임스탬프', {'fields': ('created_at', 'updated_at')}),
     )
 
-    readonly_fields = ['path', 'depth', 'created_at', 'updated_at']
+    readonly_fields = ['path', 'depth', 'total_mail_count', 'total_unread_count', 'created_at', 'updated_at']
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-17 07:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folders', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='folder',
+            name='folders_user_id_49a486_idx',
+        ),
+        migrations.AddIndex(
+            model_name='folder',
+            index=models.Index(fields=['user', 'path'], name='folders_user_path_prefix_idx', opclasses=['int8_ops', 'varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-17 07:10
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_total_counts(apps, schema_editor):
+    """기존 폴더의 누적 카운트 계산 (각 폴더 카운트를 자신과 모든 상위 경로에 합산)"""
+    Folder = apps.get_model('folders', 'Folder')
+
+    totals = defaultdict(lambda: [0, 0])
+    for user_id, path, mail_count, unread_count in Folder.objects.values_list(
+        'user_id', 'path', 'mail_count', 'unread_count'
+    ).iterator():
+        parts = path.split('/')
+        for i in range(1, len(parts) + 1):
+            totals[(user_id, '/'.join(parts[:i]))][0] += mail_count
+            totals[(user_id, '/'.join(parts[:i]))][1] += unread_count
+
+    folders = list(Folder.objects.only('id', 'user_id', 'path'))
+    for folder in folders:
+        folder.total_mail_count, folder.total_unread_count = totals[(folder.user_id, folder.path)]
+    Folder.objects.bulk_update(folders, ['total_mail_count', 'total_unread_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folders', '0002_folder_path_prefix_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='folder',
+            name='total_mail_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='folder',
+            name='total_unread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_total_counts, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,67 @@
+import uuid
+
 from django.conf import settings
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Greatest, Substr
+
+
+class FolderQuerySet(models.QuerySet):
+    def subtree(self, folder):
+        """폴더와 모든 하위 폴더 (user, path 접두사 인덱스로 한 번에 조회)"""
+        return self.filter(user_id=folder.user_id).filter(
+            models.Q(path=folder.path) | models.Q(path__startswith=f"{folder.path}/")
+        )
+
+    def move_subtree(self, user_id: int, old_path: str, new_path: str, depth_delta: int) -> int:
+        """
+        old_path 아래 모든 폴더의 경로 앞부분을 new_path로 바꾸고 depth 조정 (UPDATE 한 번)
+
+        Args:
+            user_id: 사용자 ID
+            old_path: 기존 상위 경로
+            new_path: 새 상위 경로 (빈 문자열이면 하위 폴더들이 루트로 올라감)
+            depth_delta: depth 변화량
+
+        Returns:
+            int: 갱신된 폴더 수
+        """
+        old_prefix = f"{old_path}/"
+        new_prefix = f"{new_path}/" if new_path else ''
+        subtree = self.filter(user_id=user_id, path__startswith=old_prefix)
+
+        # 상위 경로로 당겨질 때 같은 이름이 반복된 경로(예: a/a/x -> a/x)가 있으면 UPDATE 도중
+        # 아직 바뀌지 않은 행과 경로가 잠시 겹쳐 unique 제약에 걸리므로, 임시 경로를 거쳐 두 번에 나눠 갱신
+        if old_prefix.startswith(new_prefix) and subtree.filter(
+            path__startswith=old_prefix + old_prefix[len(new_prefix):]
+        ).exists():
+            staging_prefix = f"~{uuid.uuid4().hex}/"
+            subtree.update(path=Concat(Value(staging_prefix), Substr('path', len(old_prefix) + 1)))
+            old_prefix = staging_prefix
+            subtree = self.filter(user_id=user_id, path__startswith=old_prefix)
+
+        return subtree.update(
+            path=Concat(Value(new_prefix), Substr('path', len(old_prefix) + 1)),
+            depth=F('depth') + depth_delta,
+        )
+
+    def add_to_totals(self, user_id: int, paths, mail_delta: int, unread_delta: int) -> int:
+        """
+        지정한 경로 폴더들의 누적 카운트에 같은 변화량 반영 (UPDATE 한 번)
+
+        Args:
+            user_id: 사용자 ID
+            paths: 폴더 경로 목록
+            mail_delta: 누적 메일 수 변화량
+            unread_delta: 누적 안읽음 수 변화량
+        """
+        paths = list(paths)
+        if not paths or (mail_delta, unread_delta) == (0, 0):
+            return 0
+        return self.filter(user_id=user_id, path__in=paths).update(
+            total_mail_count=Greatest(F('total_mail_count') + mail_delta, 0),
+            total_unread_count=Greatest(F('total_unread_count') + unread_delta, 0),
+        )
 
 
 class Folder(models.Model):
@@ -26,6 +88,8 @@ class Folder(models.Model):
     # 통계 (캐시)
     mail_count = models.PositiveIntegerField(default=0)
     unread_count = models.PositiveIntegerField(default=0)
+    total_mail_count = models.PositiveIntegerField(default=0)  # 하위 폴더 포함 누적
+    total_unread_count = models.PositiveIntegerField(default=0)  # 하위 폴더 포함 누적
 
     # 정렬
     order = models.PositiveIntegerField(default=0)
@@ -34,13 +98,20 @@ class Folder(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = FolderQuerySet.as_manager()
+
     class Meta:
         db_table = 'folders'
         verbose_name = '폴더'
         verbose_name_plural = '폴더들'
         ordering = ['order', 'name']
         indexes = [
-            models.Index(fields=['user', 'path']),
+            # 하위 폴더 조회(path LIKE '상위경로/%')용 접두사 인덱스 (opclass는 PostgreSQL에서만 적용)
+            models.Index(
+                fields=['user', 'path'],
+                name='folders_user_path_prefix_idx',
+                opclasses=['int8_ops', 'varchar_pattern_ops'],
+            ),
             models.Index(fields=['user', 'parent']),
         ]
         constraints = [
@@ -53,6 +124,16 @@ class Folder(models.Model):
     def __str__(self):
         return self.path
 
+    @staticmethod
+    def path_with_ancestors(path: str) -> list:
+        """경로와 모든 상위 경로 (예: 업무/A/B -> [업무, 업무/A, 업무/A/B])"""
+        parts = path.split('/')
+        return ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
+    def is_ancestor_of(self, folder) -> bool:
+        """folder가 이 폴더의 하위 폴더인지 확인 (경로 비교, 쿼리 없음)"""
+        return folder.user_id == self.user_id and folder.path.startswith(f"{self.path}/")
+
     def save(self, *args, **kwargs):
         # 깊이 자동 계산
         if self.parent:
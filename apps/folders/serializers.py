@@ -1,5 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 
+from core.exceptions import FolderPathConflictException
+
 from .models import Folder
 
 MAX_FOLDER_DEPTH = 4  # 0~4단계 = 5단계
@@ -19,11 +22,13 @@ class FolderSerializer(serializers.ModelSerializer):
             'parent_id',
             'mail_count',
             'unread_count',
+            'total_mail_count',
+            'total_unread_count',
             'order',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'path', 'depth', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'path', 'depth', 'total_mail_count', 'total_unread_count', 'created_at', 'updated_at']
 
     def validate_parent_id(self, value):
         """부모 폴더 유효성 검사"""
@@ -53,64 +58,92 @@ class FolderSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("폴더를 자기 자신의 하위로 이동할 수 없습니다.")
 
             # 자신의 하위 폴더로 이동 불가
-            if self._is_descendant(current_folder, parent):
+            if current_folder.is_ancestor_of(parent):
                 raise serializers.ValidationError("폴더를 자신의 하위 폴더로 이동할 수 없습니다.")
 
         return value
 
-    def _is_descendant(self, ancestor, folder):
-        """folder가 ancestor의 하위 폴더인지 확인"""
-        current = folder
-        while current.parent_id:
-            if current.parent_id == ancestor.id:
-                return True
-            try:
-                current = Folder.objects.get(id=current.parent_id)
-            except Folder.DoesNotExist:
-                break
-        return False
+    @staticmethod
+    def _check_path_available(user_id: int, name: str, parent, exclude_id: int = None):
+        """같은 위치에 같은 이름의 폴더가 있으면 409 (unique 제약 위반으로 500이 되지 않도록 미리 확인)"""
+        path = f"{parent.path}/{name}" if parent else name
+        conflict = Folder.objects.filter(user_id=user_id, path=path)
+        if exclude_id is not None:
+            conflict = conflict.exclude(id=exclude_id)
+        if conflict.exists():
+            raise FolderPathConflictException(f"같은 경로의 폴더가 이미 있습니다: {path}")
 
     def create(self, validated_data):
         parent_id = validated_data.pop('parent_id', None)
         if parent_id:
             validated_data['parent'] = Folder.objects.get(id=parent_id)
+        self._check_path_available(validated_data['user'].id, validated_data['name'], validated_data.get('parent'))
         return super().create(validated_data)
 
+    @transaction.atomic
     def update(self, instance, validated_data):
+        old_path, old_depth = instance.path, instance.depth
         parent_id = validated_data.pop('parent_id', None)
         if 'parent_id' in self.initial_data:
             if parent_id:
                 validated_data['parent'] = Folder.objects.get(id=parent_id)
             else:
                 validated_data['parent'] = None
-        return super().update(instance, validated_data)
-
-
-class FolderTreeSerializer(serializers.ModelSerializer):
-    """폴더 트리 Serializer (재귀)"""
-    children = serializers.SerializerMethodField()
-    unread_count = serializers.SerializerMethodField()
-
-    class Meta:
-        model = Folder
-        fields = [
-            'id',
-            'name',
-            'path',
-            'depth',
-            'mail_count',
-            'unread_count',
-            'order',
-            'children',
-        ]
-
-    def get_children(self, obj):
-        if hasattr(obj, 'children_list'):
-            return FolderTreeSerializer(obj.children_list, many=True).data
-        return []
-
-    def get_unread_count(self, obj):
-        """자손 폴더 포함 누적 안읽음 개수 반환"""
-        if hasattr(obj, 'total_unread_count'):
-            return obj.total_unread_count
-        return obj.unread_count
+        self._check_path_available(
+            instance.user_id,
+            validated_data.get('name', instance.name),
+            validated_data.get('parent', instance.parent),
+            exclude_id=instance.id,
+        )
+        folder = super().update(instance, validated_data)
+
+        # 이름이나 상위 폴더가 바뀌면 하위 폴더들의 path/depth도 UPDATE 한 번으로 갱신
+        if folder.path != old_path:
+            Folder.objects.move_subtree(folder.user_id, old_path, folder.path, folder.depth - old_depth)
+
+            # 옮겨진 폴더의 누적 카운트를 이전 상위 폴더들에서 빼고 새 상위 폴더들에 더함
+            old_ancestors = set(Folder.path_with_ancestors(old_path)[:-1])
+            new_ancestors = set(Folder.path_with_ancestors(folder.path)[:-1])
+            Folder.objects.add_to_totals(
+                folder.user_id, old_ancestors - new_ancestors, -folder.total_mail_count, -folder.total_unread_count
+            )
+            Folder.objects.add_to_totals(
+                folder.user_id, new_ancestors - old_ancestors, folder.total_mail_count, folder.total_unread_count
+            )
+        return folder
+
+
+TREE_FIELDS = ('id', 'name', 'path', 'depth', 'parent_id', 'mail_count', 'total_unread_count', 'order')
+
+
+def build_folder_tree(folders) -> list:
+    """
+    폴더 트리 JSON 생성 (한 번 순회, 노드마다 Serializer를 만들지 않음)
+
+    unread_count는 하위 폴더를 포함한 누적 안읽음 개수입니다.
+
+    Args:
+        folders: 상위 폴더가 하위 폴더보다 먼저 오도록 정렬된 폴더 목록 (TREE_FIELDS 값)
+
+    Returns:
+        list: 최상위 폴더 목록 (각 폴더의 children에 하위 폴더)
+    """
+    nodes = {}
+    roots = []
+    for folder in folders:
+        node = nodes[folder['id']] = {
+            'id': folder['id'],
+            'name': folder['name'],
+            'path': folder['path'],
+            'depth': folder['depth'],
+            'mail_count': folder['mail_count'],
+            'unread_count': folder['total_unread_count'],
+            'order': folder['order'],
+            'children': [],
+        }
+        parent = nodes.get(folder['parent_id'])
+        if parent is not None:
+            parent['children'].append(node)
+        else:
+            roots.append(node)
+    return roots
@@ -0,0 +1,154 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.folders.models import Folder
+from apps.mails.models import Mail
+
+
+class FolderApiTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='folders', email='folders@example.com', password='unused',
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.user)
+
+    def folder(self, name: str, parent: Folder = None) -> Folder:
+        return Folder.objects.create(user=self.user, name=name, parent=parent)
+
+    def mail(self, folder: Folder, is_read: bool = False) -> Mail:
+        return Mail.objects.create(
+            user=self.user,
+            folder=folder,
+            gmail_id=uuid.uuid4().hex,
+            thread_id=uuid.uuid4().hex,
+            sender='sender@example.com',
+            sender_email='sender@example.com',
+            received_at=timezone.now(),
+            is_classified=folder is not None,
+            is_read=is_read,
+        )
+
+    def tree(self) -> dict:
+        """{경로: (depth, 상위 폴더 경로)}"""
+        return {
+            folder.path: (folder.depth, folder.parent.path if folder.parent else None)
+            for folder in Folder.objects.filter(user=self.user).select_related('parent')
+        }
+
+    def move(self, folder: Folder, parent: Folder = None):
+        return self.api.patch(f'/api/v1/folders/{folder.id}/', {'parent_id': parent.id if parent else None},
+                              format='json')
+
+
+class MoveSubtreeTests(FolderApiTestCase):
+    def test_move_subtree_under_sibling(self):
+        work = self.folder('업무')
+        project = self.folder('A', work)
+        self.folder('회의록', project)
+        archive = self.folder('보관')
+
+        response = self.move(work, archive)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.tree(), {
+            '보관': (0, None),
+            '보관/업무': (1, '보관'),
+            '보관/업무/A': (2, '보관/업무'),
+            '보관/업무/A/회의록': (3, '보관/업무/A'),
+        })
+
+    def test_move_subtree_up_to_root(self):
+        a = self.folder('a')
+        b = self.folder('b', a)
+        self.folder('c', b)
+
+        response = self.move(b)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.tree(), {'a': (0, None), 'b': (0, None), 'b/c': (1, 'b')})
+
+    def test_move_into_own_descendant_is_rejected(self):
+        a = self.folder('a')
+        b = self.folder('b', a)
+        c = self.folder('c', b)
+        before = self.tree()
+
+        for target in (a, c):
+            response = self.move(a, target)
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.tree(), before)
+
+    def test_move_onto_existing_path_is_conflict(self):
+        self.folder('x', self.folder('a'))
+        x = self.folder('x')
+        self.folder('y', x)
+        a = Folder.objects.get(user=self.user, path='a')
+        before = self.tree()
+
+        response = self.move(x, a)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['code'], 'FOLDER_PATH_CONFLICT')
+        self.assertEqual(self.tree(), before)
+
+    def test_rename_updates_descendants(self):
+        a = self.folder('a')
+        self.folder('c', self.folder('b', a))
+
+        response = self.api.patch(f'/api/v1/folders/{a.id}/', {'name': 'z'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.tree(), {'z': (0, None), 'z/b': (1, 'z'), 'z/b/c': (2, 'z/b')})
+
+
+class DeleteFolderTests(FolderApiTestCase):
+    def test_delete_moves_children_to_root_and_mails_to_unclassified(self):
+        work = self.folder('업무')
+        project = self.folder('A', work)
+        self.folder('회의록', project)
+        mails = [self.mail(work), self.mail(project)]
+
+        response = self.api.delete(f'/api/v1/folders/{work.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], {'moved_mails_count': 2, 'moved_subfolders_count': 1})
+        self.assertEqual(self.tree(), {'A': (0, None), 'A/회의록': (1, 'A')})
+        for mail in mails:
+            mail.refresh_from_db()
+            self.assertIsNone(mail.folder_id)
+            self.assertFalse(mail.is_classified)
+
+    def test_delete_with_child_of_same_name(self):
+        # a/a -> a, a/a/x -> a/x 처럼 옮겨질 경로가 아직 옮겨지지 않은 경로와 겹치는 경우 (임시 경로 사용)
+        a = self.folder('a')
+        inner = self.folder('a', a)
+        self.folder('a', self.folder('x', inner))
+        self.folder('a', inner)
+
+        response = self.api.delete(f'/api/v1/folders/{a.id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.tree(), {
+            'a': (0, None),
+            'a/x': (1, 'a'),
+            'a/x/a': (2, 'a/x'),
+            'a/a': (1, 'a'),
+        })
+        self.assertFalse(Folder.objects.filter(path__startswith='~').exists())
+
+    def test_delete_conflicting_with_root_folder_is_rejected(self):
+        work = self.folder('업무')
+        self.folder('A', work)
+        self.folder('A')
+        before = self.tree()
+
+        response = self.api.delete(f'/api/v1/folders/{work.id}/')
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['code'], 'FOLDER_PATH_CONFLICT')
+        self.assertEqual(self.tree(), before)
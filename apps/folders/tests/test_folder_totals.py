@@ -0,0 +1,116 @@
+from unittest import mock
+
+from django.db.models import Count, Q
+
+from apps.classifier.services import ClassificationState, ClassifierService, get_classification_cache
+from apps.classifier.tests.helpers import FakeChatModel, fake_registry, result_item, stream_pieces
+from apps.folders.models import Folder
+from apps.jobs.services import MemoryStateStore
+from apps.mails.models import Mail
+
+from .test_folder_moves import FolderApiTestCase
+
+
+class FolderTotalsTests(FolderApiTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('apps.jobs.services.state_store._store', MemoryStateStore())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        get_classification_cache().clear()
+        self.addCleanup(get_classification_cache().clear)
+
+        self.work = self.folder('업무')
+        self.project = self.folder('A', self.work)
+        self.notes = self.folder('회의록', self.project)
+        self.archive = self.folder('보관')
+        for folder, read_flags in (
+            (self.work, [False, True]),
+            (self.project, [False]),
+            (self.notes, [False, False, True]),
+            (self.archive, [True]),
+        ):
+            for is_read in read_flags:
+                self.mail(folder, is_read=is_read)
+
+    def recount(self) -> dict:
+        """메일 테이블에서 다시 센 폴더별 (메일 수, 하위 포함 누적 메일 수, 하위 포함 누적 안읽음 수)"""
+        own = {
+            row['folder_id']: (row['mails'], row['unread'])
+            for row in Mail.objects.filter(user=self.user, is_deleted=False, folder__isnull=False)
+            .values('folder_id')
+            .annotate(mails=Count('id'), unread=Count('id', filter=Q(is_read=False)))
+        }
+        folders = list(Folder.objects.filter(user=self.user))
+        counts = {}
+        for folder in folders:
+            subtree = [f for f in folders if f.path == folder.path or f.path.startswith(f'{folder.path}/')]
+            counts[folder.path] = (
+                own.get(folder.id, (0, 0))[0],
+                sum(own.get(f.id, (0, 0))[0] for f in subtree),
+                sum(own.get(f.id, (0, 0))[1] for f in subtree),
+            )
+        return counts
+
+    def stored(self) -> dict:
+        return {
+            folder.path: (folder.mail_count, folder.total_mail_count, folder.total_unread_count)
+            for folder in Folder.objects.filter(user=self.user)
+        }
+
+    def tree_counts(self) -> dict:
+        """목록 API 트리의 폴더별 (mail_count, 누적 unread_count)"""
+        response = self.api.get('/api/v1/folders/')
+        self.assertEqual(response.status_code, 200)
+        counts = {}
+        nodes = list(response.json()['data']['folders'])
+        while nodes:
+            node = nodes.pop()
+            counts[node['path']] = (node['mail_count'], node['unread_count'])
+            nodes.extend(node['children'])
+        return counts
+
+    def assert_totals_match_recount(self):
+        recount = self.recount()
+        self.assertEqual(self.stored(), recount)
+        self.assertEqual(self.tree_counts(), {path: (own, unread) for path, (own, _, unread) in recount.items()})
+
+    def test_totals_after_move(self):
+        self.assertEqual(self.move(self.project, self.archive).status_code, 200)
+        self.assert_totals_match_recount()
+
+    def test_totals_after_delete(self):
+        self.assertEqual(self.api.delete(f'/api/v1/folders/{self.project.id}/').status_code, 200)
+        self.assert_totals_match_recount()
+
+    def test_totals_after_classification(self):
+        unclassified = [self.mail(None), self.mail(None, is_read=True), self.mail(None)]
+        model = FakeChatModel([stream_pieces([
+            result_item(unclassified[0], '업무/A/회의록'),
+            result_item(unclassified[1], '보관'),
+            result_item(unclassified[2], '업무/B'),
+        ])])
+        with mock.patch('apps.classifier.services.llm_client.get_llm_registry', return_value=fake_registry(model)):
+            service = ClassifierService(self.user)
+        state = ClassificationState.create(self.user.id)
+        state.start(len(unclassified))
+        service._process_classification(unclassified, state)
+
+        self.assertEqual(ClassificationState.get(state.classification_id).success, 3)
+        self.assert_totals_match_recount()
+
+    def test_clamped_count_keeps_totals_consistent(self):
+        # 카운트가 실제보다 작게 어긋난 상태에서 메일이 빠져 0 아래로 잘리는 경우
+        Folder.objects.filter(id=self.notes.id).update(mail_count=1, unread_count=0)
+        Folder.objects.add_to_totals(self.user.id, Folder.path_with_ancestors(self.notes.path), -2, -2)
+        for mail in Mail.objects.filter(folder=self.notes):
+            mail.delete()
+
+        folders = {folder.path: folder for folder in Folder.objects.filter(user=self.user)}
+        for path, folder in folders.items():
+            children = [f for f in folders.values() if f.parent_id == folder.id]
+            self.assertEqual(folder.total_mail_count, folder.mail_count + sum(f.total_mail_count for f in children))
+            self.assertEqual(
+                folder.total_unread_count, folder.unread_count + sum(f.total_unread_count for f in children)
+            )
+        self.assertEqual(folders['업무/A/회의록'].total_mail_count, 0)
@@ -1,12 +1,15 @@
 from django.db import transaction
+from django.db.models import Count, Q
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.exceptions import FolderPathConflictException
+
 from .models import Folder
-from .serializers import FolderSerializer, FolderTreeSerializer
+from .serializers import TREE_FIELDS, FolderSerializer, build_folder_tree
 
 
 @extend_schema_view(
@@ -67,53 +70,15 @@ class FolderViewSet(viewsets.ModelViewSet):
                 }
             })
         else:
-            # 트리 구조 생성
-            folder_list = list(folders)
-            folder_map = {f.id: f for f in folder_list}
-
-            # children_list 속성 추가
-            for folder in folder_list:
-                folder.children_list = []
-
-            # 트리 구조 구성
-            root_folders = []
-            for folder in folder_list:
-                if folder.parent_id and folder.parent_id in folder_map:
-                    folder_map[folder.parent_id].children_list.append(folder)
-                else:
-                    root_folders.append(folder)
-
-            # 자손 폴더 포함 누적 카운트 계산 (하위 → 상위)
-            def calculate_cumulative_counts(folder):
-                """재귀적으로 자손 폴더의 카운트를 합산"""
-                cumulative_mail = folder.mail_count
-                cumulative_unread = folder.unread_count
-
-                for child in folder.children_list:
-                    child_mail, child_unread = calculate_cumulative_counts(child)
-                    cumulative_mail += child_mail
-                    cumulative_unread += child_unread
-
-                # 누적 카운트를 임시 속성으로 저장
-                folder.total_mail_count = cumulative_mail
-                folder.total_unread_count = cumulative_unread
-                return cumulative_mail, cumulative_unread
-
-            for root in root_folders:
-                calculate_cumulative_counts(root)
-
-            serializer = FolderTreeSerializer(root_folders, many=True)
-
-            # 전체 통계 계산
-            total_mail_count = sum(f.mail_count for f in folder_list)
-            total_unread_count = sum(f.unread_count for f in folder_list)
+            # 트리 구조 생성 (누적 카운트는 저장된 값을 사용, 상위 폴더가 먼저 오도록 depth 순 정렬)
+            folder_list = list(folders.order_by('depth', 'order', 'name').values(*TREE_FIELDS, 'unread_count'))
 
             return Response({
                 'status': 'success',
                 'data': {
-                    'folders': serializer.data,
-                    'total_mail_count': total_mail_count,
-                    'total_unread_count': total_unread_count,
+                    'folders': build_folder_tree(folder_list),
+                    'total_mail_count': sum(f['mail_count'] for f in folder_list),
+                    'total_unread_count': sum(f['unread_count'] for f in folder_list),
                 }
             })
 
@@ -132,37 +97,51 @@ class FolderViewSet(viewsets.ModelViewSet):
     @transaction.atomic
     def destroy(self, request, *args, **kwargs):
         """폴더 삭제 시 하위 폴더와 메일을 미분류로 이동"""
+        from apps.mails.models import Mail
+        from apps.mails.signals import apply_folder_count_deltas
+
         folder = self.get_object()
 
-        # 이 폴더와 모든 하위 폴더 ID 수집
-        folder_ids = [folder.id]
-        self._collect_descendant_ids(folder, folder_ids)
+        # 이 폴더와 모든 하위 폴더
+        subtree = list(Folder.objects.subtree(folder).values_list('id', 'parent_id', 'path'))
+        folder_ids = [folder_id for folder_id, _, _ in subtree]
+        child_paths = [path for _, parent_id, path in subtree if parent_id == folder.id]
+        moved_subfolders_count = len(child_paths)
+
+        # 루트로 올라갈 하위 폴더와 같은 이름의 루트 폴더가 있으면 중단 (삭제할 폴더 자신은 제외)
+        conflicts = list(
+            Folder.objects.filter(
+                user=request.user,
+                path__in=[path[len(folder.path) + 1:] for path in child_paths],
+            ).exclude(id__in=folder_ids).values_list('path', flat=True)
+        )
+        if conflicts:
+            raise FolderPathConflictException(
+                f"같은 이름의 최상위 폴더가 이미 있어 하위 폴더를 옮길 수 없습니다: {', '.join(conflicts)}"
+            )
+
+        # 폴더별로 빠져나가는 메일 수 (카운트 대상이 아닌 삭제된 메일 제외)
+        deltas = {
+            row['folder_id']: {'mail': -row['mail'], 'unread': -row['unread']}
+            for row in Mail.objects.filter(folder_id__in=folder_ids, user=request.user, is_deleted=False)
+            .order_by()
+            .values('folder_id')
+            .annotate(mail=Count('id'), unread=Count('id', filter=Q(is_read=False)))
+        }
 
         # 메일들을 미분류(folder=None)로 이동
-        from apps.mails.models import Mail
         moved_mails_count = Mail.objects.filter(
             folder_id__in=folder_ids,
             user=request.user
         ).update(folder=None, is_classified=False)
+        apply_folder_count_deltas(deltas)
 
-        # 하위 폴더들을 루트로 이동 (부모 폴더만 삭제하는 경우)
-        moved_subfolders_count = Folder.objects.filter(
-            parent=folder,
-            user=request.user
-        ).count()
-
-        # 하위 폴더를 미분류(루트)로 이동
-        Folder.objects.filter(
-            parent=folder,
-            user=request.user
-        ).update(parent=None, depth=0)
-
-        # 하위로 이동된 폴더들의 path 재계산
-        for child in Folder.objects.filter(parent=None, user=request.user).exclude(id=folder.id):
-            self._update_path_recursive(child)
-
-        # 폴더 삭제
+        # 하위 폴더를 미분류(루트)로 이동: 직계 하위 폴더의 부모를 해제하고 폴더를 삭제한 뒤,
+        # 하위 트리 전체의 path/depth는 UPDATE 한 번으로 갱신
+        Folder.objects.filter(parent=folder).update(parent=None)
+        folder_path, folder_depth = folder.path, folder.depth
         folder.delete()
+        Folder.objects.move_subtree(request.user.id, folder_path, '', -(folder_depth + 1))
 
         return Response({
             'status': 'success',
@@ -173,25 +152,6 @@ class FolderViewSet(viewsets.ModelViewSet):
             }
         })
 
-    def _collect_descendant_ids(self, folder, id_list):
-        """하위 폴더 ID를 재귀적으로 수집"""
-        for child in Folder.objects.filter(parent=folder):
-            id_list.append(child.id)
-            self._collect_descendant_ids(child, id_list)
-
-    def _update_path_recursive(self, folder):
-        """폴더와 하위 폴더의 path를 재귀적으로 업데이트"""
-        if folder.parent:
-            folder.depth = folder.parent.depth + 1
-            folder.path = f"{folder.parent.path}/{folder.name}"
-        else:
-            folder.depth = 0
-            folder.path = folder.name
-        folder.save(update_fields=['depth', 'path'])
-
-        for child in Folder.objects.filter(parent=folder):
-            self._update_path_recursive(child)
-
     @extend_schema(
         summary='폴더 순서 변경',
         description='여러 폴더의 순서를 한번에 변경합니다.',
@@ -0,0 +1,20 @@
+from django.contrib import admin
+
+from .models import Job, JobState
+
+
+@admin.register(JobState)
+class JobStateAdmin(admin.ModelAdmin):
+    list_display = ['key', 'expires_at', 'updated_at']
+    search_fields = ['key']
+    ordering = ['-updated_at']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'job_type', 'user', 'state', 'attempts', 'worker_id', 'created_at', 'finished_at']
+    list_filter = ['job_type', 'state']
+    search_fields = ['user__email', 'worker_id']
+    ordering = ['-created_at']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'heartbeat_at']
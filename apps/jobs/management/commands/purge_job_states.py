@@ -0,0 +1,14 @@
+"""
+만료된 작업 상태 정리 명령어
+"""
+from django.core.management.base import BaseCommand
+
+from apps.jobs.services import get_state_store
+
+
+class Command(BaseCommand):
+    help = '만료된 작업 상태(분류 결과, 할당량 버킷 등) 삭제 (run_worker 없이 JOB_RUNNER=thread로 운영할 때 주기적으로 실행)'
+
+    def handle(self, *args, **options):
+        purged = get_state_store().purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'만료된 작업 상태 {purged}개 삭제'))
@@ -0,0 +1,41 @@
+"""
+백그라운드 작업 워커 실행 명령어
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.jobs.services import JobWorker
+
+
+class Command(BaseCommand):
+    help = '대기열의 동기화/분류 작업을 가져와 실행하는 워커 (SIGTERM 시 실행 중 작업 완료 후 종료)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'JOB_WORKER_CONCURRENCY', 2),
+            help='동시에 실행할 최대 작업 수',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=JobWorker.POLL_INTERVAL,
+            help='대기열 확인 주기 (초)',
+        )
+        parser.add_argument(
+            '--shutdown-timeout',
+            type=float,
+            default=getattr(settings, 'JOB_WORKER_SHUTDOWN_TIMEOUT', None),
+            help='종료 요청 후 실행 중 작업을 기다리는 최대 시간 (초, 미지정 시 끝날 때까지)',
+        )
+
+    def handle(self, *args, **options):
+        worker = JobWorker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            shutdown_timeout=options['shutdown_timeout'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'워커 시작: {worker.worker_id} (동시 실행 {worker.concurrency}개)'))
+        worker.run()
+        self.stdout.write(self.style.SUCCESS('워커 종료'))
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.14 on 2026-10-17 06:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=50)),
+                ('payload', models.JSONField(default=dict)),
+                ('state', models.CharField(choices=[('queued', '대기'), ('running', '실행 중'), ('completed', '완료'), ('failed', '실패')], default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('worker_id', models.CharField(blank=True, max_length=100)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '백그라운드 작업',
+                'verbose_name_plural': '백그라운드 작업들',
+                'db_table': 'jobs',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['state', 'created_at'], name='jobs_state_411e8c_idx'), models.Index(fields=['user', 'state'], name='jobs_user_id_ae264c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import models
+
+
+class JobState(models.Model):
+    """백그라운드 작업 진행 상태 (워커 간 공유용 키-값 저장소)"""
+
+    key = models.CharField(max_length=100, unique=True)  # 예: "sync:1", "cls:cls_ab12cd34"
+    data = models.JSONField(default=dict)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'job_states'
+        verbose_name = '작업 상태'
+        verbose_name_plural = '작업 상태들'
+
+    def __str__(self):
+        return self.key
+
+
+class Job(models.Model):
+    """백그라운드 작업 큐 항목 (run_worker 프로세스가 가져가 실행)"""
+
+    STATE_CHOICES = [
+        ('queued', '대기'),
+        ('running', '실행 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+    ]
+
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.CASCADE,
+        related_name='jobs'
+    )
+    job_type = models.CharField(max_length=50)  # settings.JOB_HANDLERS의 키 (sync, classification)
+    payload = models.JSONField(default=dict)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    worker_id = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'jobs'
+        verbose_name = '백그라운드 작업'
+        verbose_name_plural = '백그라운드 작업들'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['state', 'created_at']),
+            models.Index(fields=['user', 'state']),
+        ]
+
+    def __str__(self):
+        return f"{self.job_type}#{self.id} ({self.state})"
@@ -0,0 +1,22 @@
+from .queue import JobQueue, dispatch_job
+from .shared_state import SharedState
+from .state_store import (
+    BaseStateStore,
+    DatabaseStateStore,
+    FileStateStore,
+    MemoryStateStore,
+    get_state_store,
+)
+from .worker import JobWorker
+
+__all__ = [
+    'JobQueue',
+    'JobWorker',
+    'dispatch_job',
+    'SharedState',
+    'BaseStateStore',
+    'DatabaseStateStore',
+    'FileStateStore',
+    'MemoryStateStore',
+    'get_state_store',
+]
@@ -0,0 +1,225 @@
+"""
+백그라운드 작업 큐
+
+동기화/분류처럼 오래 걸리는 작업을 Job 테이블에 넣고, 웹 프로세스와 분리된 워커
+(manage.py run_worker)가 가져가 실행합니다. 설정(JOB_RUNNER)이 'thread'이면
+기존처럼 요청을 받은 프로세스의 스레드에서 바로 실행합니다(개발 환경용).
+"""
+import logging
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """DB(Job 테이블) 기반 작업 큐"""
+
+    STALE_AFTER = timedelta(minutes=2)  # heartbeat가 끊긴 실행 중 작업을 재투입하는 기준
+    HEARTBEAT_INTERVAL = 30  # 실행 중 작업 heartbeat 갱신 주기 (초, STALE_AFTER보다 충분히 짧게)
+    MAX_ATTEMPTS = 3  # 워커 유실로 재투입되는 최대 횟수
+    CLAIM_SCAN_LIMIT = 100  # 한 번에 살펴보는 대기 작업 수
+
+    def enqueue(self, job_type: str, user, payload: dict = None, worker_id: str = None) -> Job:
+        """
+        작업 등록
+
+        Args:
+            job_type: settings.JOB_HANDLERS에 등록된 작업 종류
+            user: 작업 대상 사용자
+            payload: 핸들러에 키워드 인자로 전달할 값 (JSON 직렬화 가능해야 함)
+            worker_id: 지정하면 대기열을 거치지 않고 해당 실행자가 바로 실행하는 작업(running)으로 등록
+                       (대기 상태로 보이는 순간이 없어 다른 워커가 가져가지 않음)
+
+        Returns:
+            Job: 등록된 작업
+        """
+        if job_type not in settings.JOB_HANDLERS:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if worker_id is None:
+            return Job.objects.create(user=user, job_type=job_type, payload=payload or {})
+
+        now = timezone.now()
+        return Job.objects.create(
+            user=user,
+            job_type=job_type,
+            payload=payload or {},
+            state='running',
+            worker_id=worker_id,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=1,
+        )
+
+    def claim(self, worker_id: str, limit: int) -> list:
+        """
+        실행할 작업 가져오기 (사용자당 동시에 하나의 작업만 실행)
+
+        여러 워커가 동시에 호출해도 조건부 UPDATE로 한 작업은 한 워커만 가져갑니다.
+
+        Args:
+            worker_id: 워커 식별자
+            limit: 가져올 최대 작업 수
+
+        Returns:
+            list: 실행 상태로 전환된 Job 목록
+        """
+        busy_users = set(Job.objects.filter(state='running').values_list('user_id', flat=True))
+        candidates = (
+            Job.objects.filter(state='queued')
+            .exclude(user_id__in=busy_users)
+            .order_by('created_at', 'id')[:self.CLAIM_SCAN_LIMIT]
+        )
+
+        claimed = []
+        for job in candidates:
+            if len(claimed) >= limit:
+                break
+            if job.user_id in busy_users:
+                continue
+
+            now = timezone.now()
+            updated = Job.objects.filter(id=job.id, state='queued').update(
+                state='running',
+                worker_id=worker_id,
+                started_at=now,
+                heartbeat_at=now,
+                attempts=F('attempts') + 1,
+            )
+            if not updated:
+                continue  # 다른 워커가 먼저 가져감
+
+            # 다른 워커가 같은 사용자의 작업을 동시에 가져간 경우 먼저 시작한 작업만 실행
+            conflict = Job.objects.filter(user_id=job.user_id, state='running').exclude(id=job.id).filter(
+                Q(started_at__lt=now) | Q(started_at=now, id__lt=job.id)
+            ).exists()
+            if conflict:
+                Job.objects.filter(id=job.id).update(
+                    state='queued',
+                    worker_id='',
+                    started_at=None,
+                    heartbeat_at=None,
+                    attempts=F('attempts') - 1,
+                )
+                busy_users.add(job.user_id)
+                continue
+
+            busy_users.add(job.user_id)
+            job.refresh_from_db()
+            claimed.append(job)
+
+        return claimed
+
+    def heartbeat(self, job_ids: list):
+        """실행 중인 작업의 heartbeat 갱신"""
+        if job_ids:
+            Job.objects.filter(id__in=job_ids, state='running').update(heartbeat_at=timezone.now())
+
+    def requeue_stale(self) -> int:
+        """
+        heartbeat가 끊긴 작업(워커 비정상 종료)을 다시 대기열에 넣거나 실패 처리
+
+        Returns:
+            int: 재투입된 작업 수
+        """
+        stale_before = timezone.now() - self.STALE_AFTER
+        stale = Job.objects.filter(state='running', heartbeat_at__lt=stale_before)
+
+        exhausted = stale.filter(attempts__gte=self.MAX_ATTEMPTS).update(
+            state='failed',
+            error='워커 응답 없음 (최대 재시도 초과)',
+            finished_at=timezone.now(),
+        )
+        if exhausted:
+            logger.warning(f"Marked {exhausted} stale jobs as failed")
+
+        requeued = stale.update(state='queued', worker_id='', heartbeat_at=None)
+        if requeued:
+            logger.warning(f"Requeued {requeued} stale jobs")
+        return requeued
+
+    def execute(self, job_id: int):
+        """작업 실행 후 결과 기록 (워커 스레드에서 호출)"""
+        job = Job.objects.get(id=job_id)
+        try:
+            handler = import_string(settings.JOB_HANDLERS[job.job_type])
+            handler(job.user_id, **job.payload)
+        except Exception as e:
+            logger.exception(f"Job {job.id} ({job.job_type}) failed")
+            self._finish(job, 'failed', str(e))
+        else:
+            self._finish(job, 'completed')
+        finally:
+            connection.close()
+
+    def execute_with_heartbeat(self, job_id: int):
+        """
+        작업 실행 (실행하는 동안 heartbeat를 직접 갱신)
+
+        워커 없이 요청 프로세스의 스레드에서 실행하는 작업용입니다. heartbeat가 없으면
+        STALE_AFTER가 지난 뒤 다른 워커의 requeue_stale()이 실행 중인 작업을 다시 대기열에 넣습니다.
+        """
+        finished = threading.Event()
+        beater = threading.Thread(
+            target=self._heartbeat_until,
+            args=(job_id, finished),
+            name=f'job-{job_id}-heartbeat',
+            daemon=True,
+        )
+        beater.start()
+        try:
+            self.execute(job_id)
+        finally:
+            finished.set()
+            beater.join()
+
+    def _heartbeat_until(self, job_id: int, finished: threading.Event):
+        try:
+            while not finished.wait(self.HEARTBEAT_INTERVAL):
+                self.heartbeat([job_id])
+        except Exception:
+            logger.exception(f"Heartbeat for job {job_id} failed")
+        finally:
+            connection.close()
+
+    def _finish(self, job: Job, state: str, error: str = ''):
+        Job.objects.filter(id=job.id).update(
+            state=state,
+            error=error,
+            finished_at=timezone.now(),
+        )
+
+
+def dispatch_job(job_type: str, user, payload: dict = None) -> Job:
+    """
+    작업 실행 요청
+
+    JOB_RUNNER가 'queue'이면 대기열에 넣고 워커가 실행하며,
+    'thread'이면 현재 프로세스의 백그라운드 스레드에서 바로 실행합니다.
+
+    Args:
+        job_type: settings.JOB_HANDLERS에 등록된 작업 종류
+        user: 작업 대상 사용자
+        payload: 핸들러에 전달할 키워드 인자
+
+    Returns:
+        Job: 등록된 작업
+    """
+    queue = JobQueue()
+    if getattr(settings, 'JOB_RUNNER', 'thread') != 'thread':
+        return queue.enqueue(job_type, user, payload)
+
+    # 처음부터 실행 상태로 등록해 run_worker 프로세스가 같은 작업을 가져가지 않도록 함
+    job = queue.enqueue(job_type, user, payload, worker_id=f'thread:{os.getpid()}')
+    thread = threading.Thread(target=queue.execute_with_heartbeat, args=(job.id,), daemon=True)
+    thread.start()
+    return job
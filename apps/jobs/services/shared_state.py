@@ -0,0 +1,72 @@
+"""
+공유 작업 상태 기본 클래스
+"""
+from typing import Callable, Optional
+
+from .state_store import get_state_store
+
+
+class SharedState:
+    """
+    상태 저장소에 보관되는 작업 상태
+
+    필드는 속성으로 읽고(마지막으로 읽거나 쓴 스냅샷 기준), 변경은 update()/incr()/mutate()로
+    저장소에 원자적으로 반영합니다. 다른 워커의 변경을 보려면 refresh()를 호출합니다.
+    """
+
+    KEY_PREFIX = ''
+    DEFAULTS = {}
+    TTL = None  # 상태 보관 시간 (초, None이면 만료 없음)
+
+    def __init__(self, state_id, data: Optional[dict] = None):
+        self.state_id = state_id
+        self._data = {**self.DEFAULTS, **(data or {})}
+
+    @classmethod
+    def store_key(cls, state_id) -> str:
+        return f'{cls.KEY_PREFIX}:{state_id}'
+
+    @classmethod
+    def load(cls, state_id) -> Optional['SharedState']:
+        data = get_state_store().get(cls.store_key(state_id))
+        if data is None:
+            return None
+        return cls(state_id, data)
+
+    def __getattr__(self, name):
+        data = self.__dict__.get('_data')
+        if data is not None and name in data:
+            return data[name]
+        raise AttributeError(name)
+
+    def refresh(self):
+        """저장소의 최신 상태로 스냅샷 갱신"""
+        data = get_state_store().get(self.store_key(self.state_id))
+        if data is not None:
+            self._data = {**self.DEFAULTS, **data}
+
+    def save(self):
+        """현재 스냅샷 전체를 저장"""
+        get_state_store().set(self.store_key(self.state_id), self._data, ttl=self.TTL)
+
+    def mutate(self, func: Callable[[dict], dict]) -> dict:
+        """현재 상태를 받아 새 상태를 반환하는 함수로 원자적 변경"""
+        def apply(current):
+            return func({**self.DEFAULTS, **(current or self._data)})
+        self._data = get_state_store().mutate(self.store_key(self.state_id), apply, ttl=self.TTL)
+        return self._data
+
+    def update(self, **fields) -> dict:
+        """지정한 필드만 덮어쓰기"""
+        def apply(data):
+            data.update(fields)
+            return data
+        return self.mutate(apply)
+
+    def incr(self, **deltas) -> dict:
+        """카운터 필드 원자적 증감"""
+        def apply(data):
+            for field, delta in deltas.items():
+                data[field] = (data.get(field) or 0) + delta
+            return data
+        return self.mutate(apply)
@@ -0,0 +1,286 @@
+"""
+작업 상태 저장소
+
+동기화/분류 진행 상태를 요청을 받은 프로세스와 작업을 실행하는 프로세스가 함께 읽고 쓸 수 있도록
+공유 저장소에 보관합니다. 설정(JOB_STATE_BACKEND)에 따라 백엔드를 선택합니다.
+
+- memory: 프로세스 메모리 (단일 프로세스 개발 환경용)
+- file: 로컬 파일 + 파일 잠금 (같은 서버의 여러 워커 간 공유, /dev/shm 지정 시 공유 메모리)
+- db: JobState 테이블 + 행 잠금 (여러 서버/워커 간 공유)
+"""
+import copy
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내부 잠금만 사용
+    fcntl = None
+
+
+class BaseStateStore:
+    """
+    작업 상태 저장소 인터페이스
+
+    모든 변경은 mutate()를 통해 키 단위로 원자적으로 수행됩니다.
+    """
+
+    def get(self, key: str) -> Optional[dict]:
+        """저장된 상태 조회 (없거나 만료되면 None)"""
+        raise NotImplementedError
+
+    def mutate(self, key: str, func: Callable[[Optional[dict]], dict], ttl: Optional[int] = None) -> dict:
+        """
+        상태를 읽고 변경하여 저장 (키 단위 원자적 처리)
+
+        Args:
+            key: 상태 키
+            func: 현재 상태(없으면 None)의 복사본을 받아 새 상태를 반환하는 함수
+            ttl: 만료 시간 (초, None이면 만료 없음)
+
+        Returns:
+            dict: 저장된 새 상태
+        """
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        """상태 삭제"""
+        raise NotImplementedError
+
+    def set(self, key: str, data: dict, ttl: Optional[int] = None) -> dict:
+        """상태 덮어쓰기"""
+        return self.mutate(key, lambda current: data, ttl=ttl)
+
+    def update(self, key: str, ttl: Optional[int] = None, **fields) -> dict:
+        """지정한 필드만 덮어쓰기"""
+        def apply(current):
+            data = current or {}
+            data.update(fields)
+            return data
+        return self.mutate(key, apply, ttl=ttl)
+
+    def incr(self, key: str, ttl: Optional[int] = None, **deltas) -> dict:
+        """숫자 필드를 원자적으로 증감"""
+        def apply(current):
+            data = current or {}
+            for field, delta in deltas.items():
+                data[field] = (data.get(field) or 0) + delta
+            return data
+        return self.mutate(key, apply, ttl=ttl)
+
+    def purge_expired(self) -> int:
+        """
+        만료된 상태 정리
+
+        Returns:
+            int: 삭제된 상태 수
+        """
+        return 0
+
+
+class MemoryStateStore(BaseStateStore):
+    """프로세스 메모리 기반 저장소"""
+
+    def __init__(self):
+        self._entries = {}  # key -> (data, 만료 시각(monotonic) 또는 None)
+        self._lock = threading.Lock()
+
+    def _current(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        data, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return data
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return copy.deepcopy(self._current(key))
+
+    def mutate(self, key: str, func: Callable[[Optional[dict]], dict], ttl: Optional[int] = None) -> dict:
+        with self._lock:
+            data = func(copy.deepcopy(self._current(key)))
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._entries[key] = (copy.deepcopy(data), expires_at)
+            return data
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            before = len(self._entries)
+            for key in list(self._entries):
+                self._current(key)
+            return before - len(self._entries)
+
+
+class FileStateStore(BaseStateStore):
+    """
+    파일 기반 저장소
+
+    키마다 JSON 파일 하나를 사용합니다. 쓰기는 키별 잠금 파일(flock)로 직렬화하고
+    임시 파일 교체(os.replace)로 기록하므로, 읽기는 잠금 없이 항상 완결된 상태를 봅니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread_lock = threading.Lock()  # fcntl 미지원 환경용
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{quote(key, safe='')}.json"
+
+    def _read(self, path: Path) -> Optional[dict]:
+        try:
+            with open(path, encoding='utf-8') as f:
+                record = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        expires_at = record.get('expires_at')
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return record.get('data')
+
+    @contextmanager
+    def _locked(self, path: Path):
+        if fcntl is None:
+            with self._thread_lock:
+                yield
+            return
+        with open(f'{path}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._read(self._path(key))
+
+    def mutate(self, key: str, func: Callable[[Optional[dict]], dict], ttl: Optional[int] = None) -> dict:
+        path = self._path(key)
+        with self._locked(path):
+            data = func(self._read(path))
+            record = {
+                'data': data,
+                'expires_at': time.time() + ttl if ttl else None,
+            }
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            return data
+
+    def delete(self, key: str):
+        path = self._path(key)
+        with self._locked(path):
+            path.unlink(missing_ok=True)
+
+    def purge_expired(self) -> int:
+        purged = 0
+        for path in self.directory.glob('*.json'):
+            with self._locked(path):
+                if path.exists() and self._read(path) is None:
+                    path.unlink(missing_ok=True)
+                    purged += 1
+        return purged
+
+
+class DatabaseStateStore(BaseStateStore):
+    """
+    DB(JobState 테이블) 기반 저장소
+
+    PostgreSQL에서는 SELECT ... FOR UPDATE 행 잠금으로 변경을 직렬화합니다.
+    SQLite는 행 잠금이 없고 읽기 후 쓰기로 잠금을 올리면 동시 트랜잭션끼리 교착(database is locked)되므로
+    쓰기 문장을 먼저 실행해 트랜잭션 시작 시점에 쓰기 잠금을 잡습니다.
+    """
+
+    def _expires_at(self, ttl: Optional[int]):
+        return timezone.now() + timedelta(seconds=ttl) if ttl else None
+
+    @staticmethod
+    def _is_expired(expires_at) -> bool:
+        return expires_at is not None and expires_at <= timezone.now()
+
+    def get(self, key: str) -> Optional[dict]:
+        from ..models import JobState
+
+        entry = JobState.objects.filter(key=key).values('data', 'expires_at').first()
+        if not entry or self._is_expired(entry['expires_at']):
+            return None
+        return entry['data']
+
+    def mutate(self, key: str, func: Callable[[Optional[dict]], dict], ttl: Optional[int] = None) -> dict:
+        from ..models import JobState
+
+        for attempt in range(2):
+            try:
+                with transaction.atomic():
+                    if connection.vendor == 'sqlite':
+                        JobState.objects.filter(key=key).update(updated_at=timezone.now())
+                    entry = JobState.objects.select_for_update().filter(key=key).first()
+                    current = entry.data if entry and not self._is_expired(entry.expires_at) else None
+                    data = func(copy.deepcopy(current))
+                    if entry:
+                        entry.data = data
+                        entry.expires_at = self._expires_at(ttl)
+                        entry.save(update_fields=['data', 'expires_at', 'updated_at'])
+                    else:
+                        JobState.objects.create(key=key, data=data, expires_at=self._expires_at(ttl))
+                    return data
+            except IntegrityError:
+                # 다른 워커가 같은 키를 먼저 생성한 경우 잠금을 잡고 다시 시도
+                if attempt:
+                    raise
+
+    def delete(self, key: str):
+        from ..models import JobState
+
+        JobState.objects.filter(key=key).delete()
+
+    def purge_expired(self) -> int:
+        from ..models import JobState
+
+        purged, _ = JobState.objects.filter(expires_at__lte=timezone.now()).delete()
+        return purged
+
+
+STATE_STORE_BACKENDS = {
+    'memory': MemoryStateStore,
+    'file': FileStateStore,
+    'db': DatabaseStateStore,
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_state_store() -> BaseStateStore:
+    """설정(JOB_STATE_BACKEND)에 맞는 프로세스 공용 저장소 반환"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                backend = getattr(settings, 'JOB_STATE_BACKEND', 'db')
+                if backend not in STATE_STORE_BACKENDS:
+                    raise ValueError(f"Unknown JOB_STATE_BACKEND: {backend}")
+                if backend == 'file':
+                    _store = FileStateStore(settings.JOB_STATE_DIR)
+                else:
+                    _store = STATE_STORE_BACKENDS[backend]()
+    return _store
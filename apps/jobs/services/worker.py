@@ -0,0 +1,128 @@
+"""
+백그라운드 작업 워커
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.db import close_old_connections
+
+from .queue import JobQueue
+from .state_store import get_state_store
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    작업 큐 워커 (manage.py run_worker)
+
+    작업 대부분이 Gmail/LLM API 대기 시간이므로 작업마다 스레드 하나를 사용합니다.
+    SIGTERM/SIGINT를 받으면 새 작업을 가져오지 않고 실행 중인 작업이 끝나기를 기다립니다.
+    """
+
+    POLL_INTERVAL = 1.0  # 대기열 확인 주기 (초)
+    HEARTBEAT_INTERVAL = JobQueue.HEARTBEAT_INTERVAL  # 실행 중 작업 heartbeat 갱신 주기 (초)
+    PURGE_INTERVAL = 60 * 10  # 만료된 작업 상태 정리 주기 (초)
+
+    def __init__(self, concurrency: int = 2, poll_interval: float = None, shutdown_timeout: float = None):
+        """
+        Args:
+            concurrency: 동시에 실행할 최대 작업 수
+            poll_interval: 대기열 확인 주기 (초)
+            shutdown_timeout: 종료 요청 후 실행 중 작업을 기다리는 최대 시간 (초, None이면 끝날 때까지)
+        """
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval or self.POLL_INTERVAL
+        self.shutdown_timeout = shutdown_timeout
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.queue = JobQueue()
+        self._running = {}  # job_id -> Thread
+        self._stop_event = threading.Event()
+
+    def stop(self, *args):
+        """종료 요청 (시그널 핸들러)"""
+        if not self._stop_event.is_set():
+            logger.info(f"Worker {self.worker_id} shutting down, waiting for {len(self._running)} running jobs")
+        self._stop_event.set()
+
+    def run(self):
+        """종료 요청을 받을 때까지 작업을 가져와 실행"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info(f"Worker {self.worker_id} started (concurrency={self.concurrency})")
+
+        last_heartbeat = 0.0
+        last_purge = 0.0
+        while not self._stop_event.is_set():
+            close_old_connections()
+            self._reap()
+
+            now = time.monotonic()
+            if now - last_heartbeat >= self.HEARTBEAT_INTERVAL:
+                self.queue.heartbeat(list(self._running))
+                self.queue.requeue_stale()
+                last_heartbeat = now
+            if now - last_purge >= self.PURGE_INTERVAL:
+                self._purge_expired_states()
+                last_purge = now
+
+            free_slots = self.concurrency - len(self._running)
+            if free_slots > 0:
+                for job in self.queue.claim(self.worker_id, free_slots):
+                    self._start(job)
+
+            self._stop_event.wait(self.poll_interval)
+
+        self._drain()
+
+    def _start(self, job):
+        logger.info(f"Worker {self.worker_id} running job {job.id} ({job.job_type}) for user {job.user_id}")
+        # 데몬 스레드: 종료 대기 시간을 넘긴 작업은 프로세스와 함께 종료되고, heartbeat 만료 후 재투입됨
+        thread = threading.Thread(
+            target=self.queue.execute,
+            args=(job.id,),
+            name=f'job-{job.id}',
+            daemon=True,
+        )
+        self._running[job.id] = thread
+        thread.start()
+
+    def _purge_expired_states(self):
+        """만료된 작업 상태(분류 결과, 할당량 버킷 등) 정리 (실패해도 작업 처리는 계속)"""
+        try:
+            purged = get_state_store().purge_expired()
+        except Exception:
+            logger.exception("Failed to purge expired job states")
+            return
+        if purged:
+            logger.info(f"Purged {purged} expired job states")
+
+    def _reap(self):
+        """끝난 작업 스레드 정리"""
+        for job_id, thread in list(self._running.items()):
+            if not thread.is_alive():
+                del self._running[job_id]
+
+    def _drain(self):
+        """실행 중인 작업이 끝나기를 기다림 (heartbeat는 계속 갱신)"""
+        deadline = None if self.shutdown_timeout is None else time.monotonic() + self.shutdown_timeout
+        last_heartbeat = time.monotonic()
+
+        while self._running:
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(
+                    f"Worker {self.worker_id} shutdown timeout, {len(self._running)} jobs will be requeued"
+                )
+                return
+            for thread in list(self._running.values()):
+                thread.join(timeout=1.0)
+            self._reap()
+            if time.monotonic() - last_heartbeat >= self.HEARTBEAT_INTERVAL:
+                self.queue.heartbeat(list(self._running))
+                last_heartbeat = time.monotonic()
+
+        logger.info(f"Worker {self.worker_id} stopped")
@@ -0,0 +1,60 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.jobs.models import Job
+from apps.jobs.services import JobQueue, dispatch_job
+
+release = threading.Event()
+
+
+def blocking_handler(user_id, **payload):
+    """테스트가 release를 설정할 때까지 실행 중으로 남는 작업"""
+    release.wait(5)
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            raise AssertionError('condition not met in time')
+        time.sleep(0.02)
+
+
+@override_settings(JOB_RUNNER='thread', JOB_HANDLERS={'blocking': f'{__name__}.blocking_handler'})
+class ThreadRunnerTests(TransactionTestCase):
+    def setUp(self):
+        release.clear()
+        self.addCleanup(release.set)
+        self.user = get_user_model().objects.create_user(
+            username='jobs', email='jobs@example.com', password='unused',
+        )
+
+    def finish(self, job: Job):
+        release.set()
+        wait_for(lambda: Job.objects.get(id=job.id).state == 'completed')
+
+    def test_thread_job_is_never_visible_as_queued(self):
+        with mock.patch.object(Job.objects, 'create', wraps=Job.objects.create) as create:
+            job = dispatch_job('blocking', self.user)
+
+        self.assertEqual(create.call_args.kwargs['state'], 'running')
+        self.assertEqual(JobQueue().claim('other-worker', 5), [])
+        self.assertEqual(Job.objects.get(id=job.id).attempts, 1)
+        self.finish(job)
+
+    def test_thread_job_keeps_heartbeat_while_running(self):
+        with mock.patch.object(JobQueue, 'HEARTBEAT_INTERVAL', 0.05):
+            job = dispatch_job('blocking', self.user)
+            stale = timezone.now() - JobQueue.STALE_AFTER - timedelta(seconds=1)
+            Job.objects.filter(id=job.id).update(heartbeat_at=stale)
+
+            wait_for(lambda: Job.objects.get(id=job.id).heartbeat_at > stale)
+            self.assertEqual(JobQueue().requeue_stale(), 0)
+            self.assertEqual(Job.objects.get(id=job.id).state, 'running')
+            self.finish(job)
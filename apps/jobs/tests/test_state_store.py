@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from apps.jobs.models import JobState
+from apps.jobs.services import DatabaseStateStore, FileStateStore
+
+
+class StateStoreContract:
+    """모든 백엔드가 지켜야 하는 mutate 원자성/TTL 만료 동작"""
+
+    THREADS = 4
+    INCREMENTS = 25
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        super().setUp()
+        self.store = self.make_store()
+        self.offset = 0.0
+        real_time, real_now = time.time, timezone.now
+        for target, clock in (
+            ('apps.jobs.services.state_store.time.time', lambda: real_time() + self.offset),
+            ('apps.jobs.services.state_store.timezone.now', lambda: real_now() + timedelta(seconds=self.offset)),
+        ):
+            patcher = mock.patch(target, side_effect=clock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def advance(self, seconds: float):
+        self.offset += seconds
+
+    def test_concurrent_mutations_are_not_lost(self):
+        errors = []
+
+        def work():
+            try:
+                for _ in range(self.INCREMENTS):
+                    self.store.incr('counter', count=1)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.store.get('counter'), {'count': self.THREADS * self.INCREMENTS})
+
+    def test_mutate_sees_current_state(self):
+        self.store.set('state', {'items': [1]})
+        result = self.store.mutate('state', lambda data: {'items': data['items'] + [2]})
+        self.assertEqual(result, {'items': [1, 2]})
+        self.assertEqual(self.store.get('state'), {'items': [1, 2]})
+
+    def test_expired_state_is_hidden_and_purged(self):
+        self.store.set('short', {'value': 1}, ttl=60)
+        self.store.set('forever', {'value': 2})
+
+        self.advance(30)
+        self.assertEqual(self.store.get('short'), {'value': 1})
+        self.assertEqual(self.store.purge_expired(), 0)
+
+        self.advance(31)
+        self.assertIsNone(self.store.get('short'))
+        self.assertEqual(self.store.mutate('short', lambda data: {'was': data}, ttl=60), {'was': None})
+
+        self.advance(61)
+        self.assertEqual(self.store.purge_expired(), 1)
+        self.assertIsNone(self.store.get('short'))
+        self.assertEqual(self.store.get('forever'), {'value': 2})
+
+
+class DatabaseStateStoreTests(StateStoreContract, TransactionTestCase):
+    def make_store(self):
+        return DatabaseStateStore()
+
+    def test_purge_deletes_expired_rows(self):
+        self.store.set('short', {'value': 1}, ttl=60)
+        self.advance(61)
+        self.store.purge_expired()
+        self.assertFalse(JobState.objects.filter(key='short').exists())
+
+
+class FileStateStoreTests(StateStoreContract, TransactionTestCase):
+    def make_store(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        return FileStateStore(directory)
@@ -14,7 +14,7 @@ class MailAdmin(admin.ModelAdmin):
         ('기본 정보', {'fields': ('user', 'folder', 'gmail_id', 'thread_id')}),
         ('메일 내용', {'fields': ('subject', 'sender', 'sender_email', 'recipients', 'snippet', 'body_html')}),
         ('첨부파일', {'fields': ('has_attachments', 'attachments')}),
-        ('상태', {'fields': ('is_read', 'is_starred', 'is_classified', 'is_deleted')}),
+        ('상태', {'fields': ('is_read', 'is_starred', 'is_classified', 'is_hydrated', 'is_deleted')}),
         ('시간', {'fields': ('received_at', 'created_at', 'updated_at')}),
     )
 
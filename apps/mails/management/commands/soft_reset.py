@@ -32,6 +32,7 @@ class Command(BaseCommand):
 
         if reset_mails:
             mail_count = Mail.objects.update(is_classified=False, folder=None)
+            Folder.objects.update(mail_count=0, unread_count=0, total_mail_count=0, total_unread_count=0)
             self.stdout.write(
                 self.style.SUCCESS(f'메일 분류 초기화: {mail_count}개')
             )
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-17 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mails', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mail',
+            name='is_hydrated',
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -30,6 +30,7 @@ class Mail(models.Model):
     # [{"type": "to", "email": "a@test.com", "name": "홍길동"}, {"type": "cc", ...}]
     snippet = models.TextField(blank=True)  # 미리보기 텍스트
     body_html = models.TextField(blank=True)  # HTML 본문
+    is_hydrated = models.BooleanField(default=True)  # 본문/첨부파일 로딩 여부 (metadata 동기화 시 False)
 
     # 첨부파일 메타데이터
     attachments = models.JSONField(default=list)
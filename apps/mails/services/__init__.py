@@ -1,3 +1,5 @@
 from .gmail_client import GmailAPIClient
+from .hydration import MailHydrationService
+from .rate_limiter import GmailRateLimiter, TokenBucket
 
-__all__ = ['GmailAPIClient']
+__all__ = ['GmailAPIClient', 'MailHydrationService', 'GmailRateLimiter', 'TokenBucket']
@@ -2,21 +2,30 @@
 Gmail API 클라이언트
 """
 import base64
-import time
+import json
+import threading
+import uuid
 from datetime import datetime, timedelta
+from email import message_from_bytes
 from email.utils import parseaddr
+from urllib.parse import urlencode
 
 import requests
 from django.conf import settings
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from .rate_limiter import GmailRateLimiter
+
 
 class GmailAPIClient:
     """Gmail API 래퍼 클래스"""
 
     BASE_URL = 'https://gmail.googleapis.com/gmail/v1/users/me'
+    BATCH_URL = 'https://gmail.googleapis.com/batch/gmail/v1'
+    BATCH_PATH_PREFIX = '/gmail/v1/users/me'
     TOKEN_URL = 'https://oauth2.googleapis.com/token'
+    MAX_BATCH_SIZE = 100  # Gmail batch 요청당 최대 하위 요청 수
 
     def __init__(self, user):
         """
@@ -24,6 +33,10 @@ class GmailAPIClient:
             user: User 모델 인스턴스 (gmail_access_token, gmail_refresh_token 필요)
         """
         self.user = user
+        # 여러 스레드가 같은 클라이언트를 공유할 때 토큰 갱신 동기화용
+        self._token_lock = threading.Lock()
+        # 스레드/프로세스 간 공유되는 할당량 제한 (429를 받기 전에 속도 조절)
+        self.rate_limiter = GmailRateLimiter(user.id)
         self._ensure_valid_token()
 
     def _ensure_valid_token(self):
@@ -39,8 +52,20 @@ class GmailAPIClient:
             if timezone.now() > self.user.gmail_token_expires_at - timedelta(minutes=5):
                 self._refresh_token()
 
-    def _refresh_token(self):
-        """액세스 토큰 갱신"""
+    def _refresh_token(self, stale_token: str = None):
+        """
+        액세스 토큰 갱신
+
+        Args:
+            stale_token: 401을 받은 요청에 사용한 토큰. 다른 스레드가 이미 갱신했다면 건너뜁니다.
+        """
+        with self._token_lock:
+            if stale_token and self.user.gmail_access_token != stale_token:
+                return
+            self._refresh_token_locked()
+
+    def _refresh_token_locked(self):
+        """액세스 토큰 갱신 (락 보유 상태에서 호출)"""
         if not self.user.gmail_refresh_token:
             raise ValidationError({
                 'code': 'REFRESH_TOKEN_MISSING',
@@ -79,13 +104,19 @@ class GmailAPIClient:
             'Content-Type': 'application/json',
         }
 
-    def _request(self, method, endpoint, **kwargs):
-        """API 요청 래퍼 (Rate limiting 처리)"""
-        url = f"{self.BASE_URL}{endpoint}"
-        headers = self._get_headers()
+    def _request(self, method, endpoint, quota_units: int, url: str = None, extra_headers: dict = None, **kwargs):
+        """
+        API 요청 래퍼 (Rate limiting 처리)
+
+        Args:
+            quota_units: 요청이 소비하는 Gmail quota unit (GmailRateLimiter.units_for 참고)
+        """
+        url = url or f"{self.BASE_URL}{endpoint}"
+        headers = {**self._get_headers(), **(extra_headers or {})}
 
         max_retries = 3
         for attempt in range(max_retries):
+            self.rate_limiter.acquire(quota_units)
             try:
                 response = requests.request(
                     method,
@@ -99,7 +130,8 @@ class GmailAPIClient:
                 if response.status_code == 429:
                     retry_after = int(response.headers.get('Retry-After', 5))
                     if attempt < max_retries - 1:
-                        time.sleep(retry_after)
+                        # 같은 사용자의 요청을 보내는 모든 스레드/워커가 함께 쉬도록 버킷을 비움
+                        self.rate_limiter.penalize(retry_after)
                         continue
                     raise ValidationError({
                         'code': 'RATE_LIMITED',
@@ -108,8 +140,8 @@ class GmailAPIClient:
 
                 # 401 토큰 만료 처리
                 if response.status_code == 401:
-                    self._refresh_token()
-                    headers = self._get_headers()
+                    self._refresh_token(stale_token=headers['Authorization'].removeprefix('Bearer '))
+                    headers = {**self._get_headers(), **(extra_headers or {})}
                     continue
 
                 response.raise_for_status()
@@ -137,7 +169,7 @@ class GmailAPIClient:
             }
         """
         endpoint = f"/messages/{message_id}/attachments/{attachment_id}"
-        response = self._request('GET', endpoint)
+        response = self._request('GET', endpoint, quota_units=GmailRateLimiter.units_for('messages.attachments.get'))
         return response.json()
 
     def get_attachment_data(self, message_id: str, attachment_id: str) -> bytes:
@@ -179,9 +211,33 @@ class GmailAPIClient:
         if page_token:
             params['pageToken'] = page_token
 
-        response = self._request('GET', '/messages', params=params)
+        response = self._request(
+            'GET', '/messages', quota_units=GmailRateLimiter.units_for('messages.list'), params=params
+        )
         return response.json()
 
+    def iter_messages(self, query: str = None, page_size: int = 500, page_token: str = None):
+        """
+        메시지 목록 전체 페이지를 순차적으로 조회 (제너레이터)
+
+        nextPageToken을 따라가며 한 번에 한 페이지만 메모리에 유지합니다.
+
+        Args:
+            query: Gmail 검색 쿼리 (예: "after:2024/06/01")
+            page_size: 페이지당 최대 결과 수 (최대 500)
+            page_token: 시작 페이지 토큰 (이어서 조회할 때)
+
+        Yields:
+            dict: 페이지 단위 list_messages 응답
+        """
+        while True:
+            result = self.list_messages(query=query, max_results=page_size, page_token=page_token)
+            yield result
+
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
+
     def get_message(self, message_id: str, format: str = 'full') -> dict:
         """
         메시지 상세 조회
@@ -194,16 +250,148 @@ class GmailAPIClient:
             dict: Gmail 메시지 데이터
         """
         params = {'format': format}
-        response = self._request('GET', f'/messages/{message_id}', params=params)
+        response = self._request(
+            'GET', f'/messages/{message_id}', quota_units=GmailRateLimiter.units_for('messages.get'), params=params
+        )
         return response.json()
 
-    def get_history(self, start_history_id: str, history_types: list = None) -> dict:
+    def get_messages_batch(self, message_ids: list, format: str = 'full') -> dict:
+        """
+        메시지 상세 일괄 조회 (Gmail HTTP batch 엔드포인트)
+
+        최대 MAX_BATCH_SIZE개의 messages.get 요청을 하나의 multipart/mixed 요청으로 묶어 보냅니다.
+        429/5xx/401로 실패한 하위 요청만 다시 묶어 재시도합니다.
+
+        Args:
+            message_ids: Gmail 메시지 ID 목록 (MAX_BATCH_SIZE 초과 시 나누어 전송)
+            format: 응답 형식 ('minimal', 'full', 'raw', 'metadata')
+
+        Returns:
+            dict: {
+                'messages': {message_id: Gmail 메시지 데이터, ...},
+                'errors': {message_id: 오류 메시지, ...}
+            }
+        """
+        messages = {}
+        errors = {}
+        remaining = list(dict.fromkeys(message_ids))
+
+        max_retries = 3
+        for attempt in range(max_retries):
+            retry_ids = []
+            stale_token = None  # 하위 요청이 401을 받은 batch에 사용한 토큰
+
+            for i in range(0, len(remaining), self.MAX_BATCH_SIZE):
+                chunk = remaining[i:i + self.MAX_BATCH_SIZE]
+                token = self.user.gmail_access_token
+                for message_id, status_code, body in self._send_batch(chunk, format):
+                    if status_code == 200:
+                        messages[message_id] = json.loads(body)
+                        errors.pop(message_id, None)
+                        continue
+
+                    errors[message_id] = f'HTTP {status_code}: {body[:200]}'
+                    if status_code == 401:
+                        stale_token = token
+                    if status_code in (401, 429) or status_code >= 500:
+                        retry_ids.append(message_id)
+
+            remaining = retry_ids
+            if not remaining or attempt == max_retries - 1:
+                break
+
+            if stale_token:
+                # 다른 스레드가 이미 갱신했다면 다시 갱신하지 않음
+                self._refresh_token(stale_token=stale_token)
+            # 실패한 하위 요청만 지수 백오프 후 재전송
+            self.rate_limiter.penalize(2 ** attempt)
+
+        return {'messages': messages, 'errors': errors}
+
+    def _send_batch(self, message_ids: list, format: str) -> list:
+        """
+        batch 요청 1회 전송
+
+        Returns:
+            list: [(message_id, status_code, body), ...]
+        """
+        boundary = f'batch_{uuid.uuid4().hex}'
+        query = urlencode({'format': format})
+        parts = []
+        for index, message_id in enumerate(message_ids):
+            parts.append(
+                f'--{boundary}\r\n'
+                f'Content-Type: application/http\r\n'
+                f'Content-ID: <item-{index}>\r\n'
+                f'\r\n'
+                f'GET {self.BATCH_PATH_PREFIX}/messages/{message_id}?{query}\r\n'
+                f'\r\n'
+            )
+        body = ''.join(parts) + f'--{boundary}--\r\n'
+
+        # batch 요청은 하위 요청마다 quota가 차감됨
+        response = self._request(
+            'POST', None,
+            quota_units=GmailRateLimiter.units_for('messages.get', len(message_ids)),
+            url=self.BATCH_URL,
+            extra_headers={'Content-Type': f'multipart/mixed; boundary={boundary}'},
+            data=body.encode('utf-8'),
+        )
+
+        results = []
+        for index, status_code, part_body in self._parse_batch_response(response):
+            if index is None or not 0 <= index < len(message_ids):
+                continue
+            results.append((message_ids[index], status_code, part_body))
+
+        # 응답에서 누락된 하위 요청은 재시도 대상(503)으로 처리
+        answered = {message_id for message_id, _, _ in results}
+        results.extend((mid, 503, 'missing from batch response') for mid in message_ids if mid not in answered)
+        return results
+
+    def _parse_batch_response(self, response) -> list:
+        """
+        multipart/mixed batch 응답 파싱
+
+        Returns:
+            list: [(요청 인덱스, status_code, body), ...]
+        """
+        content_type = response.headers.get('Content-Type', '')
+        envelope = message_from_bytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8') + response.content
+        )
+        if not envelope.is_multipart():
+            raise ValidationError({
+                'code': 'GMAIL_API_ERROR',
+                'message': 'Gmail batch 응답 형식이 올바르지 않습니다.'
+            })
+
+        results = []
+        for part in envelope.get_payload():
+            content_id = (part.get('Content-ID') or '').strip('<> ')
+            index = None
+            if content_id.rsplit('-', 1)[-1].isdigit():
+                index = int(content_id.rsplit('-', 1)[-1])
+
+            payload = part.get_payload(decode=True) or b''
+            payload = payload.decode('utf-8', errors='replace').replace('\r\n', '\n')
+            head, _, part_body = payload.partition('\n\n')
+            status_line = head.split('\n', 1)[0].split()
+            status_code = int(status_line[1]) if len(status_line) > 1 and status_line[1].isdigit() else 500
+            results.append((index, status_code, part_body.strip()))
+
+        return results
+
+    def get_history(self, start_history_id: str, history_types: list = None,
+                    page_token: str = None, max_results: int = 500) -> dict:
         """
         변경 이력 조회 (증분 동기화용)
 
         Args:
             start_history_id: 시작 이력 ID
             history_types: 조회할 이력 유형 ('messageAdded', 'messageDeleted', 등)
+            page_token: 페이지네이션 토큰
+            max_results: 페이지당 최대 이력 수 (최대 500)
 
         Returns:
             dict: {
@@ -212,13 +400,46 @@ class GmailAPIClient:
                 'nextPageToken': str (optional)
             }
         """
-        params = {'startHistoryId': start_history_id}
+        params = {'startHistoryId': start_history_id, 'maxResults': max_results}
         if history_types:
             params['historyTypes'] = history_types
+        if page_token:
+            params['pageToken'] = page_token
 
-        response = self._request('GET', '/history', params=params)
+        response = self._request(
+            'GET', '/history', quota_units=GmailRateLimiter.units_for('history.list'), params=params
+        )
         return response.json()
 
+    def iter_history(self, start_history_id: str, history_types: list = None, max_results: int = 500,
+                     page_token: str = None):
+        """
+        변경 이력 전체 페이지를 순차적으로 조회 (제너레이터)
+
+        nextPageToken을 따라가며 한 번에 한 페이지만 메모리에 유지합니다.
+
+        Args:
+            start_history_id: 시작 이력 ID
+            history_types: 조회할 이력 유형 ('messageAdded', 'messageDeleted', 등)
+            max_results: 페이지당 최대 이력 수 (최대 500)
+            page_token: 시작 페이지 토큰 (이어서 조회할 때)
+
+        Yields:
+            dict: 페이지 단위 get_history 응답
+        """
+        while True:
+            result = self.get_history(
+                start_history_id,
+                history_types=history_types,
+                page_token=page_token,
+                max_results=max_results,
+            )
+            yield result
+
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
+
     def get_profile(self) -> dict:
         """
         Gmail 프로필 조회 (historyId 포함)
@@ -231,7 +452,7 @@ class GmailAPIClient:
                 'historyId': str
             }
         """
-        response = self._request('GET', '/profile')
+        response = self._request('GET', '/profile', quota_units=GmailRateLimiter.units_for('getProfile'))
         return response.json()
 
     def parse_message(self, message: dict) -> dict:
@@ -270,6 +491,11 @@ class GmailAPIClient:
 
         # 첨부파일 메타데이터 추출
         attachments = self._extract_attachments(message.get('payload', {}))
+        has_attachments = len(attachments) > 0
+        payload = message.get('payload', {})
+        if 'parts' not in payload and payload.get('mimeType') == 'multipart/mixed':
+            # metadata 형식은 파트 정보가 없으므로 최상위 MIME 타입으로 첨부 여부 추정
+            has_attachments = True
 
         # 수신 시간 파싱 (internalDate는 밀리초 단위)
         internal_date = int(message.get('internalDate', 0))
@@ -288,7 +514,7 @@ class GmailAPIClient:
             'snippet': message.get('snippet', ''),
             'body_html': body_html or body_text or '',
             'attachments': attachments,
-            'has_attachments': len(attachments) > 0,
+            'has_attachments': has_attachments,
             'is_read': 'UNREAD' not in message.get('labelIds', []),
             'is_starred': 'STARRED' in message.get('labelIds', []),
             'received_at': received_at,
@@ -0,0 +1,71 @@
+"""
+메일 본문 지연 로딩 서비스
+"""
+import logging
+
+from django.utils import timezone
+
+from ..models import Mail
+from .gmail_client import GmailAPIClient
+
+logger = logging.getLogger(__name__)
+
+
+class MailHydrationService:
+    """metadata로만 동기화된 메일의 본문/첨부파일을 필요할 때 채워 넣는 서비스"""
+
+    HYDRATE_FIELDS = ['body_html', 'attachments', 'has_attachments', 'is_hydrated', 'updated_at']
+
+    def __init__(self, user, gmail_client: GmailAPIClient = None):
+        self.user = user
+        self.gmail_client = gmail_client or GmailAPIClient(user)
+
+    def hydrate(self, mails: list) -> int:
+        """
+        메일 본문/첨부파일 로딩 (Gmail batch 요청으로 일괄 조회)
+
+        Args:
+            mails: Mail 인스턴스 목록 (is_hydrated=False인 메일만 처리)
+
+        Returns:
+            int: 로딩된 메일 수
+        """
+        pending = {mail.gmail_id: mail for mail in mails if not mail.is_hydrated}
+        if not pending:
+            return 0
+
+        result = self.gmail_client.get_messages_batch(list(pending), format='full')
+        for gmail_id, error in result['errors'].items():
+            logger.warning(f"Failed to hydrate message {gmail_id}: {error}")
+
+        now = timezone.now()
+        hydrated = []
+        for gmail_id, raw_message in result['messages'].items():
+            parsed = self.gmail_client.parse_message(raw_message)
+            mail = pending[gmail_id]
+            mail.body_html = parsed['body_html']
+            mail.attachments = parsed['attachments']
+            mail.has_attachments = parsed['has_attachments']
+            mail.is_hydrated = True
+            mail.updated_at = now
+            hydrated.append(mail)
+
+        if hydrated:
+            Mail.objects.bulk_update(hydrated, self.HYDRATE_FIELDS)
+        return len(hydrated)
+
+    def hydrate_recent(self, limit: int) -> int:
+        """
+        최근 수신한 메일 중 본문이 없는 메일을 미리 로딩
+
+        Args:
+            limit: 최대 로딩 수
+
+        Returns:
+            int: 로딩된 메일 수
+        """
+        mails = list(
+            Mail.objects.filter(user=self.user, is_hydrated=False, is_deleted=False)
+            .order_by('-received_at')[:limit]
+        )
+        return self.hydrate(mails)
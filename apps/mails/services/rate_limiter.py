@@ -0,0 +1,209 @@
+"""
+Gmail API 요청 속도 제한
+
+Gmail API 할당량(quota unit) 기준 토큰 버킷으로 요청 속도를 조절합니다.
+버킷 상태는 작업 상태 저장소(JOB_STATE_BACKEND)에 보관되어 스레드/프로세스 간에 공유됩니다.
+사용자 버킷과 프로젝트 버킷 모두 프로세스 단위로 토큰을 묶어서 임대해, 요청마다 저장소 잠금을 잡지 않습니다.
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from apps.jobs.services import get_state_store
+
+
+class TokenBucket:
+    """
+    공유 저장소 기반 토큰 버킷
+
+    acquire()는 토큰을 먼저 차감(부족하면 음수까지 예약)하고 기다려야 할 시간을 반환합니다.
+    대기는 잠금 밖에서 하므로 여러 요청이 도착 순서대로 속도에 맞춰 분산됩니다.
+    """
+
+    # 이 시간 동안 쓰지 않은 버킷은 만료 (다시 가득 찬 것과 같으므로 저장소 정리 시 삭제해도 됨)
+    IDLE_TTL = 60 * 60
+
+    def __init__(self, key: str, rate: float, capacity: float):
+        """
+        Args:
+            key: 저장소 키
+            rate: 초당 충전되는 토큰 수
+            capacity: 최대 보유 토큰 수 (순간 허용량)
+        """
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+
+    def _refill(self, data: dict) -> tuple:
+        """
+        경과 시간만큼 충전한 토큰 수 계산 (저장소 잠금 안에서 호출)
+
+        Returns:
+            tuple: (토큰 수, 현재 시각)
+        """
+        # 잠금을 기다린 시간이 이중으로 충전되지 않도록 시각은 잠금을 잡은 뒤에 읽음
+        now = time.time()
+        if not data:
+            return self.capacity, now
+        now = max(now, data['updated_at'])
+        return min(self.capacity, data['tokens'] + (now - data['updated_at']) * self.rate), now
+
+    def acquire(self, units: float) -> float:
+        """
+        토큰 차감
+
+        Returns:
+            float: 요청 전 기다려야 하는 시간 (초)
+        """
+        def apply(data):
+            tokens, now = self._refill(data)
+            return {'tokens': tokens - units, 'updated_at': now}
+
+        data = get_state_store().mutate(self.key, apply, ttl=self.IDLE_TTL)
+        return max(0.0, -data['tokens'] / self.rate)
+
+    def drain(self, seconds: float):
+        """
+        지정한 시간 동안 토큰이 충전되지 않도록 비움 (429 응답 시 모든 워커가 함께 대기)
+        """
+        def apply(data):
+            tokens, now = self._refill(data)
+            return {'tokens': min(tokens, -seconds * self.rate), 'updated_at': now}
+
+        get_state_store().mutate(self.key, apply, ttl=self.IDLE_TTL)
+
+
+class LeasedTokenBucket:
+    """
+    공유 버킷의 토큰을 묶음으로 미리 차감(임대)해 두고 프로세스 안에서 나눠 쓰는 버킷
+
+    요청마다 저장소 잠금(DB 백엔드에서는 SELECT ... FOR UPDATE, SQLite에서는 DB 전체 쓰기 잠금)을 잡으면
+    같은 키를 쓰는 요청이 모두 줄을 서고 메일 저장 트랜잭션과도 경합하므로,
+    lease_seconds 분량을 한 번에 임대하고 다 쓰면 다시 임대합니다.
+    LEASE_TTL 동안 쓰지 않은 임대분은 버려 오래된 예약으로 순간 속도가 한도를 넘지 않게 합니다.
+    """
+
+    LEASE_SECONDS = 0.1  # 한 번에 임대하는 양 기본값 (초당 충전량 기준 시간)
+    LEASE_TTL = 10.0  # 임대분 유효 시간 (초)
+
+    def __init__(self, bucket: TokenBucket, lease_seconds: float = None):
+        """
+        Args:
+            bucket: 공유 버킷
+            lease_seconds: 한 번에 임대하는 양 (초당 충전량 기준 시간, 기본값 LEASE_SECONDS)
+        """
+        self.bucket = bucket
+        self.lease_seconds = lease_seconds or self.LEASE_SECONDS
+        self._tokens = 0.0
+        self._leased_at = 0.0
+        self._ready_at = 0.0  # 임대분을 쓸 수 있는 시각 (monotonic)
+        self._lock = threading.Lock()
+
+    def acquire(self, units: float) -> float:
+        """
+        토큰 차감 (임대분이 부족할 때만 공유 버킷에 접근)
+
+        Returns:
+            float: 요청 전 기다려야 하는 시간 (초)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now - self._leased_at > self.LEASE_TTL:
+                self._tokens = 0.0
+            if self._tokens < units:
+                lease = max(units - self._tokens, self.bucket.rate * self.lease_seconds)
+                delay = self.bucket.acquire(lease)
+                self._tokens += lease
+                self._leased_at = now
+                self._ready_at = max(self._ready_at, now + delay)
+            self._tokens -= units
+            return max(0.0, self._ready_at - now)
+
+    def drain(self, seconds: float):
+        """남은 임대분을 버리고 공유 버킷을 비움 (429 응답 시)"""
+        with self._lock:
+            self._tokens = 0.0
+            self.bucket.drain(seconds)
+
+    def is_idle(self) -> bool:
+        """임대분이 만료되어 버려도 되는 상태인지"""
+        return time.monotonic() - self._leased_at > self.LEASE_TTL
+
+
+_leased_buckets = {}
+_leased_buckets_lock = threading.Lock()
+
+
+def get_leased_bucket(key: str, rate: float, capacity: float, lease_seconds: float = None) -> LeasedTokenBucket:
+    """
+    프로세스 공용 임대 버킷 (같은 키를 쓰는 프로세스 안의 모든 스레드가 임대분을 함께 사용)
+
+    새 버킷을 만들 때 오래 쓰지 않은 버킷을 정리해 사용자 수만큼 계속 쌓이지 않게 합니다.
+    """
+    with _leased_buckets_lock:
+        leased = _leased_buckets.get(key)
+        if leased is not None and (leased.bucket.rate, leased.bucket.capacity) == (rate, capacity):
+            return leased
+        for idle_key in [k for k, bucket in _leased_buckets.items() if bucket.is_idle()]:
+            del _leased_buckets[idle_key]
+        leased = _leased_buckets[key] = LeasedTokenBucket(TokenBucket(key, rate, capacity), lease_seconds)
+        return leased
+
+
+class GmailRateLimiter:
+    """
+    Gmail API 할당량 제한기 (사용자별 버킷 + 프로젝트 전체 버킷)
+
+    Gmail 기본 할당량: 사용자당 250 unit/초, 프로젝트당 1,200,000 unit/분
+
+    사용자 버킷은 한 번에 USER_LEASE_SECONDS, 프로젝트 버킷은 PROJECT_LEASE_SECONDS 분량을 임대하므로
+    저장소 접근은 임대분이 떨어졌을 때만 일어납니다 (messages.get 1건씩이면 사용자 버킷은 50건마다 1번).
+    """
+
+    USER_LEASE_SECONDS = 1.0  # 사용자 작업은 한 번에 하나라 임대분을 다른 프로세스와 나눌 일이 거의 없음
+    PROJECT_LEASE_SECONDS = 0.1  # 여러 프로세스가 나눠 쓰므로 작게 임대
+
+    # API 메서드별 quota unit (https://developers.google.com/gmail/api/reference/quota)
+    QUOTA_UNITS = {
+        'messages.get': 5,
+        'messages.list': 5,
+        'messages.attachments.get': 5,
+        'history.list': 2,
+        'getProfile': 1,
+    }
+
+    def __init__(self, user_id: int):
+        burst_seconds = getattr(settings, 'GMAIL_QUOTA_BURST_SECONDS', 1)
+        user_rate = getattr(settings, 'GMAIL_QUOTA_USER_UNITS_PER_SECOND', 250)
+        project_rate = getattr(settings, 'GMAIL_QUOTA_PROJECT_UNITS_PER_SECOND', 20000)
+
+        self.user_bucket = None
+        self.project_bucket = None
+        if user_rate:
+            self.user_bucket = get_leased_bucket(
+                f'gmail_quota:user:{user_id}', user_rate, user_rate * burst_seconds, self.USER_LEASE_SECONDS
+            )
+        if project_rate:
+            self.project_bucket = get_leased_bucket(
+                'gmail_quota:project', project_rate, project_rate * burst_seconds, self.PROJECT_LEASE_SECONDS
+            )
+
+    @classmethod
+    def units_for(cls, method: str, count: int = 1) -> int:
+        """API 메서드 호출 count회의 quota unit"""
+        return cls.QUOTA_UNITS[method] * count
+
+    def acquire(self, units: int):
+        """할당량 안에서 요청할 수 있을 때까지 대기 (두 버킷 모두 임대분이 남아 있으면 저장소에 접근하지 않음)"""
+        delay = 0.0
+        for bucket in (self.user_bucket, self.project_bucket):
+            if bucket:
+                delay = max(delay, bucket.acquire(units))
+        if delay > 0:
+            time.sleep(delay)
+
+    def penalize(self, seconds: float):
+        """429 응답 시 해당 사용자의 모든 요청을 지정한 시간 동안 멈춤"""
+        if self.user_bucket:
+            self.user_bucket.drain(seconds)
@@ -1,6 +1,9 @@
 """메일 상태 변경 시 폴더 카운트 자동 동기화"""
 from collections import defaultdict
 
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
@@ -8,16 +11,10 @@ from .models import Mail
 
 
 def update_folder_counts(folder, mail_delta=0, unread_delta=0):
-    """폴더의 mail_count와 unread_count를 업데이트"""
+    """폴더의 mail_count와 unread_count, 상위 폴더까지의 누적 카운트를 업데이트"""
     if folder is None:
         return
-
-    if mail_delta != 0:
-        folder.mail_count = max(0, folder.mail_count + mail_delta)
-    if unread_delta != 0:
-        folder.unread_count = max(0, folder.unread_count + unread_delta)
-
-    folder.save(update_fields=['mail_count', 'unread_count'])
+    apply_folder_count_deltas({folder.id: {'mail': mail_delta, 'unread': unread_delta}})
 
 
 @receiver(pre_save, sender=Mail)
@@ -117,13 +114,74 @@ def mail_post_delete(sender, instance, **kwargs):
 # Bulk 연산 헬퍼 함수
 # =====================
 
+def apply_folder_count_deltas(folder_deltas):
+    """
+    폴더별 카운트 변화량을 F() 표현식으로 일괄 반영
+    같은 변화량을 가진 폴더는 하나의 UPDATE로 묶어 처리
+    누적 카운트는 각 폴더와 모든 상위 폴더(path 앞부분)에 반영
+
+    카운트는 0 아래로 내려가지 않도록 잘라내며, 누적 카운트에도 잘라낸 뒤 실제로 반영된 변화량만 더해
+    폴더 카운트와 상위 폴더들의 누적 카운트가 어긋나지 않게 합니다.
+
+    Args:
+        folder_deltas: {folder_id: {'mail': int, 'unread': int}}
+    """
+    from apps.folders.models import Folder
+
+    changes = {}
+    for folder_id, deltas in folder_deltas.items():
+        key = (deltas.get('mail', 0), deltas.get('unread', 0))
+        if folder_id is not None and key != (0, 0):
+            changes[folder_id] = key
+    if not changes:
+        return
+
+    with transaction.atomic():
+        # 현재 카운트를 잠그고 읽어 0 아래로 잘린 만큼을 뺀 실제 변화량 계산
+        applied = {}  # folder_id -> (user_id, path, 메일 변화량, 안읽음 변화량)
+        rows = (
+            Folder.objects.select_for_update()
+            .filter(id__in=changes)
+            .order_by('id')
+            .values_list('id', 'user_id', 'path', 'mail_count', 'unread_count')
+        )
+        for folder_id, user_id, path, mail_count, unread_count in rows:
+            mail_delta, unread_delta = changes[folder_id]
+            mail_delta = max(mail_count + mail_delta, 0) - mail_count
+            unread_delta = max(unread_count + unread_delta, 0) - unread_count
+            if (mail_delta, unread_delta) != (0, 0):
+                applied[folder_id] = (user_id, path, mail_delta, unread_delta)
+
+        grouped = defaultdict(list)
+        for folder_id, (_, _, mail_delta, unread_delta) in applied.items():
+            grouped[(mail_delta, unread_delta)].append(folder_id)
+
+        for (mail_delta, unread_delta), folder_ids in grouped.items():
+            Folder.objects.filter(id__in=folder_ids).update(
+                mail_count=Greatest(F('mail_count') + mail_delta, 0),
+                unread_count=Greatest(F('unread_count') + unread_delta, 0),
+            )
+
+        # 상위 경로별로 변화량을 합산한 뒤, 같은 변화량끼리 묶어 누적 카운트 반영
+        totals = defaultdict(lambda: [0, 0])  # (user_id, path) -> [메일, 안읽음]
+        for user_id, path, mail_delta, unread_delta in applied.values():
+            for ancestor_path in Folder.path_with_ancestors(path):
+                totals[(user_id, ancestor_path)][0] += mail_delta
+                totals[(user_id, ancestor_path)][1] += unread_delta
+
+        grouped_totals = defaultdict(list)
+        for (user_id, path), (mail_delta, unread_delta) in totals.items():
+            grouped_totals[(user_id, mail_delta, unread_delta)].append(path)
+
+        for (user_id, mail_delta, unread_delta), paths in grouped_totals.items():
+            Folder.objects.add_to_totals(user_id, paths, mail_delta, unread_delta)
+
+
 def bulk_move_update_counts(mails_queryset, target_folder):
     """
     bulk_move 시 폴더 카운트 업데이트
     QuerySet.update()는 signals를 트리거하지 않으므로 직접 처리
     """
-    from apps.folders.models import Folder
-
     # 원본 폴더별 카운트 계산
     source_deltas = defaultdict(lambda: {'mail': 0, 'unread': 0})
 
@@ -140,22 +198,13 @@ def bulk_move_update_counts(mails_queryset, target_folder):
                 source_deltas[target_folder.id]['unread'] += 1
 
     # 폴더 카운트 업데이트
-    for folder_id, deltas in source_deltas.items():
-        try:
-            folder = Folder.objects.get(id=folder_id)
-            folder.mail_count = max(0, folder.mail_count + deltas['mail'])
-            folder.unread_count = max(0, folder.unread_count + deltas['unread'])
-            folder.save(update_fields=['mail_count', 'unread_count'])
-        except Folder.DoesNotExist:
-            pass
+    apply_folder_count_deltas(source_deltas)
 
 
 def bulk_read_update_counts(mails_queryset, new_is_read):
     """
     bulk_update로 is_read 변경 시 폴더 카운트 업데이트
     """
-    from apps.folders.models import Folder
-
     # 폴더별 unread 변경량 계산
     folder_deltas = defaultdict(int)
 
@@ -166,10 +215,7 @@ def bulk_read_update_counts(mails_queryset, new_is_read):
             folder_deltas[mail.folder.id] += delta
 
     # 폴더 카운트 업데이트
-    for folder_id, delta in folder_deltas.items():
-        try:
-            folder = Folder.objects.get(id=folder_id)
-            folder.unread_count = max(0, folder.unread_count + delta)
-            folder.save(update_fields=['unread_count'])
-        except Folder.DoesNotExist:
-            pass
+    apply_folder_count_deltas({
+        folder_id: {'mail': 0, 'unread': delta}
+        for folder_id, delta in folder_deltas.items()
+    })
@@ -0,0 +1,89 @@
+import json
+import re
+from unittest import mock
+
+import requests
+from cryptography.fernet import Fernet
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.mails.services import GmailAPIClient
+
+
+def batch_response(parts: list) -> requests.Response:
+    """
+    Gmail batch 응답 생성
+
+    Args:
+        parts: [(요청 인덱스, status_code, reason, body), ...]
+    """
+    boundary = 'batch_test'
+    chunks = []
+    for index, status_code, reason, body in parts:
+        chunks.append(
+            f'--{boundary}\r\n'
+            f'Content-Type: application/http\r\n'
+            f'Content-ID: <response-item-{index}>\r\n'
+            f'\r\n'
+            f'HTTP/1.1 {status_code} {reason}\r\n'
+            f'Content-Type: application/json; charset=UTF-8\r\n'
+            f'\r\n'
+            f'{json.dumps(body)}\r\n'
+        )
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = f'multipart/mixed; boundary={boundary}'
+    response._content = (''.join(chunks) + f'--{boundary}--\r\n').encode('utf-8')
+    return response
+
+
+def requested_ids(call) -> list:
+    """batch 요청 본문에 담긴 메시지 ID 목록 (요청 순서)"""
+    return re.findall(r'/messages/([^?\s]+)\?', call.kwargs['data'].decode('utf-8'))
+
+
+@override_settings(TOKEN_ENCRYPTION_KEY=Fernet.generate_key().decode())
+class GetMessagesBatchTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='batch', email='batch@example.com', password='unused',
+        )
+        self.user.gmail_access_token = 'old-token'
+        self.user.gmail_refresh_token = 'refresh-token'
+        self.user.save()
+
+        self.client = GmailAPIClient(self.user)
+        self.client.rate_limiter = mock.Mock()
+
+    def test_retries_only_failed_sub_requests(self):
+        first = batch_response([
+            (0, 200, 'OK', {'id': 'm1'}),
+            (1, 401, 'Unauthorized', {'error': {'code': 401}}),
+            (2, 429, 'Too Many Requests', {'error': {'code': 429}}),
+            (3, 404, 'Not Found', {'error': {'code': 404}}),
+        ])
+        second = batch_response([
+            (0, 200, 'OK', {'id': 'm2'}),
+            (1, 200, 'OK', {'id': 'm3'}),
+        ])
+
+        def refresh(stale_token=None):
+            self.user.gmail_access_token = 'new-token'
+
+        with mock.patch('apps.mails.services.gmail_client.requests.request', side_effect=[first, second]) as request, \
+                mock.patch.object(self.client, '_refresh_token', side_effect=refresh) as refresh_token:
+            result = self.client.get_messages_batch(['m1', 'm2', 'm3', 'm4'], format='metadata')
+
+        self.assertEqual(set(result['messages']), {'m1', 'm2', 'm3'})
+        self.assertEqual(result['messages']['m2'], {'id': 'm2'})
+        self.assertEqual(set(result['errors']), {'m4'})
+        self.assertTrue(result['errors']['m4'].startswith('HTTP 404'))
+
+        # 401/429를 받은 하위 요청만 다시 전송하고, 404는 재시도하지 않음
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual(requested_ids(request.call_args_list[0]), ['m1', 'm2', 'm3', 'm4'])
+        self.assertEqual(requested_ids(request.call_args_list[1]), ['m2', 'm3'])
+
+        # 401을 받은 batch에 사용한 토큰으로 갱신하고, 재시도는 새 토큰으로 전송
+        refresh_token.assert_called_once_with(stale_token='old-token')
+        self.assertEqual(request.call_args_list[1].kwargs['headers']['Authorization'], 'Bearer new-token')
@@ -0,0 +1,154 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.jobs.services import MemoryStateStore
+from apps.mails.services import rate_limiter
+from apps.mails.services.rate_limiter import GmailRateLimiter, LeasedTokenBucket, TokenBucket
+
+
+class FakeClock:
+    """rate_limiter 모듈의 time 대역 (sleep은 기다리지 않고 시각만 진행)"""
+
+    EPOCH = 1_700_000_000.0
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def time(self):
+        return self.EPOCH + self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class RateLimiterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = MemoryStateStore()
+        self.mutate = mock.Mock(wraps=self.store.mutate)
+        self.store.mutate = self.mutate
+        for patcher in (
+            mock.patch.object(rate_limiter, 'time', self.clock),
+            mock.patch('apps.jobs.services.state_store._store', self.store),
+            mock.patch.dict(rate_limiter._leased_buckets, clear=True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tokens(self, key: str) -> float:
+        return self.store.get(key)['tokens']
+
+
+class TokenBucketTests(RateLimiterTestCase):
+    def test_refill_is_capped_at_capacity(self):
+        bucket = TokenBucket('bucket', rate=10, capacity=20)
+        self.assertEqual(bucket.acquire(20), 0.0)
+
+        self.clock.advance(1)
+        self.assertEqual(bucket.acquire(10), 0.0)
+        self.assertAlmostEqual(self.tokens('bucket'), 0.0)
+
+        self.clock.advance(100)
+        bucket.acquire(0)
+        self.assertAlmostEqual(self.tokens('bucket'), 20.0)
+
+    def test_acquire_reserves_below_zero_and_returns_wait(self):
+        bucket = TokenBucket('bucket', rate=10, capacity=10)
+        self.assertEqual(bucket.acquire(10), 0.0)
+        self.assertAlmostEqual(bucket.acquire(5), 0.5)
+        self.assertAlmostEqual(bucket.acquire(5), 1.0)
+
+        # 1초 동안 10개가 충전되어 -10 -> 0, 다음 요청은 다시 0.5초 대기
+        self.clock.advance(1)
+        self.assertAlmostEqual(bucket.acquire(5), 0.5)
+
+    def test_drain_blocks_for_given_seconds(self):
+        bucket = TokenBucket('bucket', rate=10, capacity=10)
+        bucket.drain(3)
+        self.assertAlmostEqual(bucket.acquire(1), 3.1)
+
+
+class LeasedTokenBucketTests(RateLimiterTestCase):
+    def setUp(self):
+        super().setUp()
+        # 임대 1회 = 100 * 0.1 = 10개
+        self.leased = LeasedTokenBucket(TokenBucket('leased', rate=100, capacity=100), lease_seconds=0.1)
+
+    def test_lease_is_spent_locally_until_exhausted(self):
+        for _ in range(3):
+            self.assertEqual(self.leased.acquire(3), 0.0)
+        self.assertEqual(self.mutate.call_count, 1)
+        self.assertAlmostEqual(self.tokens('leased'), 90.0)
+
+        # 남은 1개로 부족하면 다시 10개를 임대하고 남은 8개로 두 번 더 처리
+        for _ in range(3):
+            self.leased.acquire(3)
+        self.assertEqual(self.mutate.call_count, 2)
+        self.assertAlmostEqual(self.tokens('leased'), 80.0)
+
+    def test_large_request_leases_only_what_is_missing(self):
+        self.leased.acquire(4)
+        self.leased.acquire(50)
+        self.assertAlmostEqual(self.tokens('leased'), 100 - 10 - 44)
+
+    def test_unused_lease_expires(self):
+        self.leased.acquire(1)
+        self.clock.advance(LeasedTokenBucket.LEASE_TTL + 1)
+        self.leased.acquire(1)
+        self.assertEqual(self.mutate.call_count, 2)
+
+    def test_wait_applies_to_whole_lease_reserved_in_deficit(self):
+        self.leased.acquire(100)
+        self.assertAlmostEqual(self.leased.acquire(5), 0.1)
+        self.assertAlmostEqual(self.leased.acquire(5), 0.1)
+        self.assertEqual(self.mutate.call_count, 2)
+
+        self.clock.advance(0.05)
+        self.assertAlmostEqual(self.leased.acquire(0), 0.05)
+
+    def test_drain_discards_local_lease(self):
+        self.leased.acquire(1)
+        self.leased.drain(2)
+        self.assertAlmostEqual(self.leased.acquire(1), 2.1)
+
+
+@override_settings(
+    GMAIL_QUOTA_USER_UNITS_PER_SECOND=250,
+    GMAIL_QUOTA_PROJECT_UNITS_PER_SECOND=20000,
+    GMAIL_QUOTA_BURST_SECONDS=1,
+)
+class GmailRateLimiterTests(RateLimiterTestCase):
+    def test_store_is_touched_once_per_lease(self):
+        limiter = GmailRateLimiter(user_id=1)
+        units = GmailRateLimiter.units_for('messages.get')
+
+        # 사용자 임대 250 unit = messages.get 50건, 프로젝트 임대 2000 unit
+        for _ in range(50):
+            limiter.acquire(units)
+        self.assertEqual(self.mutate.call_count, 2)
+        self.assertEqual(self.clock.slept, [])
+
+        limiter.acquire(units)
+        self.assertEqual(self.mutate.call_count, 3)
+        self.assertAlmostEqual(self.clock.slept[0], 1.0)
+
+    def test_penalize_pauses_the_user(self):
+        limiter = GmailRateLimiter(user_id=1)
+        limiter.acquire(5)
+        limiter.penalize(2)
+        limiter.acquire(5)
+        self.assertGreaterEqual(sum(self.clock.slept), 2.0)
+
+    def test_limiters_in_one_process_share_the_lease(self):
+        GmailRateLimiter(user_id=1).acquire(5)
+        GmailRateLimiter(user_id=1).acquire(5)
+        self.assertEqual(self.mutate.call_count, 2)
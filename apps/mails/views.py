@@ -1,3 +1,5 @@
+import logging
+
 from django.db import models
 from django.http import HttpResponse
 from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
@@ -6,13 +8,16 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.classifier.services import SenderRuleService
 from apps.folders.models import Folder
 
 from .models import Mail
 from .serializers import MailDetailSerializer, MailListSerializer, MailUpdateSerializer
-from .services import GmailAPIClient
+from .services import GmailAPIClient, MailHydrationService
 from .signals import bulk_move_update_counts, bulk_read_update_counts
 
+logger = logging.getLogger(__name__)
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -22,7 +27,7 @@ from .signals import bulk_move_update_counts, bulk_read_update_counts
     ),
     retrieve=extend_schema(
         summary='메일 상세 조회',
-        description='메일 상세 내용을 조회합니다. 조회 시 자동으로 읽음 처리됩니다.',
+        description='메일 상세 내용을 조회합니다. 조회 시 자동으로 읽음 처리되며, 본문이 아직 없으면 Gmail에서 불러옵니다.',
         tags=['메일']
     ),
     partial_update=extend_schema(
@@ -49,14 +54,8 @@ class MailViewSet(viewsets.ModelViewSet):
         if folder_id:
             try:
                 folder = Folder.objects.get(id=folder_id, user=self.request.user)
-                # 해당 폴더와 모든 자손 폴더의 메일 포함
-                # path가 정확히 일치하거나, path/로 시작하는 자손 폴더
-                descendant_folders = Folder.objects.filter(
-                    user=self.request.user
-                ).filter(
-                    models.Q(path=folder.path) | models.Q(path__startswith=f"{folder.path}/")
-                ).values_list('id', flat=True)
-                queryset = queryset.filter(folder_id__in=list(descendant_folders))
+                # 해당 폴더와 모든 자손 폴더의 메일 포함 (자손 폴더는 하위 쿼리로 메일 조회와 함께 실행)
+                queryset = queryset.filter(folder_id__in=Folder.objects.subtree(folder).values('id'))
             except Folder.DoesNotExist:
                 queryset = queryset.filter(folder_id=folder_id)
 
@@ -111,8 +110,18 @@ class MailViewSet(viewsets.ModelViewSet):
             'data': {'mails': serializer.data}
         })
 
+    def _ensure_hydrated(self, mail):
+        """metadata로만 동기화된 메일이면 본문/첨부파일 로딩"""
+        if mail.is_hydrated:
+            return
+        try:
+            MailHydrationService(self.request.user).hydrate([mail])
+        except Exception as e:
+            logger.warning(f"Failed to hydrate mail {mail.id}: {e}")
+
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
+        self._ensure_hydrated(instance)
 
         # 자동 읽음 처리
         if not instance.is_read:
@@ -184,6 +193,10 @@ class MailViewSet(viewsets.ModelViewSet):
 
         mail.save(update_fields=['folder'])
 
+        # 사용자가 직접 지정한 폴더를 발신자 규칙에 반영
+        if mail.folder:
+            SenderRuleService(request.user).learn([(mail.sender_email, mail.folder.id)], manual=True)
+
         return Response({
             'status': 'success',
             'data': {
@@ -237,10 +250,16 @@ class MailViewSet(viewsets.ModelViewSet):
             user=request.user
         )
         bulk_move_update_counts(mails_queryset, folder)
+        sender_emails = list(mails_queryset.values_list('sender_email', flat=True))
 
         # 메일 이동
         updated_count = mails_queryset.update(folder=folder)
 
+        # 사용자가 직접 지정한 폴더를 발신자 규칙에 반영
+        SenderRuleService(request.user).learn(
+            [(sender_email, folder.id) for sender_email in sender_emails], manual=True
+        )
+
         return Response({
             'status': 'success',
             'data': {
@@ -332,6 +351,7 @@ class MailViewSet(viewsets.ModelViewSet):
     def attachment(self, request, pk=None, attachment_id=None):
         """첨부파일 다운로드"""
         mail = self.get_object()
+        self._ensure_hydrated(mail)
 
         # 첨부파일 메타데이터 확인
         attachment_meta = None
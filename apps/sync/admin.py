@@ -1,2 +1,27 @@
+from django.contrib import admin
 
-# Register your models here.
+from .models import SyncFailure, SyncJob
+
+
+class SyncFailureInline(admin.TabularInline):
+    model = SyncFailure
+    extra = 0
+    readonly_fields = ['gmail_id', 'error', 'created_at']
+
+
+@admin.register(SyncJob)
+class SyncJobAdmin(admin.ModelAdmin):
+    list_display = ['sync_id', 'user', 'sync_type', 'state', 'synced', 'failed', 'total', 'started_at', 'updated_at']
+    list_filter = ['sync_type', 'state']
+    search_fields = ['sync_id', 'user__email']
+    ordering = ['-started_at']
+    inlines = [SyncFailureInline]
+
+    fieldsets = (
+        (None, {'fields': ('user', 'sync_id', 'sync_type', 'state', 'error')}),
+        ('재개 조건', {'fields': ('query', 'start_history_id', 'page_token', 'processed_count')}),
+        ('진행률', {'fields': ('total', 'synced', 'failed')}),
+        ('시간', {'fields': ('started_at', 'completed_at', 'updated_at')}),
+    )
+
+    readonly_fields = ['updated_at']
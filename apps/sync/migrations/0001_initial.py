@@ -0,0 +1,68 @@
+# Generated by Django 5.0.14 on 2026-10-17 06:32
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sync_id', models.CharField(max_length=20, unique=True)),
+                ('sync_type', models.CharField(choices=[('initial', '초기 동기화'), ('incremental', '증분 동기화')], default='initial', max_length=20)),
+                ('state', models.CharField(choices=[('in_progress', '진행 중'), ('completed', '완료'), ('stopped', '중단'), ('failed', '실패')], default='in_progress', max_length=20)),
+                ('query', models.CharField(blank=True, max_length=200)),
+                ('start_history_id', models.CharField(blank=True, max_length=50)),
+                ('page_token', models.CharField(blank=True, max_length=200)),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('synced', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '동기화 작업',
+                'verbose_name_plural': '동기화 작업들',
+                'db_table': 'sync_jobs',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SyncFailure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gmail_id', models.CharField(max_length=50)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='failures', to='sync.syncjob')),
+            ],
+            options={
+                'verbose_name': '동기화 실패',
+                'verbose_name_plural': '동기화 실패 목록',
+                'db_table': 'sync_failures',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='syncjob',
+            index=models.Index(fields=['user', 'state', '-started_at'], name='sync_jobs_user_id_27b68e_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='syncfailure',
+            constraint=models.UniqueConstraint(fields=('job', 'gmail_id'), name='unique_sync_failure_message'),
+        ),
+    ]
@@ -1,2 +1,94 @@
+from datetime import timedelta
 
-# Create your models here.
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class SyncJob(models.Model):
+    """Gmail 동기화 작업 (체크포인트 기반 재개 지원)"""
+
+    STALE_AFTER = timedelta(minutes=3)  # 이 시간 동안 체크포인트가 없으면 중단된 작업으로 간주
+
+    TYPE_CHOICES = [
+        ('initial', '초기 동기화'),
+        ('incremental', '증분 동기화'),
+    ]
+    STATE_CHOICES = [
+        ('in_progress', '진행 중'),
+        ('completed', '완료'),
+        ('stopped', '중단'),
+        ('failed', '실패'),
+    ]
+    RESUMABLE_STATES = ['in_progress', 'stopped', 'failed']
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='sync_jobs'
+    )
+    sync_id = models.CharField(max_length=20, unique=True)
+    sync_type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='initial')
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default='in_progress')
+
+    # 재개 시 동일한 범위를 다시 조회하기 위한 시작 조건
+    query = models.CharField(max_length=200, blank=True)  # 초기 동기화 Gmail 검색 쿼리
+    start_history_id = models.CharField(max_length=50, blank=True)  # 증분 동기화 시작 / 초기 동기화 완료 후 history_id
+
+    # 체크포인트
+    page_token = models.CharField(max_length=200, blank=True)  # 다시 조회를 시작할 목록/이력 페이지 토큰
+    processed_count = models.PositiveIntegerField(default=0)  # 처리 완료한 메시지 수 (마지막 처리 인덱스)
+
+    # 진행률
+    total = models.PositiveIntegerField(default=0)
+    synced = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    # 시간
+    started_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)  # 마지막 체크포인트 (heartbeat)
+
+    class Meta:
+        db_table = 'sync_jobs'
+        verbose_name = '동기화 작업'
+        verbose_name_plural = '동기화 작업들'
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['user', 'state', '-started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.sync_id} ({self.state})"
+
+    def is_stale(self) -> bool:
+        """진행 중으로 기록되어 있지만 heartbeat가 끊긴 작업인지 확인"""
+        return self.state == 'in_progress' and self.updated_at < timezone.now() - self.STALE_AFTER
+
+
+class SyncFailure(models.Model):
+    """동기화에 실패한 메시지 (작업 재개 시 재시도)"""
+
+    job = models.ForeignKey(
+        SyncJob,
+        on_delete=models.CASCADE,
+        related_name='failures'
+    )
+    gmail_id = models.CharField(max_length=50)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sync_failures'
+        verbose_name = '동기화 실패'
+        verbose_name_plural = '동기화 실패 목록'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'gmail_id'],
+                name='unique_sync_failure_message'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.job.sync_id}: {self.gmail_id}"
@@ -13,6 +13,7 @@ class SyncProgressSerializer(serializers.Serializer):
     """동기화 진행률 Serializer"""
     total = serializers.IntegerField()
     synced = serializers.IntegerField()
+    failed = serializers.IntegerField()
     classified = serializers.IntegerField()
     percentage = serializers.IntegerField()
 
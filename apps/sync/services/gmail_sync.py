@@ -2,58 +2,97 @@
 Gmail 동기화 서비스
 """
 import logging
-import threading
+import time
 import uuid
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
+from itertools import chain, islice
 from typing import Optional
 
+from django.conf import settings
 from django.db import connection, transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
+from apps.jobs.services import SharedState, dispatch_job
 from apps.mails.models import Mail
-from apps.mails.services import GmailAPIClient
+from apps.mails.services import GmailAPIClient, MailHydrationService
+from apps.mails.signals import apply_folder_count_deltas
 
-logger = logging.getLogger(__name__)
+from ..models import SyncFailure, SyncJob
 
+logger = logging.getLogger(__name__)
 
-class SyncState:
-    """동기화 상태 관리 (메모리 기반)"""
-    _instances = {}
 
-    def __init__(self, user_id: int):
+class SyncState(SharedState):
+    """동기화 상태 관리 (공유 상태 저장소 기반, 모든 워커에서 조회 가능)"""
+
+    KEY_PREFIX = 'sync'
+    DEFAULTS = {
+        'sync_id': None,
+        'state': 'idle',  # idle, in_progress, completed, failed
+        'sync_type': 'initial',  # initial, incremental
+        'total': 0,
+        'synced': 0,
+        'failed': 0,
+        'classified': 0,
+        'started_at': None,
+        'completed_at': None,
+        'error': None,
+        'should_stop': False,
+    }
+    STOP_POLL_INTERVAL = 1.0  # 중단 요청 확인 주기 (초)
+
+    def __init__(self, user_id: int, data: Optional[dict] = None):
+        super().__init__(user_id, data)
         self.user_id = user_id
-        self.sync_id = f"sync_{uuid.uuid4().hex[:8]}"
-        self.state = 'idle'  # idle, in_progress, completed, failed
-        self.sync_type = 'initial'  # initial, incremental
-        self.total = 0
-        self.synced = 0
-        self.classified = 0
-        self.started_at = None
-        self.completed_at = None
-        self.error = None
-        self.should_stop = False
+        self._stop_polled_at = time.monotonic()
 
     @classmethod
     def get_or_create(cls, user_id: int) -> 'SyncState':
-        if user_id not in cls._instances:
-            cls._instances[user_id] = cls(user_id)
-        return cls._instances[user_id]
+        return cls.load(user_id) or cls(user_id)
 
     @classmethod
     def get(cls, user_id: int) -> Optional['SyncState']:
-        return cls._instances.get(user_id)
+        return cls.load(user_id)
+
+    @property
+    def should_stop(self) -> bool:
+        """다른 워커에서 요청한 중단도 반영 (저장소 조회는 STOP_POLL_INTERVAL마다)"""
+        now = time.monotonic()
+        if now - self._stop_polled_at >= self.STOP_POLL_INTERVAL:
+            self._stop_polled_at = now
+            self.refresh()
+        return self._data['should_stop']
 
     def reset(self, sync_type: str = 'initial'):
-        self.sync_id = f"sync_{uuid.uuid4().hex[:8]}"
-        self.state = 'in_progress'
-        self.sync_type = sync_type
-        self.total = 0
-        self.synced = 0
-        self.classified = 0
-        self.started_at = timezone.now()
-        self.completed_at = None
-        self.error = None
-        self.should_stop = False
+        self._data = dict(self.DEFAULTS)
+        self._data.update(
+            sync_id=f"sync_{uuid.uuid4().hex[:8]}",
+            state='in_progress',
+            sync_type=sync_type,
+            started_at=timezone.now().isoformat(),
+        )
+        self.save()
+
+    def resume(self, job: SyncJob):
+        """중단된 동기화 작업의 진행률을 이어받아 재개"""
+        self._data = dict(self.DEFAULTS)
+        self._data.update(
+            sync_id=job.sync_id,
+            state='in_progress',
+            sync_type=job.sync_type,
+            total=job.processed_count,
+            synced=job.synced,
+            failed=job.failed,
+            started_at=job.started_at.isoformat(),
+        )
+        self.save()
+
+    def finish(self, state: str = 'completed', error: str = None):
+        """종료 상태 기록"""
+        self.update(state=state, error=error, completed_at=timezone.now().isoformat())
 
     def to_dict(self) -> dict:
         return {
@@ -63,25 +102,66 @@ class SyncState:
             'progress': {
                 'total': self.total,
                 'synced': self.synced,
+                'failed': self.failed,
                 'classified': self.classified,
                 'percentage': int((self.synced / self.total * 100) if self.total > 0 else 0),
             },
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
             'error': self.error,
         }
 
 
+class SyncCheckpoint:
+    """
+    목록/이력 페이지 단위 체크포인트
+
+    메시지는 완료 순서가 뒤섞이므로, 앞선 페이지의 메시지가 모두 처리(저장 또는 실패 기록)된
+    경우에만 다음 페이지 토큰으로 체크포인트를 전진시킵니다.
+    """
+
+    def __init__(self, page_token: str = ''):
+        self.page_token = page_token or ''
+        self._pages = deque()  # [(page_token, next_page_token, 미처리 메시지 ID set), ...]
+
+    def add_page(self, page_token: str, next_page_token: str, message_ids: list):
+        """파이프라인에 투입할 페이지 등록"""
+        self._pages.append((page_token or '', next_page_token or '', set(message_ids)))
+        self._advance()
+
+    def mark_done(self, message_ids: list):
+        """처리가 끝난 메시지 반영"""
+        for _, _, pending in self._pages:
+            pending.difference_update(message_ids)
+        self._advance()
+
+    def _advance(self):
+        while self._pages and not self._pages[0][2]:
+            _, next_page_token, _ = self._pages.popleft()
+            self.page_token = next_page_token
+        if self._pages:
+            self.page_token = self._pages[0][0]
+
+
 class GmailSyncService:
     """Gmail 동기화 서비스"""
 
-    BATCH_SIZE = 20  # 배치 크기
+    BATCH_SIZE = 100  # DB 일괄 저장 단위
     INITIAL_SYNC_MONTHS = 6  # 초기 동기화 기간 (개월)
+    FETCH_CONCURRENCY = 4  # 사용자당 동시에 진행하는 batch 요청 수
+    FETCH_BATCH_SIZE = 50  # batch 요청당 messages.get 수 (Gmail 권장 상한 50)
+    LIST_PAGE_SIZE = 500  # messages.list 페이지 크기 (Gmail 최대 500)
+    DEDUP_CHUNK_SIZE = 500  # 기존 메일 대조 쿼리당 ID 수 (SQLite 변수 개수 제한 대응)
+    HYDRATE_RECENT_COUNT = 50  # metadata 동기화 후 본문을 미리 로딩할 최근 메일 수
 
     def __init__(self, user):
         self.user = user
         self.gmail_client = GmailAPIClient(user)
         self.sync_state = SyncState.get_or_create(user.id)
+        self.sync_format = getattr(settings, 'GMAIL_SYNC_FORMAT', 'metadata')
+        self.job = None
+        self.checkpoint = SyncCheckpoint()
+        self._retrying = set()  # 재개 시 다시 시도 중인 이전 실패 메시지 ID (실패 기록은 저장될 때까지 유지)
 
     def start_sync(self, full_sync: bool = False) -> dict:
         """
@@ -93,11 +173,12 @@ class GmailSyncService:
         Returns:
             dict: 동기화 시작 정보
         """
-        # 이미 동기화 중인지 확인
-        if self.sync_state.state == 'in_progress':
+        # 이미 동기화 중인지 확인 (공유 상태는 워커가 비정상 종료되면 남아 있으므로 작업 heartbeat 기준)
+        active_job = SyncJob.objects.filter(user=self.user, state='in_progress').first()
+        if active_job and not active_job.is_stale():
             return {
                 'status': 'already_running',
-                'sync_id': self.sync_state.sync_id,
+                'sync_id': active_job.sync_id,
             }
 
         # 동기화 타입 결정
@@ -106,25 +187,46 @@ class GmailSyncService:
         else:
             sync_type = 'incremental'
 
-        # 상태 초기화
-        self.sync_state.reset(sync_type)
+        # 중단/실패한 작업이 있으면 체크포인트부터 재개, 없으면 새 작업 생성
+        job = None if full_sync else self._get_resumable_job(sync_type)
+        if job:
+            self.sync_state.resume(job)
+            job.state = 'in_progress'
+            job.error = ''
+            job.completed_at = None
+            job.save(update_fields=['state', 'error', 'completed_at', 'updated_at'])
+            logger.info(f"Resuming sync {job.sync_id} for user {self.user.id} from page token '{job.page_token}'")
+        else:
+            self.sync_state.reset(sync_type)
+            job = SyncJob.objects.create(
+                user=self.user,
+                sync_id=self.sync_state.sync_id,
+                sync_type=sync_type,
+                start_history_id=self.user.gmail_history_id if sync_type == 'incremental' else '',
+                started_at=parse_datetime(self.sync_state.started_at),
+            )
 
-        # 백그라운드 스레드에서 동기화 실행
-        user_id = self.user.id
-        thread = threading.Thread(
-            target=self._run_sync_in_background,
-            args=(user_id, sync_type),
-            daemon=True
-        )
-        thread.start()
+        # 백그라운드 작업으로 동기화 실행 (JOB_RUNNER 설정에 따라 워커 또는 스레드)
+        dispatch_job('sync', self.user, {'sync_job_id': job.id})
 
         return {
             'sync_id': self.sync_state.sync_id,
             'type': sync_type,
-            'started_at': self.sync_state.started_at.isoformat(),
+            'started_at': self.sync_state.started_at,
+            'resumed': job.processed_count > 0 or bool(job.page_token),
         }
 
-    def _run_sync_in_background(self, user_id: int, sync_type: str):
+    def _get_resumable_job(self, sync_type: str) -> Optional[SyncJob]:
+        """가장 최근 작업이 완료되지 않았다면 재개 대상으로 반환"""
+        job = SyncJob.objects.filter(user=self.user, sync_type=sync_type).first()
+        if not job or job.state not in SyncJob.RESUMABLE_STATES:
+            return None
+        # 증분 동기화는 시작 history_id가 그대로일 때만 이어서 처리 가능
+        if sync_type == 'incremental' and job.start_history_id != self.user.gmail_history_id:
+            return None
+        return job
+
+    def _run_sync_in_background(self, user_id: int, job_id: int):
         """백그라운드에서 동기화 실행"""
         try:
             # 스레드에서 새로운 DB 연결 사용
@@ -134,18 +236,103 @@ class GmailSyncService:
             from apps.accounts.models import User
             self.user = User.objects.get(id=user_id)
             self.gmail_client = GmailAPIClient(self.user)
+            self.job = SyncJob.objects.get(id=job_id)
+            self.checkpoint = SyncCheckpoint(self.job.page_token)
 
-            if sync_type == 'initial':
+            if self.job.sync_type == 'initial':
                 self._run_initial_sync()
             else:
                 self._run_incremental_sync()
+
+            self._finish_job('stopped' if self.sync_state.should_stop else 'completed')
         except Exception as e:
             logger.exception(f"Sync failed for user {user_id}")
-            self.sync_state.state = 'failed'
-            self.sync_state.error = str(e)
+            self.sync_state.finish('failed', error=str(e))
+            if self.job:
+                self._finish_job('failed', error=str(e))
         finally:
             connection.close()
 
+    def _save_checkpoint(self):
+        """현재 체크포인트와 진행률을 작업에 기록 (heartbeat 갱신 포함)"""
+        if not self.job:
+            return
+        self.job.page_token = self.checkpoint.page_token
+        self.sync_state.refresh()
+        self.job.total = self.sync_state.total
+        self.job.synced = self.sync_state.synced
+        self.job.failed = self.sync_state.failed
+        self.job.save(update_fields=['page_token', 'processed_count', 'total', 'synced', 'failed', 'updated_at'])
+
+    def _finish_job(self, state: str, error: str = ''):
+        """작업 종료 상태 기록"""
+        self._save_checkpoint()
+        self.job.state = state
+        self.job.error = error
+        self.job.completed_at = timezone.now()
+        if state == 'completed':
+            self.job.page_token = ''
+        self.job.save(update_fields=['state', 'error', 'completed_at', 'page_token', 'updated_at'])
+
+    def _record_failure(self, message_id: str, error):
+        """메시지 단위 실패 기록 (재개 시 재시도 대상)"""
+        logger.error(f"Failed to sync message {message_id}: {error}")
+        if message_id in self._retrying:
+            # 재시도에서 다시 실패: 기존 실패 기록과 카운트는 그대로 두고 오류만 갱신
+            self._retrying.discard(message_id)
+            if self.job:
+                self.job.failures.filter(gmail_id=message_id).update(error=str(error)[:1000])
+        else:
+            self.sync_state.incr(failed=1)
+            if self.job:
+                self.job.processed_count += 1
+                SyncFailure.objects.update_or_create(
+                    job=self.job,
+                    gmail_id=message_id,
+                    defaults={'error': str(error)[:1000]},
+                )
+        self.checkpoint.mark_done([message_id])
+
+    def _resolve_failures(self, message_ids, saved: bool):
+        """
+        재시도한 메시지가 저장되었거나 이미 저장되어 있으면 실패 기록 삭제 및 카운트 정정
+
+        Args:
+            message_ids: 저장이 확인된 메시지 ID 목록
+            saved: 이번에 저장했으면 True (저장 시 synced/processed_count가 이미 증가했으므로 중복분 차감)
+        """
+        resolved = self._retrying.intersection(message_ids)
+        if not resolved:
+            return
+        self._retrying -= resolved
+        if self.job:
+            self.job.failures.filter(gmail_id__in=resolved).delete()
+        if saved:
+            self.sync_state.incr(failed=-len(resolved))
+            if self.job:
+                self.job.processed_count -= len(resolved)
+        else:
+            self.sync_state.incr(failed=-len(resolved), synced=len(resolved))
+
+    def _retry_failed_page(self) -> list:
+        """
+        재개한 작업에서 이전에 실패한 메시지를 첫 페이지로 재투입
+
+        체크포인트는 이미 해당 페이지를 지났으므로, 실패 기록은 메시지가 실제로 저장될 때까지 지우지 않습니다.
+        (재시도 도중 다시 중단되어도 다음 재개에서 또 재시도)
+
+        Returns:
+            list: [(page_token, next_page_token, 메시지 ID 목록)] (없으면 빈 리스트)
+        """
+        if not self.job:
+            return []
+        failed_ids = list(self.job.failures.values_list('gmail_id', flat=True))
+        if not failed_ids:
+            return []
+
+        self._retrying = set(failed_ids)
+        return [(self.job.page_token, self.job.page_token, failed_ids)]
+
     def get_status(self) -> dict:
         """동기화 상태 조회"""
         return self.sync_state.to_dict()
@@ -158,9 +345,11 @@ class GmailSyncService:
                 'message': '실행 중인 동기화가 없습니다.',
             }
 
-        self.sync_state.should_stop = True
-        self.sync_state.state = 'completed'
-        self.sync_state.completed_at = timezone.now()
+        self.sync_state.update(
+            should_stop=True,
+            state='completed',
+            completed_at=timezone.now().isoformat(),
+        )
 
         return {
             'sync_id': self.sync_state.sync_id,
@@ -169,69 +358,43 @@ class GmailSyncService:
 
     def _run_initial_sync(self):
         """초기 동기화 실행 (최근 6개월)"""
-        # 6개월 전 날짜 계산
-        after_date = (datetime.now() - timedelta(days=self.INITIAL_SYNC_MONTHS * 30)).strftime('%Y/%m/%d')
-        query = f'after:{after_date}'
-
-        logger.info(f"Starting initial sync for user {self.user.id} with query: {query}")
-
-        # 메일 목록 조회
-        page_token = None
-        all_message_ids = []
-
-        while True:
-            if self.sync_state.should_stop:
-                break
-
-            result = self.gmail_client.list_messages(
-                query=query,
-                max_results=100,
-                page_token=page_token
-            )
-
-            messages = result.get('messages', [])
-            all_message_ids.extend([m['id'] for m in messages])
-
-            page_token = result.get('nextPageToken')
-            if not page_token:
-                break
-
-        self.sync_state.total = len(all_message_ids)
-        logger.info(f"Found {self.sync_state.total} messages to sync")
+        if self.job.query:
+            # 재개 시 처음과 같은 범위를 조회
+            query = self.job.query
+            start_history_id = self.job.start_history_id
+        else:
+            # 6개월 전 날짜 계산
+            after_date = (datetime.now() - timedelta(days=self.INITIAL_SYNC_MONTHS * 30)).strftime('%Y/%m/%d')
+            query = f'after:{after_date}'
 
-        # 이미 동기화된 메일 제외
-        existing_gmail_ids = set(
-            Mail.objects.filter(
-                user=self.user,
-                gmail_id__in=all_message_ids
-            ).values_list('gmail_id', flat=True)
-        )
+            # 목록 조회가 동기화 내내 진행되므로, 도중에 도착한 메일을 증분 동기화가 이어받도록 시작 시점의 historyId 사용
+            start_history_id = self.gmail_client.get_profile().get('historyId', '')
 
-        new_message_ids = [mid for mid in all_message_ids if mid not in existing_gmail_ids]
-        self.sync_state.total = len(new_message_ids)
+            self.job.sync_type = 'initial'
+            self.job.query = query
+            self.job.start_history_id = start_history_id
+            self.job.save(update_fields=['sync_type', 'query', 'start_history_id', 'updated_at'])
 
-        # 배치 단위로 메일 상세 조회 및 저장
-        for i in range(0, len(new_message_ids), self.BATCH_SIZE):
-            if self.sync_state.should_stop:
-                break
+        logger.info(f"Starting initial sync for user {self.user.id} with query: {query}")
 
-            batch_ids = new_message_ids[i:i + self.BATCH_SIZE]
-            self._sync_batch(batch_ids)
+        # 목록 페이지가 도착하는 대로 중복 제거 후 조회/저장 파이프라인에 투입
+        pages = chain(self._retry_failed_page(), self._iter_listed_message_ids(query))
+        self._sync_batch(self._iter_new_message_ids(pages))
 
         # 완료 처리
         if not self.sync_state.should_stop:
-            self.sync_state.state = 'completed'
-            self.sync_state.completed_at = timezone.now()
+            self.sync_state.finish('completed')
 
             # 사용자 상태 업데이트
-            profile = self.gmail_client.get_profile()
-            self.user.gmail_history_id = profile.get('historyId', '')
+            self.user.gmail_history_id = start_history_id
             self.user.is_initial_sync_done = True
             self.user.last_sync_at = timezone.now()
             self.user.save(update_fields=['gmail_history_id', 'is_initial_sync_done', 'last_sync_at'])
 
             logger.info(f"Initial sync completed for user {self.user.id}: {self.sync_state.synced} messages synced")
 
+            self._hydrate_recent_mails()
+
     def _run_incremental_sync(self):
         """증분 동기화 실행 (History API 사용)"""
         if not self.user.gmail_history_id:
@@ -243,52 +406,29 @@ class GmailSyncService:
         logger.info(f"Starting incremental sync for user {self.user.id} from history_id: {self.user.gmail_history_id}")
 
         try:
-            result = self.gmail_client.get_history(
-                start_history_id=self.user.gmail_history_id,
-                history_types=['messageAdded']
-            )
-
-            history_list = result.get('history', [])
-            new_history_id = result.get('historyId')
+            self._latest_history_id = None
 
-            # 새 메시지 ID 수집
-            new_message_ids = set()
-            for history in history_list:
-                for message_added in history.get('messagesAdded', []):
-                    message = message_added.get('message', {})
-                    # INBOX 라벨이 있는 메시지만 동기화
-                    if 'INBOX' in message.get('labelIds', []):
-                        new_message_ids.add(message.get('id'))
+            # 페이지가 도착하는 대로 중복 제거 후 조회/저장 파이프라인에 투입
+            pages = chain(self._retry_failed_page(), self._iter_history_message_ids())
+            self._sync_batch(self._iter_new_message_ids(pages))
 
-            # 이미 동기화된 메일 제외
-            existing_gmail_ids = set(
-                Mail.objects.filter(
-                    user=self.user,
-                    gmail_id__in=list(new_message_ids)
-                ).values_list('gmail_id', flat=True)
-            )
-
-            new_message_ids = new_message_ids - existing_gmail_ids
-            self.sync_state.total = len(new_message_ids)
-
-            logger.info(f"Found {len(new_message_ids)} new messages")
-
-            # 메일 동기화
-            if new_message_ids:
-                self._sync_batch(list(new_message_ids))
+            # 중단된 경우 history_id를 유지해 다음 증분 동기화에서 남은 이력을 다시 처리
+            if self.sync_state.should_stop:
+                return
 
             # 완료 처리
-            self.sync_state.state = 'completed'
-            self.sync_state.completed_at = timezone.now()
+            self.sync_state.finish('completed')
 
             # history_id 업데이트
-            if new_history_id:
-                self.user.gmail_history_id = new_history_id
+            if self._latest_history_id:
+                self.user.gmail_history_id = self._latest_history_id
             self.user.last_sync_at = timezone.now()
             self.user.save(update_fields=['gmail_history_id', 'last_sync_at'])
 
             logger.info(f"Incremental sync completed for user {self.user.id}: {self.sync_state.synced} messages synced")
 
+            self._hydrate_recent_mails()
+
         except Exception as e:
             # history_id가 유효하지 않은 경우 (404 등) 초기 동기화 필요할 수 있음
             if '404' in str(e) or 'notFound' in str(e):
@@ -299,42 +439,298 @@ class GmailSyncService:
                 self.user.save(update_fields=['gmail_history_id'])
             raise
 
-    @transaction.atomic
-    def _sync_batch(self, message_ids: list):
-        """배치 단위로 메일 동기화"""
-        for message_id in message_ids:
+    def _hydrate_recent_mails(self):
+        """metadata 동기화 후 최근 메일 본문을 미리 로딩 (실패해도 동기화 결과에는 영향 없음)"""
+        if self.sync_format == 'full' or self.sync_state.should_stop:
+            return
+
+        try:
+            hydrated = MailHydrationService(self.user, self.gmail_client).hydrate_recent(self.HYDRATE_RECENT_COUNT)
+            logger.info(f"Hydrated {hydrated} recent mails for user {self.user.id}")
+        except Exception as e:
+            logger.warning(f"Failed to hydrate recent mails for user {self.user.id}: {e}")
+
+    def _iter_listed_message_ids(self, query: str):
+        """
+        messages.list 페이지마다 메시지 ID 목록을 반환 (제너레이터, 체크포인트 페이지부터 시작)
+
+        Yields:
+            tuple: (page_token, next_page_token, 페이지 단위 Gmail 메시지 ID 목록)
+        """
+        page_token = self.job.page_token
+        pages = self.gmail_client.iter_messages(
+            query=query,
+            page_size=self.LIST_PAGE_SIZE,
+            page_token=page_token or None,
+        )
+        for page in pages:
+            next_page_token = page.get('nextPageToken', '')
+            yield page_token, next_page_token, [m['id'] for m in page.get('messages', [])]
+            page_token = next_page_token
+
+    def _iter_history_message_ids(self):
+        """
+        History API 페이지마다 새로 추가된 INBOX 메시지 ID 목록을 반환 (제너레이터, 체크포인트 페이지부터 시작)
+
+        마지막으로 받은 historyId는 self._latest_history_id에 기록됩니다.
+
+        Yields:
+            tuple: (page_token, next_page_token, 페이지 단위 Gmail 메시지 ID 목록)
+        """
+        page_token = self.job.page_token
+        history_pages = self.gmail_client.iter_history(
+            start_history_id=self.job.start_history_id or self.user.gmail_history_id,
+            history_types=['messageAdded'],
+            page_token=page_token or None,
+        )
+        for page in history_pages:
+            self._latest_history_id = page.get('historyId') or self._latest_history_id
+
+            page_ids = []
+            for history in page.get('history', []):
+                for message_added in history.get('messagesAdded', []):
+                    message = message_added.get('message', {})
+                    # INBOX 라벨이 있는 메시지만 동기화
+                    if 'INBOX' in message.get('labelIds', []):
+                        page_ids.append(message.get('id'))
+
+            next_page_token = page.get('nextPageToken', '')
+            yield page_token, next_page_token, page_ids
+            page_token = next_page_token
+
+    def _iter_new_message_ids(self, id_pages):
+        """
+        페이지 단위 메시지 ID를 받아 아직 동기화되지 않은 ID만 순서대로 반환 (제너레이터)
+
+        페이지마다 DEDUP_CHUNK_SIZE 단위로 DB와 대조해 중복을 제거하고 total을 늘려 가므로,
+        전체 목록을 모으지 않고도 첫 페이지부터 바로 조회를 시작하며 메모리 사용량이 일정합니다.
+        새 ID는 조회 전에 체크포인트에 페이지 단위로 등록됩니다.
+
+        Args:
+            id_pages: (page_token, next_page_token, 메시지 ID 목록) iterable
+
+        Yields:
+            str: 새 Gmail 메시지 ID
+        """
+        seen = set()
+        for page_token, next_page_token, page_ids in id_pages:
+            page_ids = [mid for mid in dict.fromkeys(page_ids) if mid and mid not in seen]
+            seen.update(page_ids)
+
+            new_ids = []
+            for i in range(0, len(page_ids), self.DEDUP_CHUNK_SIZE):
+                chunk = page_ids[i:i + self.DEDUP_CHUNK_SIZE]
+                existing_gmail_ids = set(
+                    Mail.objects.filter(
+                        user=self.user,
+                        gmail_id__in=chunk
+                    ).values_list('gmail_id', flat=True)
+                )
+                new_ids.extend(mid for mid in chunk if mid not in existing_gmail_ids)
+                self._resolve_failures(existing_gmail_ids, saved=False)
+
+            # 재시도하는 이전 실패 메시지는 이미 total에 포함되어 있음
+            self.sync_state.incr(total=len([mid for mid in new_ids if mid not in self._retrying]))
+            self.checkpoint.add_page(page_token, next_page_token, new_ids)
+            logger.debug(f"Found {len(new_ids)} new messages in page")
+
+            if not new_ids:
+                # 새 메시지가 없는 페이지도 체크포인트는 전진
+                self._save_checkpoint()
+                continue
+
+            yield from new_ids
+
+    def _fetch_message_batch(self, message_ids: list, format: str) -> dict:
+        """메시지 상세 일괄 조회 (fetch 스레드에서 실행)"""
+        try:
+            return self.gmail_client.get_messages_batch(message_ids, format=format)
+        finally:
+            # 토큰 갱신 시 열린 스레드 로컬 DB 연결 정리
+            connection.close()
+
+    def _fetch_messages(self, message_ids, format: str = 'full'):
+        """
+        메시지 상세를 제한된 동시성으로 병렬 조회
+
+        ID를 FETCH_BATCH_SIZE개씩 묶어 Gmail batch 요청으로 보내고, 최대 FETCH_CONCURRENCY개의
+        batch 요청을 동시에 유지하며 완료되는 순서대로 결과를 반환합니다.
+        호출 측이 결과를 파싱/저장하는 동안에도 나머지 요청은 계속 진행됩니다.
+
+        Args:
+            message_ids: Gmail 메시지 ID iterable
+            format: 응답 형식 ('minimal', 'full', 'raw', 'metadata')
+
+        Yields:
+            tuple: (message_id, raw_message, error) - 실패 시 raw_message는 None
+        """
+        ids = iter(message_ids)
+        pending = {}
+        executor = ThreadPoolExecutor(
+            max_workers=self.FETCH_CONCURRENCY,
+            thread_name_prefix=f'gmail-fetch-{self.user.id}'
+        )
+
+        def submit_next() -> bool:
+            if self.sync_state.should_stop:
+                return False
+            chunk = list(islice(ids, self.FETCH_BATCH_SIZE))
+            if not chunk:
+                return False
+            pending[executor.submit(self._fetch_message_batch, chunk, format)] = chunk
+            return True
+
+        try:
+            for _ in range(self.FETCH_CONCURRENCY):
+                if not submit_next():
+                    break
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    # 결과를 처리하는 동안에도 네트워크가 쉬지 않도록 먼저 다음 요청 투입
+                    submit_next()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        for message_id in chunk:
+                            yield message_id, None, e
+                        continue
+
+                    for message_id in chunk:
+                        raw_message = result['messages'].get(message_id)
+                        if raw_message is not None:
+                            yield message_id, raw_message, None
+                        else:
+                            error = result['errors'].get(message_id, 'missing from batch response')
+                            yield message_id, None, Exception(error)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _sync_batch(self, message_ids):
+        """
+        메일 동기화 (조회는 병렬, 저장은 BATCH_SIZE 단위 트랜잭션)
+
+        message_ids는 리스트 또는 제너레이터일 수 있으며, fetch 슬롯이 빌 때마다 필요한 만큼만 소비합니다.
+
+        하나의 fetch 풀을 전체 목록에 걸쳐 유지하므로 배치 경계에서 요청이 비지 않고,
+        완료된 메시지의 파싱/저장은 나머지 요청이 진행되는 동안 수행됩니다.
+        """
+        buffer = []
+        for message_id, raw_message, error in self._fetch_messages(message_ids, format=self.sync_format):
             if self.sync_state.should_stop:
                 break
 
+            if error is not None:
+                self._record_failure(message_id, error)
+                continue
+
             try:
-                # 메일 상세 조회
-                raw_message = self.gmail_client.get_message(message_id, format='full')
-                parsed = self.gmail_client.parse_message(raw_message)
+                buffer.append(self.gmail_client.parse_message(raw_message))
+            except Exception as e:
+                self._record_failure(message_id, f'parse error: {e}')
+                continue
+
+            if len(buffer) >= self.BATCH_SIZE:
+                self._save_mails(buffer)
+                buffer = []
+
+        if buffer:
+            self._save_mails(buffer)
+
+    # upsert 시 갱신할 필드 (folder, is_deleted 등 사용자 상태는 유지)
+    UPSERT_FIELDS = [
+        'thread_id', 'subject', 'sender', 'sender_email', 'recipients', 'snippet',
+        'is_read', 'is_starred', 'received_at', 'is_classified', 'updated_at',
+    ]
+    # 본문까지 조회한 경우에만 갱신하는 필드 (metadata 동기화가 로딩된 본문을 지우지 않도록)
+    BODY_FIELDS = ['body_html', 'attachments', 'has_attachments', 'is_hydrated']
+
+    def _build_mail(self, parsed: dict) -> Mail:
+        """파싱된 메일 데이터로 Mail 인스턴스 생성"""
+        return Mail(
+            user=self.user,
+            gmail_id=parsed['gmail_id'],
+            thread_id=parsed['thread_id'],
+            subject=parsed['subject'][:500],  # 최대 길이 제한
+            sender=parsed['sender'][:200],
+            sender_email=parsed['sender_email'][:254],
+            recipients=parsed['recipients'],
+            snippet=parsed['snippet'],
+            body_html=parsed['body_html'],
+            attachments=parsed['attachments'],
+            has_attachments=parsed['has_attachments'],
+            is_read=parsed['is_read'],
+            is_starred=parsed['is_starred'],
+            received_at=parsed['received_at'],
+            is_classified=False,
+            is_hydrated=self.sync_format == 'full',
+        )
+
+    def _save_mails(self, parsed_mails: list):
+        """
+        파싱된 메일 일괄 저장 (bulk upsert)
 
-                # DB 저장
-                Mail.objects.update_or_create(
+        bulk_create는 signals를 트리거하지 않으므로, 이미 폴더에 들어 있던 메일의
+        읽음 상태 변경분만 계산해 배치당 한 번 폴더 카운트에 반영합니다.
+        """
+        mails = {parsed['gmail_id']: self._build_mail(parsed) for parsed in parsed_mails}
+
+        try:
+            with transaction.atomic():
+                existing = Mail.objects.filter(
                     user=self.user,
-                    gmail_id=parsed['gmail_id'],
-                    defaults={
-                        'thread_id': parsed['thread_id'],
-                        'subject': parsed['subject'][:500],  # 최대 길이 제한
-                        'sender': parsed['sender'][:200],
-                        'sender_email': parsed['sender_email'][:254],
-                        'recipients': parsed['recipients'],
-                        'snippet': parsed['snippet'],
-                        'body_html': parsed['body_html'],
-                        'attachments': parsed['attachments'],
-                        'has_attachments': parsed['has_attachments'],
-                        'is_read': parsed['is_read'],
-                        'is_starred': parsed['is_starred'],
-                        'received_at': parsed['received_at'],
-                        'is_classified': False,
-                    }
+                    gmail_id__in=list(mails),
+                    folder__isnull=False,
+                    is_deleted=False,
+                ).values_list('gmail_id', 'folder_id', 'is_read')
+
+                folder_deltas = defaultdict(lambda: {'mail': 0, 'unread': 0})
+                for gmail_id, folder_id, old_is_read in existing:
+                    new_is_read = mails[gmail_id].is_read
+                    if old_is_read != new_is_read:
+                        folder_deltas[folder_id]['unread'] += -1 if new_is_read else 1
+
+                Mail.objects.bulk_create(
+                    list(mails.values()),
+                    batch_size=self.BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=['user', 'gmail_id'],
+                    update_fields=self.UPSERT_FIELDS + (self.BODY_FIELDS if self.sync_format == 'full' else []),
                 )
+                apply_folder_count_deltas(folder_deltas)
+        except Exception as e:
+            logger.error(f"Failed to bulk save {len(mails)} messages: {e}")
+            for gmail_id in mails:
+                self._record_failure(gmail_id, f'save error: {e}')
+            self._save_checkpoint()
+            return
 
-                self.sync_state.synced += 1
-                logger.debug(f"Synced message {message_id}")
-
-            except Exception as e:
-                logger.error(f"Failed to sync message {message_id}: {e}")
-                continue
+        self.sync_state.incr(synced=len(mails))
+        if self.job:
+            self.job.processed_count += len(mails)
+        self._resolve_failures(mails, saved=True)
+        self.checkpoint.mark_done(list(mails))
+        self._save_checkpoint()
+        logger.debug(f"Synced {len(mails)} messages")
+
+
+def run_sync_job(user_id: int, sync_job_id: int):
+    """
+    작업 큐 핸들러: 동기화 실행
+
+    Args:
+        user_id: 사용자 ID
+        sync_job_id: 실행할 SyncJob ID
+    """
+    from apps.accounts.models import User
+
+    job = SyncJob.objects.filter(id=sync_job_id).first()
+    if not job or job.state != 'in_progress':
+        # 중단 요청 등으로 이미 끝난 작업 (재투입된 큐 작업 포함)
+        logger.info(f"Skipping sync job {sync_job_id}: not in progress")
+        return
+
+    service = GmailSyncService(User.objects.get(id=user_id))
+    service._run_sync_in_background(user_id, sync_job_id)
@@ -17,7 +17,7 @@ class SyncStartView(APIView):
 
     @extend_schema(
         summary='동기화 시작',
-        description='Gmail 메일 동기화를 시작합니다. 최초 실행 시 6개월치 메일을 동기화합니다.',
+        description='Gmail 메일 동기화를 시작합니다. 최초 실행 시 6개월치 메일을 동기화하며, 중단된 작업이 있으면 체크포인트부터 재개합니다.',
         request=SyncStartSerializer,
         responses={
             202: {
@@ -30,6 +30,7 @@ class SyncStartView(APIView):
                             'sync_id': {'type': 'string'},
                             'type': {'type': 'string'},
                             'started_at': {'type': 'string'},
+                            'resumed': {'type': 'boolean'},
                         }
                     }
                 }
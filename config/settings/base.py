@@ -49,6 +49,7 @@ LOCAL_APPS = [
     'apps.folders',
     'apps.classifier',
     'apps.sync',
+    'apps.jobs',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -92,6 +93,8 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 테스트 DB도 파일로 생성 (메모리 DB는 여러 스레드가 동시에 쓸 때 잠금을 기다리지 않고 바로 실패함)
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
@@ -217,6 +220,39 @@ GOOGLE_API_KEY = os.environ.get('GOOGLE_API_KEY', '')
 # OpenAI API Settings
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', '')
 
+# LLM 분류 배치 최대 동시 호출 수 (429 응답에 따라 1까지 자동으로 줄어듦)
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '4'))
+
+# LLM 분류 결과 캐시 (발신자/제목 템플릿/폴더 구성이 같은 메일은 LLM 호출 생략)
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', '10000'))
+LLM_CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', str(60 * 60 * 24 * 7)))  # 초
+
+# LLM 구조화 출력 모드 (프로바이더의 JSON schema/tool calling으로 응답을 받음, 끄면 스트리밍 JSON 파싱)
+LLM_STRUCTURED_OUTPUT = os.environ.get('LLM_STRUCTURED_OUTPUT', 'false').lower() == 'true'
+
+# Gmail Sync Settings
+# metadata: 헤더/스니펫/라벨만 먼저 동기화하고 본문은 조회 시 로딩, full: 본문까지 한 번에 동기화
+GMAIL_SYNC_FORMAT = os.environ.get('GMAIL_SYNC_FORMAT', 'metadata')
+
+# Gmail API 할당량 (quota unit/초, 0이면 제한 없음). 스레드/프로세스 간 공유 토큰 버킷으로 요청 속도 조절
+GMAIL_QUOTA_USER_UNITS_PER_SECOND = int(os.environ.get('GMAIL_QUOTA_USER_UNITS_PER_SECOND', '250'))
+GMAIL_QUOTA_PROJECT_UNITS_PER_SECOND = int(os.environ.get('GMAIL_QUOTA_PROJECT_UNITS_PER_SECOND', '20000'))
+GMAIL_QUOTA_BURST_SECONDS = float(os.environ.get('GMAIL_QUOTA_BURST_SECONDS', '1'))
+
+# Job State Store (동기화/분류 진행 상태 공유)
+# db: JobState 테이블 (여러 워커/서버 간 공유), file: JOB_STATE_DIR 파일 (같은 서버 내 공유), memory: 단일 프로세스
+JOB_STATE_BACKEND = os.environ.get('JOB_STATE_BACKEND', 'db')
+JOB_STATE_DIR = os.environ.get('JOB_STATE_DIR', str(BASE_DIR / '.job_state'))
+
+# Background Jobs
+# thread: 요청을 받은 프로세스의 스레드에서 실행 (개발용), queue: Job 테이블에 넣고 run_worker 프로세스가 실행
+JOB_RUNNER = os.environ.get('JOB_RUNNER', 'thread')
+JOB_WORKER_CONCURRENCY = int(os.environ.get('JOB_WORKER_CONCURRENCY', '2'))
+JOB_HANDLERS = {
+    'sync': 'apps.sync.services.gmail_sync.run_sync_job',
+    'classification': 'apps.classifier.services.classifier_service.run_classification_job',
+}
+
 # Gmail API Scopes
 GMAIL_SCOPES = [
     'https://www.googleapis.com/auth/gmail.readonly',
@@ -32,6 +32,9 @@ DATABASES = {
     )
 }
 
+# Background Jobs - 웹 프로세스와 분리된 워커(Procfile worker)에서 실행
+JOB_RUNNER = os.environ.get('JOB_RUNNER', 'queue')
+
 # Static files with WhiteNoise
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')  # noqa: F405
 STORAGES = {
@@ -33,6 +33,13 @@ class GmailAPIException(PigeonException):
     default_status = status.HTTP_502_BAD_GATEWAY
 
 
+class FolderPathConflictException(PigeonException):
+    """폴더 경로 충돌 예외"""
+    default_code = 'FOLDER_PATH_CONFLICT'
+    default_message = '같은 경로의 폴더가 이미 있습니다.'
+    default_status = status.HTTP_409_CONFLICT
+
+
 class ClassificationException(PigeonException):
     """분류 예외"""
     default_code = 'CLASSIFICATION_FAILED'